@@ -13,6 +13,12 @@ import re
 import sys
 from pathlib import Path
 
+try:
+    from tex_utils import load_source
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from tex_utils import load_source
+
 
 def extract_bib_keys(bib_file: Path) -> set[str]:
     """Extract all citation keys from a .bib file."""
@@ -25,7 +31,7 @@ def extract_bib_keys(bib_file: Path) -> set[str]:
 
 def extract_tex_citations(tex_file: Path) -> set[str]:
     """Extract all citation keys used in a .tex file."""
-    content = tex_file.read_text(encoding="utf-8")
+    content = load_source(tex_file).text
 
     # BibLaTeX citation commands
     # \cite{key}, \parencite{key}, \textcite{key}, \citeauthor{key}, \citeyear{key}
@@ -9,9 +9,10 @@ Generate a global table of contents CSV mapping with indices:
   - file (relative path)
 
 Parsing rules:
-  - Chapter order comes from root `main.tex` via `\subfile{chapters/.../main}` lines.
+  - Chapter order comes from root `main.tex` via `\subfile{chapters/.../main}` commands
+    (read with tex_utils.read_includes, so commented-out chapters are skipped).
   - Chapter title prefers combined `Huge: Large` from the chapter's `\title{...}` block; then Large; then Huge; then folder name.
-  - Section order comes from `\input{sections/...}` lines in chapter `main.tex`.
+  - Section order comes from `\input{sections/...}` commands in chapter `main.tex`.
   - Section title is taken from the first `\section{...}` or `\section*{...}` in each section file.
 
 Outputs CSV to `assets/tables/global_toc.csv`.
@@ -21,21 +22,31 @@ from __future__ import annotations
 
 import csv
 import re
+import sys
 from pathlib import Path
 
+try:
+    from tex_utils import load_source, read_includes
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from tex_utils import load_source, read_includes
+
 ROOT = Path(__file__).resolve().parents[1]
 BOOK_MAIN = ROOT / "main.tex"
 
-CHAPTER_SUBFILE_RE = re.compile(r"^\\subfile\{(chapters/[^}]+?/main)\}")
+CHAPTER_SUBFILE_RE = re.compile(r"chapters/[^}]+?/main")
 TITLE_BLOCK_START_RE = re.compile(r"^\\title\{")
 TITLE_LARGE_LINE_RE = re.compile(r"\{\\LARGE[^}]*\}?(.*?)\\\\")
 TITLE_HUGE_LINE_RE = re.compile(r"\{\\Huge[^}]*\}?(.*?)\\\\")
-INPUT_SECTION_RE = re.compile(r"^\\input\{sections/([^}]+)\}")
+INPUT_SECTION_RE = re.compile(r"sections/([^}]+)")
 SECTION_TITLE_RE = re.compile(r"^\\section\*?\{([^}]*)\}")
 
 
 def read_text(path: Path) -> str:
-    return path.read_text(encoding="utf-8", errors="replace")
+    try:
+        return load_source(path).text
+    except UnicodeDecodeError:
+        return path.read_text(encoding="utf-8", errors="replace")
 
 
 def tex_to_plain(s: str) -> str:
@@ -48,10 +59,8 @@ def tex_to_plain(s: str) -> str:
 
 def extract_chapter_order(book_main: Path) -> list[Path]:
     order: list[Path] = []
-    for line in read_text(book_main).splitlines():
-        m = CHAPTER_SUBFILE_RE.match(line.strip())
-        if m:
-            rel = m.group(1)
+    for command, rel in read_includes(book_main):
+        if command == "subfile" and CHAPTER_SUBFILE_RE.fullmatch(rel):
             p = ROOT / (rel + ".tex" if not rel.endswith(".tex") else rel)
             order.append(p)
     return order
@@ -92,9 +101,9 @@ def extract_chapter_title(chapter_main: Path) -> str:
 
 def extract_section_order(chapter_main: Path) -> list[str]:
     order: list[str] = []
-    for line in read_text(chapter_main).splitlines():
-        m = INPUT_SECTION_RE.match(line.strip())
-        if m:
+    for command, rel in read_includes(chapter_main):
+        m = INPUT_SECTION_RE.fullmatch(rel)
+        if command == "input" and m:
             order.append(m.group(1) + ".tex")
     return order
 
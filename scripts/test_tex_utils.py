@@ -0,0 +1,118 @@
+"""
+Regression tests for tex_utils.
+
+Run with:
+    python -m pytest scripts/test_tex_utils.py
+"""
+
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from tex_utils import Paragraph, ParagraphIndex, ParseCache, PatternMatcher, TokenStore
+
+
+# =============================================================================
+# TokenStore
+# =============================================================================
+
+@pytest.mark.parametrize("engine", ["python", "numpy"])
+@pytest.mark.parametrize("n", [1, 2, 3])
+def test_ngram_counts_single_word_vocabulary(engine, n):
+    """A one-entry vocabulary (base 1) must not hang the key packing."""
+    if engine == "numpy":
+        pytest.importorskip("numpy")
+    store = TokenStore()
+    store.add("a.tex", ["go", "go", "go"])
+    assert store.ngram_counts(n, engine=engine) == {("go",) * n: 4 - n}
+
+
+# =============================================================================
+# ParseCache
+# =============================================================================
+
+@pytest.mark.parametrize("rebuild", [False, True])
+def test_parse_cache_recreates_damaged_database(tmp_path, rebuild):
+    """A cache file that is not SQLite is replaced rather than crashing."""
+    (tmp_path / "paragraphs.sqlite").write_bytes(b"not a database" * 100)
+    tex = tmp_path / "a.tex"
+    tex.write_text("One two three four five six.\n")
+
+    with ParseCache(tmp_path, rebuild=rebuild) as cache:
+        assert [p.text for p in cache.extract(tex, min_words=1)] == ["One two three four five six."]
+    with ParseCache(tmp_path) as cache:
+        cache.extract(tex, min_words=1)
+        assert cache.stats.hits == 1
+
+
+def test_parse_cache_open_returns_none_when_unusable(tmp_path, capsys):
+    """If the cache cannot be recreated either, callers run without one."""
+    (tmp_path / "paragraphs.sqlite").mkdir()
+    assert ParseCache.open(tmp_path) is None
+    assert "parse cache disabled" in capsys.readouterr().err
+
+
+# =============================================================================
+# ParagraphIndex
+# =============================================================================
+
+def _paragraphs(*texts):
+    return [Paragraph(text, "a.tex", "a.tex", i + 1, i + 1) for i, text in enumerate(texts)]
+
+
+@pytest.mark.parametrize("pattern", [
+    r"istanbul",
+    r"\bistanbul\b",
+    r"in\s+istanbul",
+    r"\bοδοσ\b",
+    r"ΟΔΟς",
+    r"strasse",
+    r"\bstrasse\b",
+])
+def test_search_matches_re_for_non_ascii_case_folds(pattern):
+    """Index pruning must agree with re.IGNORECASE, not with str.lower()."""
+    paragraphs = _paragraphs(
+        "We met in İstanbul last spring.",
+        "The sign read ΟΔΟΣ in capitals.",
+        "A quiet οδος near the harbour.",
+        "Turn left at the Straße, then right.",
+        "Nothing to see in ISTANBUL STRASSE here.",
+    )
+    index = ParagraphIndex.build(paragraphs)
+    expected = [
+        i for i, para in enumerate(paragraphs)
+        if re.search(pattern, para.cleaned_text, re.IGNORECASE)
+    ]
+    assert expected
+    assert index.search(pattern) == expected
+
+
+def test_pattern_matcher_search_with_index_matches_find():
+    """Indexed style-list regexes give the same hits as the one-pass scan."""
+    paragraphs = _paragraphs(
+        "Agentic systems delve into the landscape, e.g. planning.",
+        "It is crucial to note that agentic system design matters.",
+        "Nothing here but a quiet paragraph.",
+    )
+    regexes = {
+        "agentic": r"\bagentic\s+systems?",
+        "crucial": r"\bcrucial\b",
+        "eg": r"e\.g\.",
+        "repeat": r"\b(\w+) \1\b",
+    }
+    phrases = {"delve": "delve into"}
+    texts = [p.cleaned_text for p in paragraphs]
+
+    expected = {name: [] for name in [*regexes, *phrases]}
+    scanner = PatternMatcher(regexes, phrases)
+    for i, text in enumerate(texts):
+        for name in scanner.find(text):
+            expected[name].append(i)
+
+    matcher = PatternMatcher(regexes, phrases)
+    assert matcher.search(texts, index=ParagraphIndex.build(paragraphs)) == expected
+    assert matcher.stats.indexed == 3
@@ -0,0 +1,546 @@
+#!/usr/bin/env python3
+"""
+tex_analyze.py — Run several LaTeX prose analyses over a single parse.
+
+tex_paragraphs, tex_frequency and tex_chunks each start a process and parse
+the corpus on their own. This tool parses the corpus once and runs any
+combination of their analyses over the shared in-memory paragraph set,
+emitting one combined JSON report:
+
+    - paragraphs: Paragraph length distribution and short/long paragraphs
+    - frequency:  Word and n-gram frequencies, domain terms, repetitive phrases
+    - chunks:     Sliding-window (or token-budgeted) chunks
+    - repetition: Repetition pattern analysis (or a --patterns style list)
+
+Each section of the report has the same shape as the JSON output of the
+standalone tool. The one difference is frequency: tex_frequency counts every
+word in each file, while this tool counts the words of the extracted prose
+paragraphs (figures, tables, boxes and code are skipped).
+
+Usage:
+    # Every analysis over the whole book, in one parse
+    uv run --with rich,typer scripts/tex_analyze.py chapters/ minibooks/ -o report.json
+
+    # Only paragraph lengths and frequencies
+    uv run --with rich,typer scripts/tex_analyze.py chapters/ -a paragraphs -a frequency
+
+    # Pre-commit check with a house-style list of overused phrases
+    uv run --with rich,typer scripts/tex_analyze.py chapters/ --patterns style-patterns.tsv
+
+Dependencies:
+    pip install rich typer
+    — or —
+    uv run --with rich,typer scripts/tex_analyze.py ...
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# =============================================================================
+# Dynamic Import Handling
+# =============================================================================
+
+def _import_with_hint(module_name: str, package_name: Optional[str] = None):
+    """
+    Import a module with a helpful error message if missing.
+
+    Args:
+        module_name: The module to import.
+        package_name: The pip/uv package name if different from module name.
+
+    Returns:
+        The imported module.
+
+    Raises:
+        SystemExit: If the module is not found, with helpful install instructions.
+    """
+    package_name = package_name or module_name
+    try:
+        return __import__(module_name)
+    except ImportError:
+        print(f"\n✗ Missing required package: {package_name}", file=sys.stderr)
+        print(f"\nInstall with:", file=sys.stderr)
+        print(f"    pip install {package_name}", file=sys.stderr)
+        print(f"\nOr run directly with uv:", file=sys.stderr)
+        print(f"    uv run --with rich,typer {sys.argv[0]} ...", file=sys.stderr)
+        sys.exit(1)
+
+
+# Import required packages with helpful errors
+typer_module = _import_with_hint("typer")
+typer = typer_module
+rich_module = _import_with_hint("rich")
+
+# Import local utilities and the standalone tools' analysis functions
+try:
+    from tex_utils import (
+        Lazy,
+        Paragraph,
+        ParagraphIndex,
+        ParseCache,
+        PatternMatcher,
+        TokenStore,
+        extract_paragraphs_from_files,
+        collect_files,
+        lazy_import,
+        finish_profiling,
+        profile_count,
+        profile_stage,
+        start_profiling,
+    )
+except ImportError:
+    script_dir = Path(__file__).parent
+    sys.path.insert(0, str(script_dir))
+    from tex_utils import (
+        Lazy,
+        Paragraph,
+        ParagraphIndex,
+        ParseCache,
+        PatternMatcher,
+        TokenStore,
+        extract_paragraphs_from_files,
+        collect_files,
+        lazy_import,
+        finish_profiling,
+        profile_count,
+        profile_stage,
+        start_profiling,
+    )
+
+import tex_chunks
+import tex_frequency
+import tex_paragraphs
+
+# rich is only imported when the progress spinner is shown
+Console = lazy_import("rich.console", "Console")
+
+
+# =============================================================================
+# CLI Application
+# =============================================================================
+
+app = typer.Typer(
+    name="tex-analyze",
+    help="Run paragraph, frequency, chunk and repetition analyses over one parse.",
+    add_completion=False,
+    rich_markup_mode="rich",
+)
+
+console = Lazy(lambda: Console(stderr=True))
+
+ANALYSES = ("paragraphs", "frequency", "chunks", "repetition")
+
+
+# =============================================================================
+# Analyses
+# =============================================================================
+
+def frequency_report(
+    paragraphs: List[Paragraph],
+    include_stopwords: bool = False,
+    max_n: int = 3,
+    top_n: int = 50,
+) -> Dict:
+    """
+    Build the tex-frequency JSON report from already-parsed paragraphs.
+
+    Tokens are taken from each paragraph's cleaned text and interned into a
+    TokenStore per source file, in paragraph order, so the counting is the
+    same as tex-frequency's but over prose only.
+
+    Args:
+        paragraphs: Paragraphs in reading order.
+        include_stopwords: Include stopwords in word frequencies.
+        max_n: Also count 4-grams up to max_n-grams.
+        top_n: Number of entries per list.
+
+    Returns:
+        Dict in the shape of ``tex_frequency.json_report``.
+    """
+    by_file: Dict[str, List[str]] = {}
+    for para in paragraphs:
+        tokens = by_file.setdefault(para.source_file, [])
+        tokens.extend(para.tokens.lower())
+
+    store = TokenStore()
+    for name, tokens in by_file.items():
+        store.add(name, tokens)
+
+    frequencies = tex_frequency.compute_frequencies(
+        store, include_stopwords=include_stopwords, max_n=max_n
+    )
+    domain_terms = tex_frequency.get_domain_term_frequencies(
+        frequencies["words"], frequencies["total_tokens"]
+    )
+    repetitive = tex_frequency.find_repetitive_phrases(
+        frequencies["bigrams"], frequencies["trigrams"]
+    )
+    file_stats = {
+        name: {"tokens": len(view), "unique": len(set(view))}
+        for name, view in store.file_views().items()
+    }
+    return tex_frequency.json_report(
+        frequencies, domain_terms, repetitive, file_stats, top_n
+    )
+
+
+def run_analyses(
+    paragraphs: List[Paragraph],
+    analyses: List[str],
+    settings: Dict,
+    index: Optional[ParagraphIndex] = None,
+    matcher: Optional[PatternMatcher] = None,
+) -> Dict:
+    """
+    Run the selected analyses over one shared paragraph set.
+
+    Paragraphs are parsed once at the lowest word floor any analysis needs;
+    each analysis then keeps the paragraphs that meet its own floor.
+
+    Args:
+        paragraphs: Paragraphs in reading order.
+        analyses: Names from ``ANALYSES`` to run.
+        settings: Option values keyed by the CLI parameter names.
+        index: Optional ParagraphIndex over the chunk-floor paragraphs,
+            for repetition analysis.
+        matcher: Optional PatternMatcher for a style pattern list.
+
+    Returns:
+        Dict mapping each analysis name to its report.
+    """
+    min_words = settings["min_words"]
+    chunk_min_words = settings["chunk_min_words"]
+    prose = [p for p in paragraphs if p.word_count >= min_words]
+    chunkable = [p for p in paragraphs if p.word_count >= chunk_min_words]
+
+    reports: Dict[str, Dict] = {}
+
+    if "paragraphs" in analyses:
+        with profile_stage("paragraphs"):
+            analysis = tex_paragraphs.analyze_paragraphs(
+                prose,
+                short_threshold=settings["max_words"],
+                long_threshold=settings["long_threshold"],
+                min_words=min_words,
+            )
+            reports["paragraphs"] = tex_paragraphs.json_report(
+                analysis, settings["paragraph_mode"]
+            )
+
+    if "frequency" in analyses:
+        with profile_stage("frequency"):
+            reports["frequency"] = frequency_report(
+                prose,
+                include_stopwords=settings["include_stopwords"],
+                max_n=settings["max_n"],
+                top_n=settings["top"],
+            )
+
+    if "chunks" in analyses:
+        with profile_stage("chunks"):
+            chunks = list(tex_chunks.make_chunks(
+                chunkable,
+                settings["window"],
+                settings["overlap"],
+                settings["max_tokens"],
+                settings["target_tokens"],
+                settings["tokens_per_word"],
+            ))
+            token_budget = settings["max_tokens"] or settings["target_tokens"]
+            token_distribution = (
+                tex_chunks.compute_token_distribution(chunks, token_budget)
+                if token_budget else None
+            )
+            reports["chunks"] = tex_chunks.json_report(chunks, chunkable, token_distribution)
+
+    if "repetition" in analyses:
+        reports["repetition"] = tex_chunks.analyze_repetition(
+            chunkable, index=index, matcher=matcher
+        )
+
+    return reports
+
+
+# =============================================================================
+# Main Command
+# =============================================================================
+
+@app.command()
+def main(
+    ctx: typer.Context,
+    paths: List[Path] = typer.Argument(
+        ...,
+        help="LaTeX files or directories to analyze",
+        exists=True,
+    ),
+    analyses: Optional[List[str]] = typer.Option(
+        None,
+        "--analysis", "-a",
+        help="Analysis to run: paragraphs, frequency, chunks, repetition (repeatable; default all)",
+    ),
+    output: Optional[Path] = typer.Option(
+        None,
+        "--output", "-o",
+        help="Write the JSON report to this file instead of stdout",
+        dir_okay=False,
+    ),
+    min_words: int = typer.Option(
+        5,
+        "--min-words", "-m",
+        help="Minimum words for a paragraph (paragraphs, frequency)",
+        min=1,
+    ),
+    chunk_min_words: int = typer.Option(
+        10,
+        "--chunk-min-words",
+        help="Minimum words for a paragraph (chunks, repetition)",
+        min=1,
+    ),
+    max_words: int = typer.Option(
+        30,
+        "--max-words",
+        help="Maximum words for 'short' classification",
+        min=1,
+    ),
+    long_threshold: int = typer.Option(
+        150,
+        "--long-threshold",
+        help="Minimum words for 'long' classification",
+        min=50,
+    ),
+    paragraph_mode: str = typer.Option(
+        "short",
+        "--paragraph-mode",
+        help="Paragraphs listed in the paragraphs report: short, long, all",
+    ),
+    top: int = typer.Option(
+        50,
+        "--top", "-n",
+        help="Number of top words and n-grams in the frequency report",
+        min=1,
+    ),
+    max_n: int = typer.Option(
+        3,
+        "--max-n",
+        help="Longest n-gram to count (4+ adds repeated-phrase lists)",
+        min=3,
+        max=8,
+    ),
+    include_stopwords: bool = typer.Option(
+        False,
+        "--include-stopwords",
+        help="Include stopwords in word frequencies",
+    ),
+    window: int = typer.Option(
+        3,
+        "--window", "-w",
+        help="Number of paragraphs per chunk",
+        min=1,
+        max=20,
+    ),
+    overlap: int = typer.Option(
+        1,
+        "--overlap",
+        help="Number of paragraphs overlapping between chunks",
+        min=0,
+    ),
+    max_tokens: Optional[int] = typer.Option(
+        None,
+        "--max-tokens",
+        help="Pack chunks up to this many estimated tokens (hard limit)",
+        min=1,
+    ),
+    target_tokens: Optional[int] = typer.Option(
+        None,
+        "--target-tokens",
+        help="Pack chunks until this many estimated tokens (soft limit)",
+        min=1,
+    ),
+    tokens_per_word: float = typer.Option(
+        1.3,
+        "--tokens-per-word",
+        help="Token estimate per regex word (token-budget modes)",
+        min=0.1,
+    ),
+    patterns_file: Optional[Path] = typer.Option(
+        None,
+        "--patterns",
+        help="Style pattern list (YAML or TSV of name -> phrase, or re:regex) for repetition",
+        exists=True,
+        dir_okay=False,
+    ),
+    recursive: bool = typer.Option(
+        True,
+        "--recursive/--no-recursive", "-r/-R",
+        help="Search directories recursively",
+    ),
+    sections_only: bool = typer.Option(
+        False,
+        "--sections-only", "-s",
+        help="Only look in sections/ subdirectory",
+    ),
+    follow_includes: bool = typer.Option(
+        False,
+        "--follow-includes", "-I",
+        help="Follow \\subfile/\\input/\\include from .tex files (or a directory's main.tex), in reading order",
+    ),
+    jobs: int = typer.Option(
+        0,
+        "--jobs", "-j",
+        help="Parallel worker processes (0 = one per CPU core)",
+        min=0,
+    ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Parse every file without using the on-disk parse cache",
+    ),
+    rebuild_cache: bool = typer.Option(
+        False,
+        "--rebuild-cache",
+        help="Discard the parse cache and re-parse every file",
+    ),
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help="Print per-stage wall/CPU time and counts to stderr (parses in one process)",
+    ),
+    profile_out: Optional[Path] = typer.Option(
+        None,
+        "--profile-out",
+        help="Also write a Chrome trace (.json) or cProfile stats (other names); implies --profile",
+        dir_okay=False,
+    ),
+):
+    """
+    Run several prose analyses over a single parse of the corpus.
+
+    Parses the LaTeX files once and runs paragraph-length, frequency, chunk
+    and repetition analyses over the shared paragraphs, writing one JSON
+    report with a section per analysis.
+
+    Examples:
+
+        # All analyses over the book
+        tex-analyze chapters/ minibooks/ -o report.json
+
+        # Paragraph lengths and frequencies only
+        tex-analyze chapters/ -a paragraphs -a frequency
+
+        # Follow the book's main.tex in reading order
+        tex-analyze . -I
+    """
+    # Profile in this process: stages inside worker processes are not seen
+    if profile or profile_out:
+        start_profiling(profile_out)
+        ctx.call_on_close(finish_profiling)
+        jobs = 1
+
+    analyses = analyses or list(ANALYSES)
+    unknown = [a for a in analyses if a not in ANALYSES]
+    if unknown:
+        print(f"Error: Unknown analysis: {', '.join(unknown)}", file=sys.stderr)
+        raise typer.Exit(1)
+
+    if paragraph_mode not in ("short", "long", "all"):
+        print(f"Error: Unknown paragraph mode: {paragraph_mode}", file=sys.stderr)
+        raise typer.Exit(1)
+
+    if "chunks" in analyses and not (max_tokens or target_tokens) and overlap >= window:
+        print("Error: Overlap must be less than window size", file=sys.stderr)
+        raise typer.Exit(1)
+
+    # Load the style pattern list first, so a bad file fails fast
+    matcher = None
+    if patterns_file:
+        try:
+            regexes, phrases = tex_chunks.load_patterns(patterns_file)
+            matcher = PatternMatcher(regexes, phrases)
+        except ValueError as e:
+            print(f"Error: {patterns_file}: {e}", file=sys.stderr)
+            raise typer.Exit(1)
+
+    # Collect files
+    all_files = collect_files(
+        paths, sections_only=sections_only, recursive=recursive,
+        follow_includes=follow_includes,
+    )
+
+    if not all_files:
+        print("Error: No .tex files found", file=sys.stderr)
+        raise typer.Exit(1)
+    profile_count(files=len(all_files))
+
+    # Parse once, at the lowest word floor any selected analysis needs
+    floors = []
+    if {"paragraphs", "frequency"} & set(analyses):
+        floors.append(min_words)
+    if {"chunks", "repetition"} & set(analyses):
+        floors.append(chunk_min_words)
+
+    cache = None if no_cache else ParseCache.open(rebuild=rebuild_cache)
+
+    # Spinner only for interactive runs; hooks and pipes skip importing rich
+    status = console.status("Extracting paragraphs...") if sys.stderr.isatty() else nullcontext()
+    with status:
+        all_paragraphs = extract_paragraphs_from_files(
+            all_files, min_words=min(floors), jobs=jobs, cache=cache
+        )
+
+    # Index paragraphs for pattern search (stored alongside the parse cache)
+    index = None
+    if "repetition" in analyses:
+        chunkable = [p for p in all_paragraphs if p.word_count >= chunk_min_words]
+        if chunkable:
+            index = ParagraphIndex.load_or_build(chunkable, cache=cache)
+
+    if cache:
+        cache.close()
+        print(f"Parse cache: {cache.stats.summary()}", file=sys.stderr)
+
+    profile_count(paragraphs=len(all_paragraphs))
+    if not all_paragraphs:
+        print("Warning: No paragraphs extracted", file=sys.stderr)
+
+    settings = {
+        "min_words": min_words,
+        "chunk_min_words": chunk_min_words,
+        "max_words": max_words,
+        "long_threshold": long_threshold,
+        "paragraph_mode": paragraph_mode,
+        "top": top,
+        "max_n": max_n,
+        "include_stopwords": include_stopwords,
+        "window": window,
+        "overlap": overlap,
+        "max_tokens": max_tokens,
+        "target_tokens": target_tokens,
+        "tokens_per_word": tokens_per_word,
+    }
+    reports = run_analyses(all_paragraphs, analyses, settings, index=index, matcher=matcher)
+
+    data = {
+        "summary": {
+            "files": len(all_files),
+            "paragraphs": len(all_paragraphs),
+            "analyses": [a for a in ANALYSES if a in analyses],
+        },
+        **reports,
+    }
+
+    with profile_stage("render"):
+        text = json.dumps(data, indent=2)
+        if output:
+            output.write_text(text + "\n", encoding="utf-8")
+            print(f"Wrote {output}", file=sys.stderr)
+        else:
+            print(text)
+
+
+if __name__ == "__main__":
+    app()
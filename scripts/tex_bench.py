@@ -0,0 +1,884 @@
+#!/usr/bin/env python3
+"""
+tex_bench.py — Benchmarks for the tex_utils hot paths.
+
+This tool times the LaTeX analysis helpers in tex_utils.py against the book's
+own sources and checks that optimized code paths produce the same output as
+the reference implementations they replace.
+
+Benchmarks:
+    - cleaner: LatexCleaner vs. the original multi-pass clean_latex_text
+    - tokens:  TokenStore vs. token/n-gram lists for frequency analysis (memory)
+    - ngrams:  NumPy vs. pure-Python TokenStore.ngram_counts engines
+    - parser:  single-pass paragraph lexer vs. the original line-based parser
+    - records: slotted Paragraph vs. the original dataclass (memory per
+               paragraph, location and to_dict/JSON throughput)
+    - startup: tex-* CLI start-up time and import cost (python -X importtime)
+    - suite:   throughput and peak memory of the public helpers on the book
+               and on synthetic 10x/100x copies, with a JSON history and a
+               regression check
+
+Usage:
+    # Benchmark the cleaner on the chapters and minibooks
+    python scripts/tex_bench.py cleaner
+
+    # Benchmark on a specific chapter, more repetitions
+    python scripts/tex_bench.py cleaner chapters/07-agents-part-2/ --repeat 10
+
+    # Compare memory of the interned token store with plain lists
+    python scripts/tex_bench.py tokens
+
+    # Compare the n-gram counting engines for n = 2..5
+    uv run --with numpy scripts/tex_bench.py ngrams
+
+    # Compare paragraph parsers (per-MB time, differing records)
+    python scripts/tex_bench.py parser
+
+    # Memory per paragraph and serialization throughput of Paragraph records
+    python scripts/tex_bench.py records
+
+    # Time each tex-* CLI on one small file in a data format (editor hooks)
+    python scripts/tex_bench.py startup
+
+    # Regression suite: record to .tex_cache/bench_history.json, fail when a
+    # case is more than 15% slower (or uses 15% more memory) than recent runs
+    python scripts/tex_bench.py suite chapters/
+
+    # Quick suite run at book scale only, without recording
+    python scripts/tex_bench.py suite chapters/ --scales 1 --no-record
+
+Dependencies:
+    None (stdlib only). The ngrams benchmark needs numpy.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    from tex_utils import (
+        DEFAULT_CACHE_DIR,
+        DEFAULT_EXCLUDED_ENVIRONMENTS,
+        STOPWORDS,
+        LatexCleaner,
+        Paragraph,
+        TokenStore,
+        clean_latex_text,
+        collect_files,
+        create_chunks,
+        extract_paragraphs_from_tex,
+        filter_stopword_ngrams,
+        get_ngrams,
+        tokenize_regex,
+        _iter_prose_blocks,
+        _make_paragraph,
+    )
+except ImportError:
+    script_dir = Path(__file__).parent
+    sys.path.insert(0, str(script_dir))
+    from tex_utils import (
+        DEFAULT_CACHE_DIR,
+        DEFAULT_EXCLUDED_ENVIRONMENTS,
+        STOPWORDS,
+        LatexCleaner,
+        Paragraph,
+        TokenStore,
+        clean_latex_text,
+        collect_files,
+        create_chunks,
+        extract_paragraphs_from_tex,
+        filter_stopword_ngrams,
+        get_ngrams,
+        tokenize_regex,
+        _iter_prose_blocks,
+        _make_paragraph,
+    )
+
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_PATHS = [ROOT / "chapters", ROOT / "minibooks"]
+
+# CLI runs timed by the startup benchmark: script -> data-format arguments
+STARTUP_COMMANDS = {
+    "tex_chunks.py": ["-f", "jsonl", "--no-cache"],
+    "tex_paragraphs.py": ["-f", "jsonl", "--no-cache"],
+    "tex_frequency.py": ["-f", "jsonl"],
+    "tex_duplicates.py": ["-f", "jsonl", "--no-cache"],
+    "tex_analyze.py": ["--no-cache"],
+}
+
+# Modules a data-format run should not need to import
+HEAVY_MODULES = ("rich.console", "rich.table", "rich.progress", "numpy")
+
+# Regression suite defaults
+SUITE_SCALES = (1, 10, 100)
+SUITE_HISTORY = DEFAULT_CACHE_DIR / "bench_history.json"
+SUITE_THRESHOLD = 0.15
+SUITE_BASELINE_RUNS = 5
+
+
+# =============================================================================
+# Reference Implementations
+# =============================================================================
+
+def reference_clean_latex_text(text: str, preserve_structure: bool = False) -> str:
+    """The original multi-pass clean_latex_text, kept as a correctness oracle."""
+    text = re.sub(r'(?<!\\)%.*$', '', text, flags=re.MULTILINE)
+
+    content_commands = [
+        r'\\textbf', r'\\textit', r'\\emph', r'\\keyterm',
+        r'\\texttt', r'\\textsf', r'\\textsc', r'\\textrm',
+        r'\\underline', r'\\uline',
+    ]
+    for cmd in content_commands:
+        text = re.sub(rf'{cmd}\{{([^}}]+)\}}', r'\1', text)
+
+    remove_commands = [
+        r'\\parencite(?:\[[^\]]*\])?\{[^}]+\}',
+        r'\\textcite(?:\[[^\]]*\])?\{[^}]+\}',
+        r'\\cite(?:\[[^\]]*\])?\{[^}]+\}',
+        r'\\autocite(?:\[[^\]]*\])?\{[^}]+\}',
+        r'\\footcite(?:\[[^\]]*\])?\{[^}]+\}',
+        r'\\Cref\{[^}]+\}',
+        r'\\cref\{[^}]+\}',
+        r'\\ref\{[^}]+\}',
+        r'\\eqref\{[^}]+\}',
+        r'\\pageref\{[^}]+\}',
+        r'\\label\{[^}]+\}',
+        r'\\index\{[^}]+\}',
+    ]
+    for pattern in remove_commands:
+        text = re.sub(pattern, '', text)
+
+    text = re.sub(r'Section~\\ref\{[^}]+\}', 'Section X', text)
+    text = re.sub(r'Figure~\\ref\{[^}]+\}', 'Figure X', text)
+    text = re.sub(r'Table~\\ref\{[^}]+\}', 'Table X', text)
+    text = re.sub(r'Chapter~\\ref\{[^}]+\}', 'Chapter X', text)
+
+    text = re.sub(r'\\begin\{[^}]+\}(?:\[[^\]]*\])?(?:\{[^}]*\})?', '', text)
+    text = re.sub(r'\\end\{[^}]+\}', '', text)
+    text = re.sub(r'\\[a-zA-Z]+\*?(?:\[[^\]]*\])?\{[^}]*\}', '', text)
+    text = re.sub(r'\\[a-zA-Z]+\*?', '', text)
+
+    text = re.sub(r'~', ' ', text)
+    text = re.sub(r'---', ' — ', text)
+    text = re.sub(r'--', ' – ', text)
+    text = re.sub(r'``|\'\'', '"', text)
+    text = re.sub(r'\$[^$]+\$', '', text)
+    text = re.sub(r'[{}\\]', '', text)
+
+    if preserve_structure:
+        text = re.sub(r'[ \t]+', ' ', text)
+        text = re.sub(r'\n{3,}', '\n\n', text)
+    else:
+        text = re.sub(r'\s+', ' ', text)
+
+    return text.strip()
+
+
+def reference_iter_prose_blocks(
+    text: str,
+    excluded_envs: frozenset[str],
+) -> Iterator[Tuple[List[str], int, int, str]]:
+    """The original line-based paragraph state machine, kept for comparison."""
+    current_para_lines: List[str] = []
+    current_start_line = 0
+    current_section = ""
+    env_depth = 0
+    line_num = 0
+
+    for line_num, line in enumerate(text.split("\n"), 1):
+        stripped = line.strip()
+
+        section_match = re.match(r'\\(sub)*section\*?\{([^}]+)\}', stripped)
+        if section_match:
+            current_section = section_match.group(2)
+
+        begin_match = re.match(r'\\begin\{(\w+\*?)\}', stripped)
+        end_match = re.match(r'\\end\{(\w+\*?)\}', stripped)
+
+        if begin_match and begin_match.group(1) in excluded_envs:
+            if current_para_lines:
+                yield current_para_lines, current_start_line, line_num - 1, current_section
+                current_para_lines = []
+            env_depth += 1
+            continue
+
+        if end_match and end_match.group(1) in excluded_envs:
+            env_depth = max(0, env_depth - 1)
+            continue
+
+        if env_depth > 0:
+            continue
+
+        is_structural = (
+            stripped.startswith('%') or
+            stripped.startswith('\\begin{') or
+            stripped.startswith('\\end{') or
+            stripped.startswith('\\input{') or
+            stripped.startswith('\\include{') or
+            stripped.startswith('\\label{') or
+            stripped.startswith('\\pagebreak') or
+            stripped.startswith('\\newpage') or
+            stripped.startswith('\\clearpage') or
+            stripped.startswith('\\vspace') or
+            stripped.startswith('\\hspace') or
+            stripped.startswith('\\noindent') or
+            stripped.startswith('\\addcontentsline') or
+            re.match(r'^\\(sub)*section', stripped) or
+            re.match(r'^\\chapter', stripped) or
+            re.match(r'^\\part', stripped) or
+            stripped.startswith('% ===') or
+            stripped.startswith('% ---') or
+            stripped == ''
+        )
+
+        para_match = re.match(r'^\\paragraph\{([^}]+)\}(.*)$', stripped)
+
+        if is_structural or para_match:
+            if current_para_lines:
+                yield current_para_lines, current_start_line, line_num - 1, current_section
+                current_para_lines = []
+
+            if para_match:
+                remaining = para_match.group(2).strip()
+                if remaining:
+                    current_start_line = line_num
+                    current_para_lines = [remaining]
+            continue
+
+        if not current_para_lines:
+            current_start_line = line_num
+        current_para_lines.append(stripped)
+
+    if current_para_lines:
+        yield current_para_lines, current_start_line, line_num, current_section
+
+
+@dataclass
+class ReferenceParagraph:
+    """The original dataclass Paragraph: eager derived fields, asdict serializer."""
+    text: str
+    source_file: str
+    source_path: str
+    line_start: int
+    line_end: int
+    section: str = ""
+    cleaned_text: str = ""
+    word_count: int = 0
+
+    def __post_init__(self):
+        if not self.cleaned_text:
+            self.cleaned_text = clean_latex_text(self.text)
+        if self.word_count == 0:
+            self.word_count = len(tokenize_regex(self.cleaned_text))
+
+    @property
+    def location(self) -> str:
+        try:
+            rel_path = os.path.relpath(self.source_path)
+            if not rel_path.startswith("../../../") and len(rel_path) < len(self.source_path):
+                return f"{rel_path}:{self.line_start}"
+        except ValueError:
+            pass
+        return f"{self.source_path}:{self.line_start}"
+
+    def to_dict(self) -> dict:
+        d = asdict(self)
+        d["location"] = self.location
+        return d
+
+
+# =============================================================================
+# Helpers
+# =============================================================================
+
+def time_call(func: Callable[[], object], repeat: int) -> float:
+    """Return the best wall time in seconds over `repeat` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure_peak(func: Callable[[], object]) -> Tuple[float, int, object]:
+    """Run func once under tracemalloc; return (seconds, peak bytes, result)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak, result
+
+
+def print_row(name: str, seconds: float, n_bytes: int, baseline: float) -> None:
+    """Print one benchmark result line."""
+    mb_per_s = (n_bytes / 1e6) / seconds if seconds > 0 else float("inf")
+    speedup = baseline / seconds if seconds > 0 else float("inf")
+    print(f"  {name:<28} {seconds * 1000:10.1f} ms {mb_per_s:10.2f} MB/s {speedup:8.2f}x")
+
+
+# =============================================================================
+# Benchmarks
+# =============================================================================
+
+def bench_cleaner(files: List[Path], repeat: int) -> int:
+    """Benchmark LatexCleaner against the reference cleaner."""
+    documents = [f.read_text(encoding="utf-8") for f in files]
+    paragraphs = [
+        p.text for f in files for p in extract_paragraphs_from_tex(f, min_words=1)
+    ]
+    inputs = documents + paragraphs
+    n_bytes = sum(len(s.encode("utf-8")) for s in inputs)
+
+    print(f"cleaner: {len(files)} files, {len(paragraphs)} paragraphs, "
+          f"{n_bytes / 1e6:.2f} MB per run")
+
+    # Correctness: identical output, both whitespace modes
+    cleaner = LatexCleaner()
+    mismatches = 0
+    for text in inputs:
+        for preserve in (False, True):
+            if cleaner.clean(text, preserve) != reference_clean_latex_text(text, preserve):
+                mismatches += 1
+    status = "identical" if mismatches == 0 else f"{mismatches} MISMATCHES"
+    print(f"  output vs reference: {status}")
+
+    baseline = time_call(lambda: [reference_clean_latex_text(t) for t in inputs], repeat)
+    optimized = time_call(lambda: [cleaner.clean(t) for t in inputs], repeat)
+    print_row("reference clean_latex_text", baseline, n_bytes, baseline)
+    print_row("LatexCleaner.clean", optimized, n_bytes, baseline)
+
+    return 1 if mismatches else 0
+
+
+def bench_tokens(files: List[Path], repeat: int) -> int:
+    """Compare TokenStore with the list-based token/n-gram representation."""
+    per_file = [
+        (f.name, [t.lower() for t in tokenize_regex(clean_latex_text(f.read_text(encoding="utf-8")))])
+        for f in files
+    ]
+
+    def with_lists():
+        # The original tex_frequency layout: corpus list, per-file copies,
+        # materialized n-gram tuple lists, then Counters
+        all_tokens: List[str] = []
+        file_tokens = {}
+        for name, tokens in per_file:
+            all_tokens.extend(tokens)
+            file_tokens[name] = list(tokens)
+        bigrams = Counter(filter_stopword_ngrams(get_ngrams(all_tokens, 2), 1))
+        trigrams = Counter(filter_stopword_ngrams(get_ngrams(all_tokens, 3), 2))
+        return (all_tokens, file_tokens), bigrams, trigrams
+
+    def with_store():
+        store = TokenStore()
+        for name, tokens in per_file:
+            store.add(name, tokens)
+        stop_mask = store.mask(STOPWORDS)
+        bigrams = store.ngram_counts(2, stop_mask, min_content=1)
+        trigrams = store.ngram_counts(3, stop_mask, min_content=2)
+        return store, bigrams, trigrams
+
+    n_tokens = sum(len(t) for _, t in per_file)
+    print(f"tokens: {len(files)} files, {n_tokens:,} tokens")
+
+    list_s, list_peak, (corpus, list_bi, list_tri) = measure_peak(with_lists)
+    store_s, store_peak, (store, store_bi, store_tri) = measure_peak(with_store)
+
+    same = list_bi == store_bi and list_tri == store_tri
+    print(f"  n-gram counts vs lists: {'identical' if same else 'MISMATCH'}")
+
+    all_tokens, file_tokens = corpus
+    list_held = sys.getsizeof(all_tokens) + sum(sys.getsizeof(t) for t in file_tokens.values())
+    # Times are measured under tracemalloc, so only compare them relatively
+    print(f"  {'':<28} {'time (traced)':>13} {'peak memory':>12}  {'corpus held':>12}")
+    print(f"  {'token lists + get_ngrams':<28} {list_s * 1000:10.1f} ms {list_peak / 1e6:10.1f} MB"
+          f" {list_held / 1e6:10.1f} MB")
+    print(f"  {'TokenStore':<28} {store_s * 1000:10.1f} ms {store_peak / 1e6:10.1f} MB"
+          f" {store.nbytes() / 1e6:10.1f} MB")
+
+    return 0 if same else 1
+
+
+def bench_ngrams(files: List[Path], repeat: int) -> int:
+    """Compare the NumPy and pure-Python n-gram counting engines."""
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print("Error: the ngrams benchmark requires numpy", file=sys.stderr)
+        return 1
+
+    store = TokenStore()
+    for f in files:
+        text = clean_latex_text(f.read_text(encoding="utf-8"))
+        store.add(f.name, [t.lower() for t in tokenize_regex(text)])
+    stop_mask = store.mask(STOPWORDS)
+
+    print(f"ngrams: {len(files)} files, {len(store.ids):,} tokens, "
+          f"{len(store.vocab):,} distinct")
+    print(f"  {'':<28} {'time':>13} {'peak memory':>12} {'speedup':>9}")
+
+    mismatches = 0
+    for n in range(2, 6):
+        min_content = 1 if n == 2 else 2
+
+        def run(engine: str):
+            return store.ngram_counts(n, stop_mask, min_content, engine=engine)
+
+        # Same counts and the same first-occurrence order (most_common ties)
+        _, python_peak, python_counts = measure_peak(lambda: run("python"))
+        _, numpy_peak, numpy_counts = measure_peak(lambda: run("numpy"))
+        if list(python_counts.items()) != list(numpy_counts.items()):
+            mismatches += 1
+            print(f"  n={n}: MISMATCH")
+
+        python_s = time_call(lambda: run("python"), repeat)
+        numpy_s = time_call(lambda: run("numpy"), repeat)
+        for name, seconds, peak in (
+            (f"n={n} python", python_s, python_peak),
+            (f"n={n} numpy", numpy_s, numpy_peak),
+        ):
+            print(f"  {name:<28} {seconds * 1000:10.1f} ms {peak / 1e6:10.1f} MB"
+                  f" {python_s / seconds:8.2f}x")
+
+    print(f"  output vs python engine: "
+          f"{'identical' if mismatches == 0 else f'{mismatches} MISMATCHES'}")
+    return 1 if mismatches else 0
+
+
+def bench_parser(files: List[Path], repeat: int) -> int:
+    """Benchmark the paragraph lexer against the line-based reference parser."""
+    documents = [(f, f.read_text(encoding="utf-8")) for f in files]
+    n_bytes = sum(len(text.encode("utf-8")) for _, text in documents)
+    envs = DEFAULT_EXCLUDED_ENVIRONMENTS
+
+    def segment(parser):
+        return [list(parser(text, envs)) for _, text in documents]
+
+    def extract(parser):
+        return [
+            _make_paragraph(lines, f, start, end, section, 10)
+            for f, text in documents
+            for lines, start, end, section in parser(text, envs)
+        ]
+
+    print(f"parser: {len(files)} files, {n_bytes / 1e6:.2f} MB per run")
+
+    # The lexer intentionally differs where the line parser mis-reads the
+    # source (multi-line arguments, nested braces in titles, mid-line
+    # \begin), so differences are listed rather than treated as failures
+    reference = [p for p in extract(reference_iter_prose_blocks) if p]
+    lexed = [p for p in extract(_iter_prose_blocks) if p]
+    key = lambda p: (p.source_path, p.line_start, p.line_end, p.section, p.text)
+    removed = sorted(set(map(key, reference)) - set(map(key, lexed)))
+    added = sorted(set(map(key, lexed)) - set(map(key, reference)))
+    print(f"  paragraphs: {len(reference)} reference, {len(lexed)} lexer "
+          f"({len(removed)} only in reference, {len(added)} only in lexer)")
+    for sign, rows in (("-", removed), ("+", added)):
+        for path, start, end, section, text in rows[:5]:
+            print(f"    {sign} {Path(path).name}:{start}-{end} {text[:60]!r}")
+
+    for label, func in (("segmentation", segment), ("with paragraphs", extract)):
+        baseline = time_call(lambda: func(reference_iter_prose_blocks), repeat)
+        optimized = time_call(lambda: func(_iter_prose_blocks), repeat)
+        print(f"  {label}:")
+        print_row("line parser (reference)", baseline, n_bytes, baseline)
+        print_row("lexer", optimized, n_bytes, baseline)
+
+    return 0
+
+
+def bench_records(files: List[Path], repeat: int) -> int:
+    """Compare the slotted Paragraph with the original dataclass record."""
+    fields = [
+        (p.text, p.source_file, p.source_path, p.line_start, p.line_end,
+         p.section, p.cleaned_text, p.word_count)
+        for f in files
+        for p in extract_paragraphs_from_tex(f)
+    ]
+    n = len(fields)
+    print(f"records: {len(files)} files, {n:,} paragraphs")
+
+    def build(cls, derived: bool):
+        # As the parser and cache build them (derived fields passed in), or
+        # from raw text only (derived fields computed by the record)
+        if derived:
+            return [cls(*row) for row in fields]
+        return [cls(*row[:6]) for row in fields]
+
+    mismatches = sum(
+        a.to_dict() != b.to_dict()
+        for a, b in zip(build(ReferenceParagraph, True), build(Paragraph, False))
+    )
+    status = "identical" if mismatches == 0 else f"{mismatches} MISMATCHES"
+    print(f"  to_dict vs reference: {status}")
+
+    print(f"  {'':<28} {'bytes/para':>10} {'build':>10} {'location':>10}"
+          f" {'to_dict':>10} {'to JSON':>10}")
+    for name, cls in (("dataclass (reference)", ReferenceParagraph), ("slotted Paragraph", Paragraph)):
+        # Memory of the records themselves; the field strings are shared
+        _, peak, records = measure_peak(lambda: build(cls, True))
+        build_s = time_call(lambda: build(cls, True), repeat)
+        location_s = time_call(lambda: [p.location for p in records], repeat)
+        to_dict_s = time_call(lambda: [p.to_dict() for p in records], repeat)
+        json_s = time_call(lambda: json.dumps([p.to_dict() for p in records]), repeat)
+        print(f"  {name:<28} {peak / n:10.0f} {n / build_s / 1e3:8.0f} k/s"
+              f" {n / location_s / 1e3:6.0f} k/s {n / to_dict_s / 1e3:6.0f} k/s"
+              f" {n / json_s / 1e3:6.0f} k/s")
+
+    lazy_s = time_call(lambda: build(Paragraph, False), repeat)
+    eager_s = time_call(lambda: build(ReferenceParagraph, False), repeat)
+    print(f"  from raw text only: dataclass {eager_s * 1000:.1f} ms, "
+          f"slotted {lazy_s * 1000:.1f} ms (derived fields deferred)")
+
+    return 1 if mismatches else 0
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """
+    Parse ``python -X importtime`` output.
+
+    Returns:
+        Cumulative microseconds per top-level import (the modules the script
+        imported itself, including everything they pulled in).
+    """
+    cumulative: Dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = line.split("|", 2)
+        if total.strip().isdigit() and not name[1:].startswith(" "):
+            cumulative[name.strip()] = int(total)
+    return cumulative
+
+
+def bench_startup(files: List[Path], repeat: int) -> int:
+    """Time each tex-* CLI start to finish on one small file."""
+    target = min(files, key=lambda f: f.stat().st_size)
+    scripts_dir = Path(__file__).resolve().parent
+    print(f"startup: {target.name} ({target.stat().st_size:,} bytes), "
+          f"best of {repeat} runs")
+    print(f"  {'':<20} {'wall':>10} {'imports':>10}   heavy modules loaded")
+
+    failures = 0
+    for script, args in STARTUP_COMMANDS.items():
+        command = [sys.executable, str(scripts_dir / script), str(target), *args]
+
+        def run(*flags: str) -> subprocess.CompletedProcess:
+            return subprocess.run(
+                [command[0], *flags, *command[1:]],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+
+        traced = run("-X", "importtime")
+        if traced.returncode != 0:
+            failures += 1
+            print(f"  {script:<20} FAILED (exit {traced.returncode})")
+            continue
+
+        imports = parse_importtime(traced.stderr)
+        heavy = [
+            name for name in HEAVY_MODULES
+            if re.search(rf"\|\s+{re.escape(name)}(\.|$)", traced.stderr, re.MULTILINE)
+        ]
+        wall = time_call(run, repeat)
+        print(f"  {script:<20} {wall * 1000:7.1f} ms {sum(imports.values()) / 1000:7.1f} ms"
+              f"   {', '.join(heavy) or '-'}")
+
+        for name, micros in sorted(imports.items(), key=lambda kv: -kv[1])[:3]:
+            print(f"    {name:<26} {micros / 1000:7.1f} ms")
+
+    return 1 if failures else 0
+
+
+def suite_cases(files: List[Path]) -> Dict[str, Tuple[Callable[[int], object], List[int]]]:
+    """
+    Build the suite's cases over one copy of the corpus.
+
+    Every case is a per-document operation, so a scaled corpus is the same
+    list of documents repeated: results are discarded after each document,
+    and peak memory stays the working set of one document at any scale.
+    Inputs for later pipeline stages (cleaned text, tokens, paragraphs) are
+    prepared here, outside the timed region.
+
+    Returns:
+        Dict of case name -> (operation on document i, input bytes per
+        document).
+    """
+    texts = [f.read_text(encoding="utf-8") for f in files]
+    cleaned = [clean_latex_text(t) for t in texts]
+    tokens = [tokenize_regex(c) for c in cleaned]
+    paragraphs = [extract_paragraphs_from_tex(f, min_words=10) for f in files]
+    sizes = [len(t.encode("utf-8")) for t in texts]
+
+    return {
+        "clean_latex_text": (lambda i: clean_latex_text(texts[i]), sizes),
+        "tokenize_regex": (
+            lambda i: tokenize_regex(cleaned[i]),
+            [len(c.encode("utf-8")) for c in cleaned],
+        ),
+        "get_ngrams": (lambda i: (get_ngrams(tokens[i], 2), get_ngrams(tokens[i], 3)), sizes),
+        "extract_paragraphs_from_tex": (lambda i: extract_paragraphs_from_tex(files[i]), sizes),
+        "create_chunks": (lambda i: create_chunks(paragraphs[i]), sizes),
+    }
+
+
+def run_case(
+    operation: Callable[[int], object],
+    sizes: List[int],
+    scale: int,
+    repeat: int,
+) -> Dict[str, float]:
+    """
+    Time one case over ``scale`` copies of the corpus.
+
+    Returns:
+        Dict with ops (documents), bytes, best seconds, ops_per_sec and
+        mb_per_sec.
+    """
+    order = list(range(len(sizes))) * scale
+
+    def run():
+        for i in order:
+            operation(i)
+
+    seconds = time_call(run, repeat)
+    n_bytes = sum(sizes) * scale
+    return {
+        "ops": len(order),
+        "bytes": n_bytes,
+        "seconds": round(seconds, 6),
+        "ops_per_sec": round(len(order) / seconds, 2) if seconds > 0 else 0.0,
+        "mb_per_sec": round(n_bytes / 1e6 / seconds, 3) if seconds > 0 else 0.0,
+    }
+
+
+def case_peak(operation: Callable[[int], object], n_documents: int) -> int:
+    """
+    Peak traced memory of one case over a single copy of the corpus.
+
+    The cases discard each document's result, so the peak is one document's
+    working set whatever the scale; measuring it once keeps tracemalloc's
+    overhead out of the scaled runs.
+    """
+    def run():
+        for i in range(n_documents):
+            operation(i)
+
+    _, peak, _ = measure_peak(run)
+    return peak
+
+
+def load_history(path: Path) -> List[dict]:
+    """Read recorded suite runs (oldest first); a missing file is empty."""
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))["runs"]
+    except FileNotFoundError:
+        return []
+
+
+def _git_commit() -> Optional[str]:
+    """Short hash of the checked-out commit, if this is a git work tree."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def baseline_results(history: List[dict], record: dict) -> Dict[str, Dict[str, float]]:
+    """
+    Median ops/sec and peak memory per case over recent comparable runs.
+
+    Runs are comparable when they used the same corpus (file count and
+    bytes), Python version and machine; the last ``SUITE_BASELINE_RUNS``
+    of them form the baseline, so one noisy run does not move it much.
+    """
+    key = lambda run: (run["corpus"], run["python"], run["machine"])
+    runs = [run for run in history if key(run) == key(record)][-SUITE_BASELINE_RUNS:]
+
+    baseline: Dict[str, Dict[str, float]] = {}
+    for case in {case for run in runs for case in run["results"]}:
+        previous = [run["results"][case] for run in runs if case in run["results"]]
+        baseline[case] = {
+            "ops_per_sec": statistics.median(r["ops_per_sec"] for r in previous),
+            "peak_bytes": statistics.median(r["peak_bytes"] for r in previous),
+            "runs": len(previous),
+        }
+    return baseline
+
+
+def bench_suite(
+    files: List[Path],
+    repeat: int,
+    scales: Sequence[int] = SUITE_SCALES,
+    history_path: Optional[Path] = SUITE_HISTORY,
+    threshold: float = SUITE_THRESHOLD,
+    record: bool = True,
+) -> int:
+    """
+    Throughput and peak memory of the public tex_utils helpers, with history.
+
+    Each case runs on the corpus and on synthetic copies scaled by
+    ``scales``. Results are compared with recent comparable runs in the
+    history file; a case regresses when its ops/sec drop, or its peak
+    memory grows, by more than ``threshold``. Larger scales get fewer
+    timing runs (``repeat // scale``, at least one).
+
+    Returns:
+        1 if any case regressed, else 0.
+    """
+    cases = suite_cases(files)
+    n_bytes = sum(cases["clean_latex_text"][1])
+    print(f"suite: {len(files)} files, {n_bytes / 1e6:.2f} MB, "
+          f"scales {', '.join(f'{s}x' for s in scales)}")
+    print(f"  {'case':<34} {'ops/s':>10} {'MB/s':>9} {'peak MB':>9}   vs baseline")
+
+    results: Dict[str, Dict[str, float]] = {}
+    run_record = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()}-{platform.machine()}",
+        "corpus": {"files": len(files), "bytes": n_bytes},
+        "results": results,
+    }
+    history = load_history(history_path) if history_path else []
+    baseline = baseline_results(history, run_record)
+
+    regressions = []
+    for name, (operation, sizes) in cases.items():
+        peak = case_peak(operation, len(sizes))
+        for scale in scales:
+            label = f"{name}@{scale}x"
+            result = run_case(operation, sizes, scale, max(1, repeat // scale))
+            result["peak_bytes"] = peak
+            results[label] = result
+            base = baseline.get(label)
+            if base is None:
+                status = "no baseline"
+            else:
+                speed = result["ops_per_sec"] / base["ops_per_sec"] - 1 if base["ops_per_sec"] else 0.0
+                memory = peak / base["peak_bytes"] - 1 if base["peak_bytes"] else 0.0
+                status = f"{speed:+6.1%} speed {memory:+6.1%} memory (n={base['runs']})"
+                if speed < -threshold or memory > threshold:
+                    regressions.append(label)
+                    status += "  REGRESSION"
+            print(f"  {label:<34} {result['ops_per_sec']:10.1f} {result['mb_per_sec']:9.2f}"
+                  f" {peak / 1e6:9.2f}   {status}", flush=True)
+
+    if record and history_path:
+        history_path.parent.mkdir(parents=True, exist_ok=True)
+        history.append(run_record)
+        history_path.write_text(json.dumps({"runs": history}, indent=2) + "\n", encoding="utf-8")
+        print(f"  recorded run {len(history)} in {history_path}")
+
+    if regressions:
+        print(f"  {len(regressions)} regression(s) beyond {threshold:.0%}: "
+              f"{', '.join(regressions)}")
+    return 1 if regressions else 0
+
+
+BENCHMARKS = {
+    "cleaner": bench_cleaner,
+    "tokens": bench_tokens,
+    "ngrams": bench_ngrams,
+    "parser": bench_parser,
+    "records": bench_records,
+    "startup": bench_startup,
+    "suite": bench_suite,
+}
+
+
+# =============================================================================
+# Main
+# =============================================================================
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the tex_utils hot paths on the book sources"
+    )
+    parser.add_argument(
+        "benchmark",
+        choices=sorted(BENCHMARKS),
+        help="Benchmark to run",
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        type=Path,
+        help="LaTeX files or directories (default: chapters/ and minibooks/)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Timing repetitions; the best run is reported (default: 5)",
+    )
+    parser.add_argument(
+        "--scales",
+        type=lambda value: [int(s) for s in value.split(",")],
+        default=list(SUITE_SCALES),
+        help="suite: comma-separated corpus scale factors (default: 1,10,100)",
+    )
+    parser.add_argument(
+        "--history",
+        type=Path,
+        default=SUITE_HISTORY,
+        help=f"suite: JSON history file (default: {SUITE_HISTORY.relative_to(ROOT)})",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=SUITE_THRESHOLD,
+        help="suite: regression threshold as a fraction (default: 0.15)",
+    )
+    parser.add_argument(
+        "--no-record",
+        action="store_true",
+        help="suite: compare with the history without appending this run",
+    )
+    args = parser.parse_args()
+
+    files = collect_files(args.paths or DEFAULT_PATHS)
+    if not files:
+        print("Error: No .tex files found", file=sys.stderr)
+        return 1
+
+    if args.benchmark == "suite":
+        return bench_suite(
+            files,
+            args.repeat,
+            scales=args.scales,
+            history_path=args.history,
+            threshold=args.threshold,
+            record=not args.no_record,
+        )
+    return BENCHMARKS[args.benchmark](files, args.repeat)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
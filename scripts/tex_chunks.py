@@ -12,9 +12,12 @@ chunks for context-aware analysis. Useful for:
 
 Output Formats:
     - table: Rich formatted table (default, human-readable)
-    - json:  Single JSON object with all data
+    - json:  Single JSON object with all data (and, with --analyze or
+             --patterns, the repetition results and pattern hit counts)
     - jsonl: One JSON object per chunk (streaming-friendly)
     - csv:   Comma-separated values
+    - parquet, arrow: One row per paragraph of each chunk, with its chunk_id
+             (columnar, for dataframes; needs pyarrow)
 
 Usage:
     # Analyze a chapter directory
@@ -23,27 +26,54 @@ Usage:
     # Output as JSONL for processing
     uv run --with rich,typer scripts/tex_chunks.py chapters/07-agents-part-2/ -f jsonl > chunks.jsonl
 
+    # Leaner JSONL for LLM pipelines: chosen keys only, no per-paragraph
+    # records; --fast-json encodes with orjson when it is installed
+    uv run --with rich,typer scripts/tex_chunks.py chapters/ -f jsonl --no-paragraphs
+    uv run --with rich,typer scripts/tex_chunks.py chapters/ -f jsonl --fields chunk_id,location,text --fast-json
+
     # Custom window size and overlap
     uv run --with rich,typer scripts/tex_chunks.py chapters/07-agents-part-2/ -w 5 -o 2
 
+    # Token-budgeted chunks: pack paragraphs up to ~2000 estimated tokens
+    uv run --with rich,typer scripts/tex_chunks.py chapters/07-agents-part-2/ --max-tokens 2000
+
+    # Columnar export for dataframes (one row per paragraph, with chunk_id)
+    uv run --with rich,typer,pyarrow scripts/tex_chunks.py chapters/ -f parquet > chunks.parquet
+
     # Analyze specific files
     uv run --with rich,typer scripts/tex_chunks.py chapter.tex sections/*.tex
 
+    # Chunk the whole book in reading order, following main.tex's includes
+    uv run --with rich,typer scripts/tex_chunks.py main.tex -I
+
+    # Repetition analysis with a style list (TSV "name<TAB>phrase" or
+    # "name<TAB>re:regex"; YAML lists need pyyaml)
+    uv run --with rich,typer scripts/tex_chunks.py chapters/ --patterns style-patterns.tsv
+
+    # Parsed paragraphs are cached in .tex_cache/; bypass or rebuild the cache
+    uv run --with rich,typer scripts/tex_chunks.py chapters/ --no-cache
+    uv run --with rich,typer scripts/tex_chunks.py chapters/ --rebuild-cache
+
+    # Parse files with 8 worker processes (default: one per CPU core)
+    uv run --with rich,typer scripts/tex_chunks.py chapters/ minibooks/ -j 8
+
 Dependencies:
     pip install rich typer
     — or —
     uv run --with rich,typer scripts/tex_chunks.py ...
+
+    Optional: pyyaml (YAML pattern lists), orjson (--fast-json),
+    pyarrow (-f parquet / -f arrow).
 """
 
 from __future__ import annotations
 
 import csv
 import io
-import json
 import re
 import sys
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 # =============================================================================
 # Dynamic Import Handling
@@ -80,42 +110,81 @@ typer_module = _import_with_hint("typer")
 typer = typer_module
 rich_module = _import_with_hint("rich")
 
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich import print as rprint
-
 # Import local utilities
 try:
     from tex_utils import (
+        Lazy,
         Paragraph,
+        ParseCache,
+        ParagraphIndex,
+        PatternMatcher,
         Chunk,
-        extract_paragraphs_from_tex,
-        create_chunks,
-        find_tex_files,
-        find_section_files,
+        ColumnarWriter,
+        COLUMNAR_FORMATS,
+        JsonWriter,
+        PARAGRAPH_COLUMNS,
+        paragraph_row,
+        extract_paragraphs_from_files,
+        iter_chunks,
+        iter_token_chunks,
+        WordTokenEstimator,
+        iter_paragraphs,
         clean_latex_text,
         tokenize_regex,
         STOPWORDS,
+        collect_files,
+        log_status,
+        lazy_import,
+        finish_profiling,
+        profile_count,
+        profile_stage,
+        profiled,
+        start_profiling,
     )
 except ImportError:
     # Handle running from different directories
     script_dir = Path(__file__).parent
     sys.path.insert(0, str(script_dir))
     from tex_utils import (
+        Lazy,
         Paragraph,
+        ParseCache,
+        ParagraphIndex,
+        PatternMatcher,
         Chunk,
-        extract_paragraphs_from_tex,
-        create_chunks,
-        find_tex_files,
-        find_section_files,
+        ColumnarWriter,
+        COLUMNAR_FORMATS,
+        JsonWriter,
+        PARAGRAPH_COLUMNS,
+        paragraph_row,
+        extract_paragraphs_from_files,
+        iter_chunks,
+        iter_token_chunks,
+        WordTokenEstimator,
+        iter_paragraphs,
         clean_latex_text,
         tokenize_regex,
         STOPWORDS,
+        collect_files,
+        log_status,
+        lazy_import,
+        finish_profiling,
+        profile_count,
+        profile_stage,
+        profiled,
+        start_profiling,
     )
 
 
+# rich is only imported once table output (or a progress spinner) needs it
+Console = lazy_import("rich.console", "Console")
+Table = lazy_import("rich.table", "Table")
+Panel = lazy_import("rich.panel", "Panel")
+Progress = lazy_import("rich.progress", "Progress")
+SpinnerColumn = lazy_import("rich.progress", "SpinnerColumn")
+TextColumn = lazy_import("rich.progress", "TextColumn")
+
+
 # =============================================================================
 # CLI Application
 # =============================================================================
@@ -127,13 +196,70 @@ app = typer.Typer(
     rich_markup_mode="rich",
 )
 
-console = Console()
+console = Lazy(Console)
+
+
+# =============================================================================
+# Chunking
+# =============================================================================
+
+def make_chunks(
+    paragraphs: Iterable[Paragraph],
+    window: int = 3,
+    overlap: int = 1,
+    max_tokens: Optional[int] = None,
+    target_tokens: Optional[int] = None,
+    tokens_per_word: float = 1.3,
+) -> Iterator[Chunk]:
+    """
+    Chunk paragraphs by fixed window, or by token budget when one is given.
+    """
+    if max_tokens or target_tokens:
+        return iter_token_chunks(
+            paragraphs,
+            max_tokens=max_tokens,
+            target_tokens=target_tokens,
+            overlap=overlap,
+            estimator=WordTokenEstimator(tokens_per_word),
+        )
+    return iter_chunks(paragraphs, window_size=window, overlap=overlap)
+
+
+def compute_token_distribution(chunks: List[Chunk], budget: int) -> Dict:
+    """
+    Summarize estimated chunk sizes and how well they fill the budget.
+
+    Returns:
+        Dict with min/percentiles/mean/max token counts, the budget, packing
+        efficiency (mean size as a percentage of the budget) and the number
+        of chunks over budget (oversized single paragraphs with --max-tokens;
+        with --target-tokens chunks normally overshoot by one paragraph).
+    """
+    sizes = sorted(c.estimated_tokens or 0 for c in chunks)
+    if not sizes:
+        return {"chunks": 0, "budget": budget}
+
+    n = len(sizes)
+    mean = sum(sizes) / n
+    return {
+        "chunks": n,
+        "min": sizes[0],
+        "p10": sizes[int(n * 0.1)],
+        "median": sizes[n // 2],
+        "mean": round(mean, 1),
+        "p90": sizes[int(n * 0.9)],
+        "max": sizes[-1],
+        "budget": budget,
+        "efficiency_pct": round(mean / budget * 100, 1) if budget else 0.0,
+        "over_budget": sum(1 for s in sizes if s > budget),
+    }
 
 
 # =============================================================================
 # Output Formatters
 # =============================================================================
 
+@profiled("render")
 def output_table(chunks: List[Chunk], paragraphs: List[Paragraph], show_text: bool = False):
     """Output chunks as a rich table."""
     # Summary panel
@@ -166,32 +292,178 @@ def output_table(chunks: List[Chunk], paragraphs: List[Paragraph], show_text: bo
     console.print(table)
 
 
-def output_json(chunks: List[Chunk], paragraphs: List[Paragraph]):
-    """Output as a single JSON object."""
-    data = {
-        "summary": {
-            "total_paragraphs": len(paragraphs),
-            "total_chunks": len(chunks),
-            "total_words": sum(p.word_count for p in paragraphs),
-            "files": list(set(p.source_file for p in paragraphs)),
-        },
+@profiled("render")
+def output_token_distribution(distribution: Dict):
+    """Output the chunk-size distribution of token-budgeted chunks."""
+    table = Table(title="Chunk Size Distribution (estimated tokens)", show_header=False)
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", style="magenta", justify="right")
+
+    table.add_row("Budget", f"{distribution['budget']:,}")
+    for key, label in [
+        ("min", "Minimum"), ("p10", "10th percentile"), ("median", "Median"),
+        ("mean", "Mean"), ("p90", "90th percentile"), ("max", "Maximum"),
+    ]:
+        if key in distribution:
+            table.add_row(label, f"{distribution[key]:,}")
+    if "efficiency_pct" in distribution:
+        table.add_row("Packing efficiency", f"{distribution['efficiency_pct']:.1f}%")
+        table.add_row("Over budget", str(distribution["over_budget"]))
+
+    console.print(table)
+
+
+@profiled("render")
+def output_json(
+    chunks: List[Chunk],
+    paragraphs: List[Paragraph],
+    token_distribution: Optional[Dict] = None,
+    writer: Optional[JsonWriter] = None,
+    fields: Optional[List[str]] = None,
+    paragraph_fields: Optional[List[str]] = None,
+    repetition: Optional[dict] = None,
+    matcher: Optional[PatternMatcher] = None,
+):
+    """
+    Output as a single JSON object, streamed chunk by chunk.
+
+    The output is the document ``json_report`` describes, but only one
+    chunk's dict is built at a time. Repetition results (see
+    :func:`analyze_repetition`) and, for a style list, the matcher's
+    per-pattern hit counts (see :func:`json_pattern_hits`) precede the
+    chunks when given.
+    """
+    writer = writer or JsonWriter()
+    head = {"summary": json_summary(chunks, paragraphs, token_distribution)}
+    if repetition is not None:
+        head["repetition"] = repetition
+        if matcher is not None:
+            head["pattern_hits"] = json_pattern_hits(repetition, matcher)
+    writer.write_document(
+        head,
+        "chunks",
+        (c.to_dict(fields, paragraph_fields) for c in chunks),
+    )
+    writer.flush()
+
+
+def json_report(
+    chunks: List[Chunk],
+    paragraphs: List[Paragraph],
+    token_distribution: Optional[Dict] = None,
+) -> Dict:
+    """Build the JSON report (summary and chunks)."""
+    return {
+        "summary": json_summary(chunks, paragraphs, token_distribution),
         "chunks": [c.to_dict() for c in chunks],
     }
-    print(json.dumps(data, indent=2))
 
 
-def output_jsonl(chunks: List[Chunk], paragraphs: List[Paragraph]):
-    """Output as JSON Lines (one object per line)."""
+def json_summary(
+    chunks: List[Chunk],
+    paragraphs: List[Paragraph],
+    token_distribution: Optional[Dict] = None,
+) -> Dict:
+    """Build the summary section of the JSON report."""
+    summary = {
+        "total_paragraphs": len(paragraphs),
+        "total_chunks": len(chunks),
+        "total_words": sum(p.word_count for p in paragraphs),
+        "files": list(set(p.source_file for p in paragraphs)),
+    }
+    if token_distribution is not None:
+        summary["token_distribution"] = token_distribution
+    return summary
+
+
+@profiled("render")
+def output_jsonl(
+    chunks: Iterable[Chunk],
+    writer: Optional[JsonWriter] = None,
+    fields: Optional[List[str]] = None,
+    paragraph_fields: Optional[List[str]] = None,
+) -> int:
+    """
+    Output as JSON Lines (one object per line), streaming.
+
+    Returns:
+        Number of chunks written.
+    """
+    writer = writer or JsonWriter()
+    written = 0
     for chunk in chunks:
-        print(json.dumps(chunk.to_dict()))
+        writer.write_line(chunk.to_dict(fields, paragraph_fields))
+        written += 1
+    writer.flush()
+    return written
+
 
+def parse_fields(
+    spec: Optional[str], no_paragraphs: bool = False
+) -> Tuple[Optional[List[str]], Optional[List[str]]]:
+    """
+    Parse ``--fields``/``--no-paragraphs`` into a JSON projection.
+
+    Args:
+        spec: Comma-separated chunk keys (see ``Chunk.FIELDS``); entries
+            ``paragraphs.<key>`` select keys of each paragraph (see
+            ``Paragraph.FIELDS``) and imply ``paragraphs``.
+        no_paragraphs: Drop the per-paragraph records.
+
+    Returns:
+        (chunk fields, paragraph fields); None means all, in default order.
+
+    Raises:
+        ValueError: On an unknown field name, or a ``paragraphs`` field
+            combined with ``no_paragraphs``.
 
-def output_csv(chunks: List[Chunk], paragraphs: List[Paragraph]):
-    """Output as CSV."""
+    Example:
+        >>> parse_fields("chunk_id,text,paragraphs.location")
+        (['chunk_id', 'text', 'paragraphs'], ['location'])
+    """
+    fields: Optional[List[str]] = None
+    paragraph_fields: Optional[List[str]] = None
+    if spec:
+        fields, paragraph_fields = [], []
+        for field in filter(None, (part.strip() for part in spec.split(","))):
+            name = field
+            if name.startswith("paragraphs."):
+                key = name[len("paragraphs."):]
+                if key not in Paragraph.FIELDS:
+                    raise ValueError(
+                        f"unknown paragraph field {key!r} (choose from {', '.join(Paragraph.FIELDS)})"
+                    )
+                paragraph_fields.append(key)
+                name = "paragraphs"
+            elif name not in Chunk.FIELDS:
+                raise ValueError(
+                    f"unknown field {name!r} (choose from {', '.join(Chunk.FIELDS)})"
+                )
+            if name == "paragraphs" and no_paragraphs:
+                raise ValueError(
+                    f"{field!r} selects paragraph records, which --no-paragraphs leaves out"
+                )
+            if name not in fields:
+                fields.append(name)
+        paragraph_fields = paragraph_fields or None
+    if no_paragraphs:
+        fields = [name for name in fields or Chunk.FIELDS if name != "paragraphs"]
+    return fields, paragraph_fields
+
+
+@profiled("render")
+def output_csv(chunks: Iterable[Chunk]) -> int:
+    """
+    Output as CSV, streaming.
+
+    Returns:
+        Number of chunks written.
+    """
     writer = csv.writer(sys.stdout)
     writer.writerow([
         "chunk_id", "location", "sections", "total_words", "text"
     ])
+    written = 0
     for chunk in chunks:
         first_para = chunk.paragraphs[0]
         location = f"{first_para.source_path}:{first_para.line_start}"
@@ -202,23 +474,71 @@ def output_csv(chunks: List[Chunk], paragraphs: List[Paragraph]):
             chunk.total_words,
             chunk.text.replace("\n", "\\n"),
         ])
+        written += 1
+    return written
+
+
+@profiled("render")
+def output_columnar(chunks: Iterable[Chunk], format: str) -> int:
+    """
+    Output as a Parquet or Arrow IPC file on stdout, streaming.
+
+    One row per paragraph of each chunk (PARAGRAPH_COLUMNS plus chunk_id),
+    written in record batches. Paragraphs shared by overlapping chunks
+    appear once per chunk; group by chunk_id to rebuild a chunk.
+
+    Returns:
+        Number of chunks written.
+    """
+    sys.stdout.flush()
+    written = 0
+    columns = [("chunk_id", "int"), *PARAGRAPH_COLUMNS]
+    with ColumnarWriter(sys.stdout.buffer, format, columns) as out:
+        for chunk in chunks:
+            for para in chunk.paragraphs:
+                out.write_row((chunk.chunk_id, *paragraph_row(para)))
+            written += 1
+    return written
 
 
 # =============================================================================
 # Repetition Analysis
 # =============================================================================
 
-def analyze_repetition(paragraphs: List[Paragraph], patterns: Optional[dict] = None) -> dict:
+@profiled("repetition")
+def analyze_repetition(
+    paragraphs: List[Paragraph],
+    patterns: Optional[dict] = None,
+    index: Optional[ParagraphIndex] = None,
+    matcher: Optional[PatternMatcher] = None,
+) -> dict:
     """
     Analyze repetition patterns across paragraphs.
 
+    With an index, each pattern is answered by posting-list intersection
+    and the regex only runs on candidate paragraphs (see
+    :meth:`ParagraphIndex.search`). With a matcher, its phrases and the
+    regexes the index cannot narrow are found in one pass per paragraph,
+    which suits large style lists; the other regexes still go through the
+    index (see :meth:`PatternMatcher.search`). Results are the same either
+    way.
+
     Args:
         paragraphs: List of paragraphs to analyze.
         patterns: Optional dict of pattern_name -> regex pattern.
+        index: Optional ParagraphIndex built over ``paragraphs``.
+        matcher: Optional PatternMatcher; replaces ``patterns``.
 
     Returns:
         Dict mapping pattern names to lists of occurrences.
     """
+    if matcher is not None:
+        hits = matcher.search([p.cleaned_text for p in paragraphs], index=index)
+        return {
+            name: [_occurrence(paragraphs[i]) for i in ids]
+            for name, ids in hits.items()
+        }
+
     if patterns is None:
         patterns = {
             "framework": r"\bframework\b",
@@ -226,21 +546,76 @@ def analyze_repetition(paragraphs: List[Paragraph], patterns: Optional[dict] = N
             "tools, memory, planning": r"tools?,?\s*(and\s+)?memory,?\s*(and\s+)?planning",
         }
 
+    if index is not None:
+        return {
+            name: [_occurrence(paragraphs[i]) for i in index.search(pattern)]
+            for name, pattern in patterns.items()
+        }
+
     results = {name: [] for name in patterns}
 
     for para in paragraphs:
         for name, pattern in patterns.items():
             if re.search(pattern, para.cleaned_text, re.IGNORECASE):
-                results[name].append({
-                    "file": para.source_file,
-                    "section": para.section,
-                    "line": para.line_start,
-                    "preview": para.cleaned_text[:80],
-                })
+                results[name].append(_occurrence(para))
 
     return results
 
 
+def load_patterns(path: Path) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    Load a style pattern list from a YAML or TSV file.
+
+    Each entry maps a name to a pattern. Patterns prefixed with ``re:`` are
+    regular expressions; anything else is a literal phrase, matched
+    case-insensitively as whole words.
+
+    TSV: one ``name<TAB>pattern`` per line (a single column uses the
+    pattern as its name); blank lines and ``#`` comments are skipped.
+    YAML (``.yaml``/``.yml``, needs PyYAML): a mapping of name -> pattern,
+    or a list of patterns.
+
+    Returns:
+        (regexes, phrases), each a dict of name -> pattern in file order.
+    """
+    if path.suffix.lower() in (".yaml", ".yml"):
+        yaml = _import_with_hint("yaml", "pyyaml")
+        data = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+        if isinstance(data, list):
+            entries = [(str(p), str(p)) for p in data]
+        elif isinstance(data, dict):
+            entries = [(str(name), str(p)) for name, p in data.items()]
+        else:
+            raise ValueError(f"{path}: expected a mapping or list of patterns")
+    else:
+        entries = []
+        for line in path.read_text(encoding="utf-8").splitlines():
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            name, _, pattern = line.partition("\t")
+            entries.append((name.strip(), (pattern or name).strip()))
+
+    regexes: Dict[str, str] = {}
+    phrases: Dict[str, str] = {}
+    for name, pattern in entries:
+        if pattern.startswith("re:"):
+            regexes[name] = pattern[3:]
+        else:
+            phrases[name] = pattern
+    return regexes, phrases
+
+
+def _occurrence(para: Paragraph) -> dict:
+    """Describe one pattern match for the repetition report."""
+    return {
+        "file": para.source_file,
+        "section": para.section,
+        "line": para.line_start,
+        "preview": para.cleaned_text[:80],
+    }
+
+
+@profiled("render")
 def output_repetition_table(repetition: dict):
     """Output repetition analysis as a rich table."""
     console.print("\n")
@@ -270,12 +645,60 @@ def output_repetition_table(repetition: dict):
         console.print(table)
 
 
+@profiled("render")
+def output_pattern_summary(repetition: dict, matcher: PatternMatcher):
+    """Output per-pattern hit counts and matcher timing as a rich table."""
+    stats = matcher.stats
+    table = Table(title=f"Pattern Hits ({len(matcher.names)} patterns, {stats.texts} paragraphs)")
+    table.add_column("Pattern", style="cyan")
+    table.add_column("Paragraphs", style="magenta", justify="right")
+    table.add_column("Time", style="dim", justify="right")
+
+    ranked = sorted(repetition.items(), key=lambda item: -len(item[1]))
+    for name, occurrences in ranked:
+        if not occurrences:
+            continue
+        # Indexed and unmergeable regexes are timed individually
+        seconds = stats.seconds.get(name)
+        table.add_row(
+            name,
+            str(len(occurrences)),
+            f"{seconds * 1000:.1f} ms" if seconds is not None else "",
+        )
+    console.print(table)
+
+    engines = ", ".join(
+        f"{engine} {stats.seconds[engine] * 1000:.0f} ms"
+        for engine in ("phrases", "combined") if engine in stats.seconds
+    )
+    unmatched = sum(1 for occurrences in repetition.values() if not occurrences)
+    if stats.indexed:
+        engines = ", ".join(filter(None, [engines, f"{stats.indexed} regexes indexed"]))
+    console.print(
+        f"[dim]{unmatched} patterns without hits; "
+        f"total {sum(stats.seconds.values()) * 1000:.0f} ms ({engines})[/dim]"
+    )
+
+
+def json_pattern_hits(repetition: dict, matcher: PatternMatcher) -> Dict:
+    """Per-pattern hit counts and matcher timing, for JSON output."""
+    stats = matcher.stats
+    return {
+        "patterns": len(matcher.names),
+        "paragraphs": stats.texts,
+        "indexed": stats.indexed,
+        "hits": {name: len(occurrences) for name, occurrences in repetition.items()},
+        "seconds": {name: round(seconds, 6) for name, seconds in stats.seconds.items()},
+    }
+
+
 # =============================================================================
 # Main Command
 # =============================================================================
 
 @app.command()
 def main(
+    ctx: typer.Context,
     paths: List[Path] = typer.Argument(
         ...,
         help="LaTeX files or directories to analyze",
@@ -284,7 +707,7 @@ def main(
     format: str = typer.Option(
         "table",
         "--format", "-f",
-        help="Output format: table, json, jsonl, csv",
+        help="Output format: table, json, jsonl, csv, parquet, arrow",
     ),
     window: int = typer.Option(
         3,
@@ -299,6 +722,24 @@ def main(
         help="Number of paragraphs overlapping between chunks",
         min=0,
     ),
+    max_tokens: Optional[int] = typer.Option(
+        None,
+        "--max-tokens",
+        help="Pack paragraphs up to this many estimated tokens (hard limit)",
+        min=1,
+    ),
+    target_tokens: Optional[int] = typer.Option(
+        None,
+        "--target-tokens",
+        help="Pack paragraphs until this many estimated tokens (soft limit)",
+        min=1,
+    ),
+    tokens_per_word: float = typer.Option(
+        1.3,
+        "--tokens-per-word",
+        help="Token estimate per regex word (token-budget modes)",
+        min=0.1,
+    ),
     min_words: int = typer.Option(
         10,
         "--min-words", "-m",
@@ -310,10 +751,33 @@ def main(
         "--show-text", "-t",
         help="Show text preview in table output",
     ),
+    fields_spec: Optional[str] = typer.Option(
+        None,
+        "--fields",
+        help="JSON/JSONL: comma-separated chunk keys to output, e.g. "
+             "chunk_id,location,text or paragraphs.location",
+    ),
+    no_paragraphs: bool = typer.Option(
+        False,
+        "--no-paragraphs",
+        help="JSON/JSONL: leave out the per-paragraph records (and their text)",
+    ),
+    fast_json: bool = typer.Option(
+        False,
+        "--fast-json",
+        help="JSON/JSONL: encode with orjson when installed (compact, UTF-8)",
+    ),
     analyze_patterns: bool = typer.Option(
         False,
         "--analyze", "-a",
-        help="Run repetition pattern analysis",
+        help="Run repetition pattern analysis (table and json output)",
+    ),
+    patterns_file: Optional[Path] = typer.Option(
+        None,
+        "--patterns",
+        help="Style pattern list (YAML or TSV of name -> phrase, or re:regex); implies --analyze",
+        exists=True,
+        dir_okay=False,
     ),
     recursive: bool = typer.Option(
         True,
@@ -325,6 +789,38 @@ def main(
         "--sections-only", "-s",
         help="Only look in sections/ subdirectory",
     ),
+    follow_includes: bool = typer.Option(
+        False,
+        "--follow-includes", "-I",
+        help="Follow \\subfile/\\input/\\include from .tex files (or a directory's main.tex), in reading order",
+    ),
+    jobs: int = typer.Option(
+        0,
+        "--jobs", "-j",
+        help="Parallel worker processes (0 = one per CPU core)",
+        min=0,
+    ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Parse every file without using the on-disk parse cache",
+    ),
+    rebuild_cache: bool = typer.Option(
+        False,
+        "--rebuild-cache",
+        help="Discard the parse cache and re-parse every file",
+    ),
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help="Print per-stage wall/CPU time and counts to stderr (parses in one process)",
+    ),
+    profile_out: Optional[Path] = typer.Option(
+        None,
+        "--profile-out",
+        help="Also write a Chrome trace (.json) or cProfile stats (other names); implies --profile",
+        dir_okay=False,
+    ),
 ):
     """
     Create sliding-window chunks from LaTeX documents.
@@ -340,35 +836,104 @@ def main(
         # Output as JSONL for LLM processing
         tex-chunks chapters/07-agents-part-2/ -f jsonl > chunks.jsonl
 
+        # Only the chunk text and where it starts, orjson-encoded if installed
+        tex-chunks chapters/ -f jsonl --fields chunk_id,location,text --fast-json
+
         # Custom window: 5 paragraphs with 2 overlap
         tex-chunks chapters/07-agents-part-2/ -w 5 -o 2
 
+        # Follow the chapter's main.tex includes in reading order
+        tex-chunks chapters/07-agents-part-2/ -I
+
         # Include repetition analysis
         tex-chunks chapters/07-agents-part-2/ -a
+
+        # Check a house-style list of overused phrases
+        tex-chunks chapters/ --patterns style-patterns.tsv
+
+        # Pack chunks into a 2,000-token LLM context budget
+        tex-chunks chapters/07-agents-part-2/ --max-tokens 2000 -o 0
     """
-    # Validate overlap
-    if overlap >= window:
+    # Profile in this process: stages inside worker processes are not seen
+    if profile or profile_out:
+        start_profiling(profile_out)
+        ctx.call_on_close(finish_profiling)
+        jobs = 1
+
+    try:
+        fields, paragraph_fields = parse_fields(fields_spec, no_paragraphs)
+    except ValueError as e:
+        print(f"Error: --fields: {e}", file=sys.stderr)
+        raise typer.Exit(1)
+    if format in COLUMNAR_FORMATS:
+        _import_with_hint("pyarrow")
+        if sys.stdout.isatty():
+            print(f"Error: {format} output is binary; redirect it to a file", file=sys.stderr)
+            raise typer.Exit(1)
+    writer = None
+    if format in ("json", "jsonl"):
+        writer = JsonWriter(fast=fast_json)
+        if fast_json and writer.encoder != "orjson":
+            print("Note: orjson is not installed; using the json module", file=sys.stderr)
+
+    # Repetition results only fit the table and JSON reports
+    if (analyze_patterns or patterns_file) and format in ("jsonl", "csv", *COLUMNAR_FORMATS):
+        raise typer.BadParameter(
+            f"repetition analysis needs table or json output, not {format}",
+            param_hint="--patterns" if patterns_file else "--analyze",
+        )
+
+    # Load the style pattern list first, so a bad file fails fast
+    matcher = None
+    if patterns_file:
+        analyze_patterns = True
+        try:
+            regexes, phrases = load_patterns(patterns_file)
+            matcher = PatternMatcher(regexes, phrases)
+        except ValueError as e:
+            print(f"Error: {patterns_file}: {e}", file=sys.stderr)
+            raise typer.Exit(1)
+
+    # Validate overlap (window mode only; token mode carries overlap as budget allows)
+    token_budget = max_tokens or target_tokens
+    if not token_budget and overlap >= window:
         console.print("[red]Error:[/red] Overlap must be less than window size", file=sys.stderr)
         raise typer.Exit(1)
 
     # Collect files
-    all_files: List[Path] = []
-
-    for path in paths:
-        if path.is_file():
-            all_files.append(path)
-        elif path.is_dir():
-            if sections_only:
-                all_files.extend(find_section_files(path))
-            else:
-                all_files.extend(find_tex_files(path, recursive=recursive))
+    all_files = collect_files(
+        paths, sections_only=sections_only, recursive=recursive,
+        follow_includes=follow_includes,
+    )
 
     if not all_files:
         console.print("[red]Error:[/red] No .tex files found", file=sys.stderr)
         raise typer.Exit(1)
-
-    # Extract paragraphs
-    all_paragraphs: List[Paragraph] = []
+    profile_count(files=len(all_files))
+
+    # Extract paragraphs (through the parse cache unless disabled)
+    cache = None if no_cache else ParseCache.open(rebuild=rebuild_cache)
+
+    # JSONL, CSV and columnar output stream: each chunk is written as soon as
+    # its paragraphs are parsed, holding only the current window in memory
+    if format in ("jsonl", "csv", *COLUMNAR_FORMATS):
+        paragraphs = iter_paragraphs(all_files, min_words=min_words, cache=cache)
+        chunks = make_chunks(
+            paragraphs, window, overlap, max_tokens, target_tokens, tokens_per_word
+        )
+        if format == "jsonl":
+            written = output_jsonl(chunks, writer, fields, paragraph_fields)
+        elif format == "csv":
+            written = output_csv(chunks)
+        else:
+            written = output_columnar(chunks, format)
+        profile_count(chunks=written)
+        if cache:
+            cache.close()
+            log_status(f"Parse cache: {cache.stats.summary()}", format)
+        if not written:
+            print("Warning: No paragraphs extracted", file=sys.stderr)
+        return
 
     if format == "table":
         with Progress(
@@ -377,36 +942,60 @@ def main(
             console=console,
         ) as progress:
             task = progress.add_task("Extracting paragraphs...", total=len(all_files))
-
-            for file_path in all_files:
-                paras = extract_paragraphs_from_tex(file_path, min_words=min_words)
-                all_paragraphs.extend(paras)
-                progress.advance(task)
+            all_paragraphs = extract_paragraphs_from_files(
+                all_files,
+                min_words=min_words,
+                jobs=jobs,
+                cache=cache,
+                on_file_done=lambda _: progress.advance(task),
+            )
     else:
-        # Silent extraction for data formats
-        for file_path in all_files:
-            paras = extract_paragraphs_from_tex(file_path, min_words=min_words)
-            all_paragraphs.extend(paras)
+        all_paragraphs = extract_paragraphs_from_files(
+            all_files, min_words=min_words, jobs=jobs, cache=cache
+        )
+
+    # Index paragraphs for pattern search (stored alongside the parse cache)
+    index = None
+    if analyze_patterns and all_paragraphs:
+        index = ParagraphIndex.load_or_build(all_paragraphs, cache=cache)
 
+    if cache:
+        cache.close()
+        log_status(f"Parse cache: {cache.stats.summary()}", format)
+
+    profile_count(paragraphs=len(all_paragraphs))
     if not all_paragraphs:
         console.print("[yellow]Warning:[/yellow] No paragraphs extracted", file=sys.stderr)
         raise typer.Exit(0)
 
     # Create chunks
-    chunks = create_chunks(all_paragraphs, window_size=window, overlap=overlap)
+    with profile_stage("chunk"):
+        chunks = list(make_chunks(
+            all_paragraphs, window, overlap, max_tokens, target_tokens, tokens_per_word
+        ))
+    profile_count(chunks=len(chunks))
+    token_distribution = (
+        compute_token_distribution(chunks, token_budget) if token_budget else None
+    )
+
+    repetition = None
+    if analyze_patterns:
+        repetition = analyze_repetition(all_paragraphs, index=index, matcher=matcher)
 
     # Output
     if format == "table":
         output_table(chunks, all_paragraphs, show_text=show_text)
-        if analyze_patterns:
-            repetition = analyze_repetition(all_paragraphs)
+        if token_distribution:
+            output_token_distribution(token_distribution)
+        if repetition is not None:
             output_repetition_table(repetition)
+            if matcher:
+                output_pattern_summary(repetition, matcher)
     elif format == "json":
-        output_json(chunks, all_paragraphs)
-    elif format == "jsonl":
-        output_jsonl(chunks, all_paragraphs)
-    elif format == "csv":
-        output_csv(chunks, all_paragraphs)
+        output_json(
+            chunks, all_paragraphs, token_distribution, writer, fields, paragraph_fields,
+            repetition=repetition, matcher=matcher,
+        )
     else:
         console.print(f"[red]Error:[/red] Unknown format: {format}", file=sys.stderr)
         raise typer.Exit(1)
@@ -0,0 +1,619 @@
+#!/usr/bin/env python3
+"""
+tex_duplicates.py — Find near-duplicate paragraphs across LaTeX documents.
+
+This tool extracts prose paragraphs from LaTeX files and uses MinHash
+signatures with locality-sensitive hashing (LSH) to find paragraphs that
+share most of their wording. Useful for:
+
+    - Material reused between chapters and minibooks
+    - Paragraphs that were copied and only lightly edited
+    - Repeated explanations that could become a cross-reference
+
+Each paragraph's cleaned text is split into overlapping word shingles; the
+MinHash signature of the shingle set estimates Jaccard similarity between
+paragraphs, and LSH banding only compares paragraphs that collide in at
+least one band, so the search is sub-quadratic in the number of paragraphs.
+
+Output Formats:
+    - table: Rich formatted table (default, human-readable)
+    - json:  Single JSON object with all duplicate pairs
+    - jsonl: One JSON object per duplicate pair (streaming-friendly)
+
+Usage:
+    # Near-duplicates across the whole book
+    uv run --with rich,typer,numpy scripts/tex_duplicates.py chapters/ minibooks/
+
+    # Stricter threshold, output as JSON
+    uv run --with rich,typer,numpy scripts/tex_duplicates.py chapters/ minibooks/ -t 0.8 -f json
+
+    # Include pairs within the same file
+    uv run --with rich,typer,numpy scripts/tex_duplicates.py chapters/07-agents-part-2/ --same-file
+
+Dependencies:
+    pip install rich typer numpy
+    — or —
+    uv run --with rich,typer,numpy scripts/tex_duplicates.py ...
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# =============================================================================
+# Dynamic Import Handling
+# =============================================================================
+
+def _import_with_hint(module_name: str, package_name: Optional[str] = None):
+    """
+    Import a module with a helpful error message if missing.
+
+    Args:
+        module_name: The module to import.
+        package_name: The pip/uv package name if different from module name.
+
+    Returns:
+        The imported module.
+
+    Raises:
+        SystemExit: If the module is not found, with helpful install instructions.
+    """
+    package_name = package_name or module_name
+    try:
+        return __import__(module_name)
+    except ImportError:
+        print(f"\n✗ Missing required package: {package_name}", file=sys.stderr)
+        print(f"\nInstall with:", file=sys.stderr)
+        print(f"    pip install {package_name}", file=sys.stderr)
+        print(f"\nOr run directly with uv:", file=sys.stderr)
+        print(f"    uv run --with rich,typer,numpy {sys.argv[0]} ...", file=sys.stderr)
+        sys.exit(1)
+
+
+# Import required packages with helpful errors
+typer_module = _import_with_hint("typer")
+typer = typer_module
+rich_module = _import_with_hint("rich")
+
+# Import local utilities
+try:
+    from tex_utils import (
+        Lazy,
+        Paragraph,
+        ParseCache,
+        TokenStore,
+        extract_paragraphs_from_files,
+        collect_files,
+        log_status,
+        lazy_import,
+        finish_profiling,
+        profile_count,
+        profiled,
+        start_profiling,
+    )
+except ImportError:
+    script_dir = Path(__file__).parent
+    sys.path.insert(0, str(script_dir))
+    from tex_utils import (
+        Lazy,
+        Paragraph,
+        ParseCache,
+        TokenStore,
+        extract_paragraphs_from_files,
+        collect_files,
+        log_status,
+        lazy_import,
+        finish_profiling,
+        profile_count,
+        profiled,
+        start_profiling,
+    )
+
+
+# NumPy is required, but only imported (with an install hint) when comparing
+np = Lazy(lambda: _import_with_hint("numpy"))
+
+# rich is only imported once table output (or a progress spinner) needs it
+Console = lazy_import("rich.console", "Console")
+Table = lazy_import("rich.table", "Table")
+Panel = lazy_import("rich.panel", "Panel")
+Progress = lazy_import("rich.progress", "Progress")
+SpinnerColumn = lazy_import("rich.progress", "SpinnerColumn")
+TextColumn = lazy_import("rich.progress", "TextColumn")
+
+
+# =============================================================================
+# CLI Application
+# =============================================================================
+
+app = typer.Typer(
+    name="tex-duplicates",
+    help="Find near-duplicate paragraphs across LaTeX documents.",
+    add_completion=False,
+    rich_markup_mode="rich",
+)
+
+console = Lazy(Console)
+
+
+# =============================================================================
+# Analysis Data Classes
+# =============================================================================
+
+@dataclass
+class DuplicatePair:
+    """Two paragraphs with similar wording."""
+    first: Paragraph
+    second: Paragraph
+    jaccard: float  # MinHash estimate of shingle-set Jaccard similarity
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "jaccard": round(self.jaccard, 4),
+            "first": self.first.location,
+            "second": self.second.location,
+            "first_preview": self.first.cleaned_text[:120],
+            "second_preview": self.second.cleaned_text[:120],
+        }
+
+
+# =============================================================================
+# MinHash / LSH
+# =============================================================================
+
+# Odd 64-bit constants for shingle hashing (rolling combine, then mix)
+_ROLL = 0x100000001B3
+_MIX = 0x9E3779B97F4A7C15
+
+
+def shingle_hashes(
+    paragraphs: List[Paragraph],
+    shingle_size: int = 4,
+) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Hash the word shingles of every paragraph.
+
+    Tokens are interned into a TokenStore, then each window of
+    ``shingle_size`` token ids is combined into a 64-bit hash for the whole
+    corpus at once. Paragraphs shorter than a shingle get a single shingle
+    of all their words.
+
+    Returns:
+        (hashes, starts): 32-bit shingle hashes (as uint64), grouped by
+        paragraph, and the offset of each paragraph's first shingle.
+    """
+    roll, mix = np.uint64(_ROLL), np.uint64(_MIX)
+    store = TokenStore()
+    for i, para in enumerate(paragraphs):
+        store.add(str(i), para.tokens.lower())
+
+    ids = np.frombuffer(store.ids, dtype=np.uint32).astype(np.uint64) + np.uint64(1)
+    bounds = np.array([store.spans[str(i)] for i in range(len(paragraphs))], dtype=np.int64)
+    lengths = bounds[:, 1] - bounds[:, 0]
+
+    # Rolling hash of every window start in the corpus
+    n_windows = max(len(ids) - shingle_size + 1, 0)
+    rolled = np.zeros(n_windows, dtype=np.uint64)
+    for j in range(shingle_size):
+        rolled = rolled * roll + ids[j:j + n_windows]
+
+    # Keep windows that end inside their own paragraph
+    para_of = np.repeat(np.arange(len(paragraphs)), lengths)[:n_windows]
+    valid = np.flatnonzero(np.arange(n_windows) + shingle_size <= bounds[para_of, 1])
+    counts = np.bincount(para_of[valid], minlength=len(paragraphs))
+    hashes = [rolled[valid]]
+    owners = [para_of[valid]]
+
+    # Short paragraphs: one shingle of all their words
+    for i in np.flatnonzero(counts == 0):
+        value = np.uint64(0)
+        for token_id in ids[bounds[i, 0]:bounds[i, 1]]:
+            value = value * roll + token_id
+        hashes.append(np.array([value], dtype=np.uint64))
+        owners.append(np.array([i]))
+
+    hashes = np.concatenate(hashes)
+    owners = np.concatenate(owners)
+    order = np.argsort(owners, kind="stable")
+    hashes = (hashes[order] * mix) >> np.uint64(32)
+    starts = np.searchsorted(owners[order], np.arange(len(paragraphs)))
+    return hashes, starts
+
+
+def minhash_signatures(
+    hashes: "np.ndarray",
+    starts: "np.ndarray",
+    num_perm: int = 128,
+    seed: int = 1,
+    block: int = 16,
+) -> "np.ndarray":
+    """
+    Compute MinHash signatures for grouped shingle hashes.
+
+    Each permutation is a multiply-add-shift hash ``(a * x + b) >> 32``
+    over 64-bit integers; the minimum per paragraph is taken with
+    ``np.minimum.reduceat``. Permutations are processed ``block`` at a
+    time to bound memory.
+
+    Returns:
+        Array of shape (paragraphs, num_perm).
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+
+    signatures = np.empty((len(starts), num_perm), dtype=np.uint64)
+    for lo in range(0, num_perm, block):
+        hi = min(lo + block, num_perm)
+        values = (a[lo:hi, None] * hashes[None, :] + b[lo:hi, None]) >> np.uint64(32)
+        signatures[:, lo:hi] = np.minimum.reduceat(values, starts, axis=1).T
+    return signatures
+
+
+def choose_bands(num_perm: int, threshold: float) -> int:
+    """
+    Pick the number of LSH bands for a similarity threshold.
+
+    With b bands of r rows, pairs collide with probability
+    ``1 - (1 - s**r)**b``, which rises steeply around ``(1/b)**(1/r)``;
+    choose the divisor b of num_perm that puts that point closest to the
+    threshold.
+    """
+    divisors = [b for b in range(1, num_perm + 1) if num_perm % b == 0]
+    return min(divisors, key=lambda b: abs((1 / b) ** (b / num_perm) - threshold))
+
+
+def lsh_candidates(signatures: "np.ndarray", bands: int) -> "np.ndarray":
+    """
+    Candidate pairs: paragraphs whose signatures agree on a whole band.
+
+    Returns:
+        Array of shape (pairs, 2) with ``i < j``, without duplicates.
+    """
+    n, num_perm = signatures.shape
+    rows = num_perm // bands
+    pairs = []
+    for band in range(bands):
+        chunk = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows])
+        _, bucket = np.unique(chunk, axis=0, return_inverse=True)
+        bucket = bucket.ravel()
+        order = np.argsort(bucket, kind="stable")
+        sorted_buckets = bucket[order]
+        edges = np.flatnonzero(np.diff(sorted_buckets)) + 1
+        for members in np.split(order, edges):
+            if len(members) > 1:
+                i, j = np.triu_indices(len(members), k=1)
+                pairs.append(np.stack([members[i], members[j]], axis=1))
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64)
+    pairs = np.sort(np.concatenate(pairs), axis=1)
+    return np.unique(pairs, axis=0)
+
+
+@profiled("compare")
+def find_duplicates(
+    paragraphs: List[Paragraph],
+    threshold: float = 0.5,
+    num_perm: int = 128,
+    bands: Optional[int] = None,
+    shingle_size: int = 4,
+    same_file: bool = False,
+    seed: int = 1,
+) -> List[DuplicatePair]:
+    """
+    Find near-duplicate paragraph pairs with MinHash and LSH.
+
+    Args:
+        paragraphs: Paragraphs to compare.
+        threshold: Minimum estimated Jaccard similarity to report.
+        num_perm: MinHash signature length.
+        bands: LSH bands (must divide num_perm); None picks one for threshold.
+        shingle_size: Words per shingle.
+        same_file: Also report pairs within a single file.
+        seed: Seed for the MinHash permutations.
+
+    Returns:
+        Pairs sorted by descending similarity, then by location.
+
+    Example:
+        >>> pairs = find_duplicates(paragraphs, threshold=0.7)
+        >>> [(p.first.location, p.second.location) for p in pairs]
+    """
+    if len(paragraphs) < 2:
+        return []
+
+    bands = bands or choose_bands(num_perm, threshold)
+    if num_perm % bands:
+        raise ValueError(f"bands ({bands}) must divide num_perm ({num_perm})")
+
+    hashes, starts = shingle_hashes(paragraphs, shingle_size)
+    signatures = minhash_signatures(hashes, starts, num_perm, seed)
+    candidates = lsh_candidates(signatures, bands)
+    if len(candidates) == 0:
+        return []
+
+    estimates = (signatures[candidates[:, 0]] == signatures[candidates[:, 1]]).mean(axis=1)
+    pairs = []
+    for (i, j), jaccard in zip(candidates.tolist(), estimates.tolist()):
+        if jaccard < threshold:
+            continue
+        first, second = paragraphs[i], paragraphs[j]
+        if not same_file and first.source_path == second.source_path:
+            continue
+        pairs.append(DuplicatePair(first, second, jaccard))
+
+    pairs.sort(key=lambda p: (-p.jaccard, p.first.location, p.second.location))
+    return pairs
+
+
+# =============================================================================
+# Output Formatters
+# =============================================================================
+
+@profiled("render")
+def output_table(
+    pairs: List[DuplicatePair],
+    paragraphs: List[Paragraph],
+    threshold: float,
+    top: int = 50,
+):
+    """Output duplicate pairs as a rich table."""
+    files = len({p.source_path for p in paragraphs})
+    summary = f"[bold]{len(pairs)}[/bold] near-duplicate pairs"
+    summary += f" | [bold]{len(paragraphs)}[/bold] paragraphs"
+    summary += f" | [dim]{files} files, Jaccard ≥ {threshold:.2f}[/dim]"
+    console.print(Panel(summary, title="[bold blue]Near-Duplicate Paragraphs[/bold blue]", expand=False))
+
+    if not pairs:
+        return
+
+    table = Table(title=f"Top {min(top, len(pairs))} Pairs")
+    table.add_column("Jaccard", style="magenta", justify="right")
+    table.add_column("First", style="green")
+    table.add_column("Second", style="green")
+    table.add_column("Preview", style="dim", max_width=50)
+
+    for pair in pairs[:top]:
+        table.add_row(
+            f"{pair.jaccard:.2f}",
+            pair.first.location,
+            pair.second.location,
+            pair.first.cleaned_text[:80] + "...",
+        )
+
+    if len(pairs) > top:
+        table.add_row("...", f"+{len(pairs) - top} more", "", "")
+
+    console.print(table)
+
+
+@profiled("render")
+def output_json(pairs: List[DuplicatePair], paragraphs: List[Paragraph], settings: Dict):
+    """Output as JSON."""
+    data = {
+        "summary": {
+            "total_paragraphs": len(paragraphs),
+            "files": len({p.source_path for p in paragraphs}),
+            "duplicate_pairs": len(pairs),
+            **settings,
+        },
+        "pairs": [pair.to_dict() for pair in pairs],
+    }
+    print(json.dumps(data, indent=2))
+
+
+@profiled("render")
+def output_jsonl(pairs: List[DuplicatePair]):
+    """Output as JSON Lines (one pair per line)."""
+    for pair in pairs:
+        print(json.dumps(pair.to_dict()))
+
+
+# =============================================================================
+# Main Command
+# =============================================================================
+
+@app.command()
+def main(
+    ctx: typer.Context,
+    paths: List[Path] = typer.Argument(
+        ...,
+        help="LaTeX files or directories to analyze",
+        exists=True,
+    ),
+    format: str = typer.Option(
+        "table",
+        "--format", "-f",
+        help="Output format: table, json, jsonl",
+    ),
+    threshold: float = typer.Option(
+        0.5,
+        "--threshold", "-t",
+        help="Minimum estimated Jaccard similarity to report",
+        min=0.05,
+        max=1.0,
+    ),
+    num_perm: int = typer.Option(
+        128,
+        "--num-perm",
+        help="MinHash signature length (more = more accurate estimates)",
+        min=16,
+    ),
+    bands: int = typer.Option(
+        0,
+        "--bands",
+        help="LSH bands, must divide --num-perm (0 = choose from threshold)",
+        min=0,
+    ),
+    shingle_size: int = typer.Option(
+        4,
+        "--shingle", "-k",
+        help="Words per shingle",
+        min=1,
+    ),
+    min_words: int = typer.Option(
+        20,
+        "--min-words", "-m",
+        help="Minimum words for a paragraph to be compared",
+        min=1,
+    ),
+    same_file: bool = typer.Option(
+        False,
+        "--same-file",
+        help="Also report duplicates within a single file",
+    ),
+    top: int = typer.Option(
+        50,
+        "--top", "-n",
+        help="Number of pairs to show (table format only)",
+        min=1,
+    ),
+    seed: int = typer.Option(
+        1,
+        "--seed",
+        help="Seed for the MinHash permutations",
+    ),
+    recursive: bool = typer.Option(
+        True,
+        "--recursive/--no-recursive", "-r/-R",
+        help="Search directories recursively",
+    ),
+    sections_only: bool = typer.Option(
+        False,
+        "--sections-only", "-s",
+        help="Only look in sections/ subdirectory",
+    ),
+    follow_includes: bool = typer.Option(
+        False,
+        "--follow-includes", "-I",
+        help="Follow \\subfile/\\input/\\include from .tex files (or a directory's main.tex), in reading order",
+    ),
+    jobs: int = typer.Option(
+        0,
+        "--jobs", "-j",
+        help="Parallel worker processes (0 = one per CPU core)",
+        min=0,
+    ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Parse every file without using the on-disk parse cache",
+    ),
+    rebuild_cache: bool = typer.Option(
+        False,
+        "--rebuild-cache",
+        help="Discard the parse cache and re-parse every file",
+    ),
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help="Print per-stage wall/CPU time and counts to stderr (parses in one process)",
+    ),
+    profile_out: Optional[Path] = typer.Option(
+        None,
+        "--profile-out",
+        help="Also write a Chrome trace (.json) or cProfile stats (other names); implies --profile",
+        dir_okay=False,
+    ),
+):
+    """
+    Find near-duplicate paragraphs across LaTeX documents.
+
+    Compares every paragraph with MinHash signatures and reports pairs from
+    different files whose estimated Jaccard similarity meets the threshold.
+
+    Examples:
+
+        # Near-duplicates across the book
+        tex-duplicates chapters/ minibooks/
+
+        # Only very close copies
+        tex-duplicates chapters/ minibooks/ --threshold 0.8
+
+        # Output as JSON Lines
+        tex-duplicates chapters/ minibooks/ -f jsonl > duplicates.jsonl
+    """
+    # Profile in this process: stages inside worker processes are not seen
+    if profile or profile_out:
+        start_profiling(profile_out)
+        ctx.call_on_close(finish_profiling)
+        jobs = 1
+
+    if format not in ("table", "json", "jsonl"):
+        print(f"Error: Unknown format: {format}", file=sys.stderr)
+        raise typer.Exit(1)
+
+    if bands and num_perm % bands:
+        print(f"Error: --bands ({bands}) must divide --num-perm ({num_perm})", file=sys.stderr)
+        raise typer.Exit(1)
+
+    # Collect files
+    all_files = collect_files(
+        paths, sections_only=sections_only, recursive=recursive,
+        follow_includes=follow_includes,
+    )
+
+    if not all_files:
+        print("Error: No .tex files found", file=sys.stderr)
+        raise typer.Exit(1)
+    profile_count(files=len(all_files))
+
+    # Extract paragraphs (through the parse cache unless disabled)
+    cache = None if no_cache else ParseCache.open(rebuild=rebuild_cache)
+
+    if format == "table":
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=console,
+        ) as progress:
+            task = progress.add_task("Extracting paragraphs...", total=len(all_files))
+            all_paragraphs = extract_paragraphs_from_files(
+                all_files,
+                min_words=min_words,
+                jobs=jobs,
+                cache=cache,
+                on_file_done=lambda _: progress.advance(task),
+            )
+    else:
+        all_paragraphs = extract_paragraphs_from_files(
+            all_files, min_words=min_words, jobs=jobs, cache=cache
+        )
+
+    if cache:
+        cache.close()
+        log_status(f"Parse cache: {cache.stats.summary()}", format)
+    profile_count(paragraphs=len(all_paragraphs))
+
+    pairs = find_duplicates(
+        all_paragraphs,
+        threshold=threshold,
+        num_perm=num_perm,
+        bands=bands or None,
+        shingle_size=shingle_size,
+        same_file=same_file,
+        seed=seed,
+    )
+
+    # Output
+    if format == "table":
+        output_table(pairs, all_paragraphs, threshold, top=top)
+    elif format == "json":
+        settings = {
+            "threshold": threshold,
+            "num_perm": num_perm,
+            "bands": bands or choose_bands(num_perm, threshold),
+            "shingle_size": shingle_size,
+        }
+        output_json(pairs, all_paragraphs, settings)
+    else:
+        output_jsonl(pairs)
+
+
+if __name__ == "__main__":
+    app()
@@ -29,20 +29,40 @@ Usage:
     # Per-file breakdown
     uv run --with rich,typer scripts/tex_frequency.py chapters/07-agents-part-2/ --show-files
 
+    # Hunt repeated 4- and 5-word phrases (NumPy speeds up counting)
+    uv run --with rich,typer,numpy scripts/tex_frequency.py chapters/ --max-n 5
+
+    # Tokenize files with 8 worker processes (default: one per CPU core)
+    uv run --with rich,typer scripts/tex_frequency.py chapters/ minibooks/ -j 8
+
+    # Edit loop: recount only files changed since the last run, using the
+    # per-file index in .tex_cache/frequency.sqlite
+    uv run --with rich,typer scripts/tex_frequency.py chapters/ minibooks/ --incremental
+
+    # Stay running and refresh the report as files are saved
+    uv run --with rich,typer scripts/tex_frequency.py chapters/07-agents-part-2/ --watch
+
 Dependencies:
     pip install rich typer
     — or —
     uv run --with rich,typer scripts/tex_frequency.py ...
+
+    Optional: numpy (vectorized n-gram counting; identical results without it)
 """
 
 from __future__ import annotations
 
 import csv
 import json
+import pickle
+import sqlite3
 import sys
+import time
 from collections import Counter
+from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
 
 # =============================================================================
 # Dynamic Import Handling
@@ -79,41 +99,64 @@ typer_module = _import_with_hint("typer")
 typer = typer_module
 rich_module = _import_with_hint("rich")
 
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich import print as rprint
-
 # Import local utilities
 try:
     from tex_utils import (
+        Lazy,
         extract_paragraphs_from_tex,
-        find_tex_files,
-        find_section_files,
+        load_source,
+        parallel_map,
+        TokenStore,
+        DEFAULT_CACHE_DIR,
+        open_database,
+        PARSER_VERSION,
+        watch_files,
         clean_latex_text,
-        tokenize_regex,
-        get_ngrams,
-        filter_stopwords,
-        filter_stopword_ngrams,
+        TokenizedText,
         STOPWORDS,
+        collect_files,
+        log_status,
+        lazy_import,
+        finish_profiling,
+        profile_count,
+        profiled,
+        start_profiling,
     )
 except ImportError:
     script_dir = Path(__file__).parent
     sys.path.insert(0, str(script_dir))
     from tex_utils import (
+        Lazy,
         extract_paragraphs_from_tex,
-        find_tex_files,
-        find_section_files,
+        load_source,
+        parallel_map,
+        TokenStore,
+        DEFAULT_CACHE_DIR,
+        open_database,
+        PARSER_VERSION,
+        watch_files,
         clean_latex_text,
-        tokenize_regex,
-        get_ngrams,
-        filter_stopwords,
-        filter_stopword_ngrams,
+        TokenizedText,
         STOPWORDS,
+        collect_files,
+        log_status,
+        lazy_import,
+        finish_profiling,
+        profile_count,
+        profiled,
+        start_profiling,
     )
 
 
+# rich is only imported once table output (or a progress spinner) needs it
+Console = lazy_import("rich.console", "Console")
+Table = lazy_import("rich.table", "Table")
+Panel = lazy_import("rich.panel", "Panel")
+Progress = lazy_import("rich.progress", "Progress")
+SpinnerColumn = lazy_import("rich.progress", "SpinnerColumn")
+TextColumn = lazy_import("rich.progress", "TextColumn")
+
+
 # =============================================================================
 # CLI Application
 # =============================================================================
@@ -125,7 +168,7 @@ app = typer.Typer(
     rich_markup_mode="rich",
 )
 
-console = Console()
+console = Lazy(Console)
 
 
 # =============================================================================
@@ -162,70 +205,96 @@ DOMAIN_TERMS = frozenset({
 # Analysis Functions
 # =============================================================================
 
-def analyze_files(files: List[Path], min_words: int = 5) -> Dict:
+def _tokenize_file(file_path: Path) -> List[str]:
+    """Read, clean and tokenize one file into lowercase tokens."""
+    cleaned = clean_latex_text(load_source(file_path).text)
+    return TokenizedText(cleaned).lower()
+
+
+@profiled("analyze")
+def analyze_files(
+    files: List[Path],
+    min_words: int = 5,
+    jobs: Optional[int] = None,
+    on_file_done: Optional[Callable[[Path], None]] = None,
+) -> Dict:
     """
     Extract and tokenize text from multiple files.
 
+    Files are tokenized in a process pool (see ``parallel_map``); results are
+    combined in file order, so output does not depend on worker timing.
+    Tokens are interned into a single TokenStore: the corpus is held once as
+    integer ids and each file is a zero-copy view into it.
+
     Returns dict with:
-        - all_tokens: Combined token list
-        - file_tokens: Per-file token lists
+        - store: TokenStore with the whole corpus
+        - file_tokens: Per-file token id views
+        - file_stats: Per-file token and unique-token counts
         - total_files: Number of files processed
     """
-    all_tokens: List[str] = []
-    file_tokens: Dict[str, List[str]] = {}
+    store = TokenStore()
 
-    for file_path in files:
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
-
-        cleaned = clean_latex_text(content)
-        tokens = tokenize_regex(cleaned)
-        tokens_lower = [t.lower() for t in tokens]
-
-        all_tokens.extend(tokens_lower)
-        file_tokens[file_path.name] = tokens_lower
+    results = parallel_map(_tokenize_file, files, jobs=jobs, on_done=on_file_done)
+    for file_path, tokens_lower in zip(files, results):
+        store.add(file_path.name, tokens_lower)
 
     return {
-        "all_tokens": all_tokens,
-        "file_tokens": file_tokens,
+        "store": store,
+        "file_tokens": store.file_views(),
+        "file_stats": {
+            name: {"tokens": len(view), "unique": len(set(view))}
+            for name, view in store.file_views().items()
+        },
         "total_files": len(files),
     }
 
 
+@profiled("count")
 def compute_frequencies(
-    tokens: List[str],
+    store: TokenStore,
     include_stopwords: bool = False,
+    max_n: int = 3,
 ) -> Dict:
     """
-    Compute word, bigram, and trigram frequencies.
+    Compute word, bigram, and trigram frequencies, plus longer n-grams.
+
+    Counting runs over the store's integer ids with a stopword mask computed
+    once per vocabulary entry, rather than re-checking every token string
+    (vectorized with NumPy when it is installed).
+
+    Args:
+        store: Interned corpus tokens.
+        include_stopwords: Include stopwords in word frequencies.
+        max_n: Also count 4-grams up to max_n-grams (each with at least two
+            content words) for phrase-repetition hunting.
 
-    Returns dict with Counter objects for each n-gram type.
+    Returns dict with Counter objects for each n-gram type; longer n-grams
+    are under "ngrams", keyed by n.
     """
-    # Filter stopwords for content analysis
-    if include_stopwords:
-        content_tokens = tokens
-    else:
-        content_tokens = filter_stopwords(tokens)
+    stop_mask = store.mask(STOPWORDS)
 
-    # Word frequencies
-    word_counts = Counter(content_tokens)
+    # Word frequencies (stopwords filtered for content analysis)
+    word_counts = store.word_counts(exclude=None if include_stopwords else stop_mask)
 
-    # Bigrams
-    bigrams = get_ngrams(tokens, 2)
-    content_bigrams = filter_stopword_ngrams(bigrams, min_content=1)
-    bigram_counts = Counter(content_bigrams)
+    # Bigrams with at least one content word
+    bigram_counts = store.ngram_counts(2, stop_mask, min_content=1)
 
-    # Trigrams
-    trigrams = get_ngrams(tokens, 3)
-    content_trigrams = filter_stopword_ngrams(trigrams, min_content=2)
-    trigram_counts = Counter(content_trigrams)
+    # Trigrams with at least two content words
+    trigram_counts = store.ngram_counts(3, stop_mask, min_content=2)
+
+    # Longer phrases, with the same content-word floor as trigrams
+    ngram_counts = {
+        n: store.ngram_counts(n, stop_mask, min_content=2)
+        for n in range(4, max_n + 1)
+    }
 
     return {
         "words": word_counts,
         "bigrams": bigram_counts,
         "trigrams": trigram_counts,
-        "total_tokens": len(tokens),
-        "total_content_tokens": len(content_tokens),
+        "ngrams": ngram_counts,
+        "total_tokens": len(store),
+        "total_content_tokens": sum(word_counts.values()),
     }
 
 
@@ -277,6 +346,383 @@ def find_repetitive_phrases(
     }
 
 
+# =============================================================================
+# Incremental Index
+# =============================================================================
+
+# Bump when per-file counting or the stored totals change to invalidate old
+# index entries
+INDEX_VERSION = 2
+
+_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT NOT NULL,
+    options TEXT NOT NULL,
+    name TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    meta TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    PRIMARY KEY (path, options)
+);
+CREATE TABLE IF NOT EXISTS totals (
+    options TEXT PRIMARY KEY,
+    payload BLOB NOT NULL
+);
+"""
+
+def _count_file(file_path: Path, max_n: int = 3) -> Dict:
+    """
+    Count one file's words and n-grams for the FrequencyIndex.
+
+    N-grams are keyed by their space-joined phrase and only include grams
+    inside the file; grams spanning into the next file are rebuilt from the
+    stored ``head``/``tail`` tokens. Counting uses the same stopword rules as
+    :func:`compute_frequencies`.
+    """
+    tokens = _tokenize_file(file_path)
+    store = TokenStore()
+    store.add(file_path.name, tokens)
+    stop_mask = store.mask(STOPWORDS)
+
+    ngrams = {}
+    for n in range(2, max_n + 1):
+        counts = store.ngram_counts(n, stop_mask, min_content=1 if n == 2 else 2)
+        ngrams[n] = {" ".join(gram): c for gram, c in counts.items()}
+
+    edge = max_n - 1
+    return {
+        "tokens": len(tokens),
+        "unique": len(store.vocab),
+        "words": dict(store.word_counts()),
+        "ngrams": ngrams,
+        "head": tokens[:edge],
+        "tail": tokens[-edge:] if edge else [],
+    }
+
+
+@dataclass
+class IndexStats:
+    """
+    Work done by one FrequencyIndex.update() call.
+
+    Attributes:
+        updated: Files (re)counted because they were new or changed.
+        unchanged: Requested files whose stored counts were reused.
+        restored: Unchanged files added back to the totals from their
+            stored counts (a subset of ``unchanged``).
+        excluded: Indexed files left out of the totals because they were
+            not requested; their counts stay stored.
+        removed: Indexed files dropped because they no longer exist.
+        seconds: Wall time of the update.
+    """
+    updated: int = 0
+    unchanged: int = 0
+    restored: int = 0
+    excluded: int = 0
+    removed: int = 0
+    seconds: float = 0.0
+
+    def summary(self) -> str:
+        """Return a one-line human-readable summary."""
+        return (
+            f"{self.updated} updated, {self.unchanged} unchanged "
+            f"({self.restored} restored), {self.excluded} excluded, "
+            f"{self.removed} removed in {self.seconds * 1000:.0f} ms"
+        )
+
+
+class FrequencyIndex:
+    """
+    Persistent per-file frequency counts with incrementally updated totals.
+
+    Each file's word and n-gram counts are stored in an SQLite database next
+    to the parse cache, together with the corpus-wide totals and the set of
+    files they cover (saved on :meth:`close`). On :meth:`update`, only new or
+    changed files (by mtime and size) are re-tokenized: their stale counts
+    are subtracted from the totals and the fresh counts added. Files that
+    are not requested are subtracted from the totals but keep their stored
+    counts, so switching between one chapter and the whole book re-uses
+    them instead of re-tokenizing; only files that no longer exist are
+    dropped. The totals always describe the most recently requested file
+    set. An index file that is not a usable database is deleted and created
+    again; if that fails too, the index is kept in memory for this run.
+
+    Counts match a full :func:`analyze_files` + :func:`compute_frequencies`
+    run, including n-grams spanning file boundaries. Entries with equal counts
+    may be listed in a different order.
+
+    Args:
+        max_n: Longest n-gram size to index (3 = words, bigrams, trigrams).
+        cache_dir: Directory holding ``frequency.sqlite``.
+        rebuild: If True, discard all existing entries first.
+
+    Example:
+        >>> with FrequencyIndex() as index:
+        ...     index.update(find_tex_files("chapters/"))
+        ...     frequencies = index.frequencies()
+        ...     print(index.stats.summary())
+    """
+
+    def __init__(
+        self,
+        max_n: int = 3,
+        cache_dir: str | Path = DEFAULT_CACHE_DIR,
+        rebuild: bool = False,
+    ):
+        self.max_n = max_n
+        self.options = f"v{INDEX_VERSION}|p{PARSER_VERSION}|n{max_n}"
+        self.stats = IndexStats()
+        self._order: List[str] = []
+
+        try:
+            cache_dir = Path(cache_dir)
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            self._conn = open_database(
+                cache_dir / "frequency.sqlite", _INDEX_SCHEMA, rebuild=rebuild
+            )
+        except (sqlite3.DatabaseError, OSError) as e:
+            print(f"Warning: frequency index not saved ({e})", file=sys.stderr)
+            self._conn = open_database(":memory:", _INDEX_SCHEMA)
+
+        # Per-file metadata is small; counts payloads are loaded on demand
+        self._files: Dict[str, Dict] = {}
+        for path, name, mtime_ns, size, meta in self._conn.execute(
+            "SELECT path, name, mtime_ns, size, meta FROM files WHERE options = ?",
+            (self.options,),
+        ):
+            self._files[path] = {"name": name, "stat": (mtime_ns, size), **json.loads(meta)}
+
+        # Totals are keyed like compute_frequencies() output (n-gram tuples),
+        # so frequencies() is a copy rather than a conversion. They are
+        # pickled, which loads several times faster than JSON + re-keying.
+        # _counted holds the files whose counts make up the totals.
+        self._totals: Dict[int, Counter] = {n: Counter() for n in range(1, max_n + 1)}
+        self._counted: Set[str] = set()
+        self._dirty = False
+        row = self._conn.execute(
+            "SELECT payload FROM totals WHERE options = ?", (self.options,)
+        ).fetchone()
+        if row:
+            saved = pickle.loads(row[0])
+            # Totals covering a file without a stored row cannot be updated;
+            # start empty and re-add every file from its stored counts
+            if self._files.keys() >= set(saved["files"]):
+                self._totals = {n: Counter(c) for n, c in saved["counts"].items()}
+                self._counted = set(saved["files"])
+
+    def __enter__(self) -> "FrequencyIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Save the totals, commit pending writes and close the database."""
+        if self._dirty:
+            payload = pickle.dumps({
+                "files": sorted(self._counted),
+                "counts": {n: dict(c) for n, c in self._totals.items()},
+            })
+            self._conn.execute(
+                "INSERT OR REPLACE INTO totals VALUES (?, ?)", (self.options, payload)
+            )
+        self._conn.commit()
+        self._conn.close()
+
+    @profiled("index")
+    def update(
+        self,
+        files: Sequence[Path],
+        jobs: Optional[int] = None,
+        on_file_done: Optional[Callable[[Path], None]] = None,
+    ) -> List[Path]:
+        """
+        Bring the index up to date with a set of files.
+
+        Args:
+            files: LaTeX files making up the corpus, in report order.
+            jobs: Worker processes for re-counting. None or 0 means one per
+                CPU core.
+            on_file_done: Called with each file path once it has been handled.
+
+        Returns:
+            The files that were (re)counted.
+        """
+        start = time.perf_counter()
+        requested = {str(Path(f).resolve()): Path(f) for f in files}
+        self._order = list(requested)
+
+        changed: List[str] = []
+        stats: Dict[str, Tuple[int, int]] = {}
+        for key, file_path in requested.items():
+            stat = file_path.stat()
+            stats[key] = (stat.st_mtime_ns, stat.st_size)
+            entry = self._files.get(key)
+            if entry and entry["stat"] == stats[key]:
+                if on_file_done:
+                    on_file_done(file_path)
+            else:
+                changed.append(key)
+
+        kept = [key for key in requested if key not in changed]
+        restored = [key for key in kept if key not in self._counted]
+        excluded = [key for key in self._counted if key not in requested]
+        removed = [
+            key for key in self._files
+            if key not in requested and not Path(key).exists()
+        ]
+
+        # Move the totals to the requested file set: subtract the excluded
+        # files, or re-sum the kept ones when that loads fewer stored counts
+        if len(excluded) > len(kept):
+            self._totals = {n: Counter() for n in range(1, self.max_n + 1)}
+            self._counted.clear()
+            restored = kept
+        else:
+            for key in excluded:
+                self._apply(self._load(key), -1)
+                self._counted.discard(key)
+        for key in restored:
+            self._apply(self._load(key), +1)
+            self._counted.add(key)
+
+        for key in removed:
+            del self._files[key]
+            self._conn.execute(
+                "DELETE FROM files WHERE path = ? AND options = ?", (key, self.options)
+            )
+
+        results = parallel_map(
+            partial(_count_file, max_n=self.max_n),
+            [requested[key] for key in changed],
+            jobs=jobs,
+            on_done=on_file_done,
+        )
+        for key, counts in zip(changed, results):
+            if key in self._counted:
+                self._apply(self._load(key), -1)
+            self._apply(counts, +1)
+            self._store(key, requested[key], stats[key], counts)
+            self._counted.add(key)
+
+        self._dirty = self._dirty or bool(changed or restored or excluded)
+        self.stats = IndexStats(
+            updated=len(changed),
+            unchanged=len(kept),
+            restored=len(restored),
+            excluded=len(excluded),
+            removed=len(removed),
+            seconds=time.perf_counter() - start,
+        )
+        return [requested[key] for key in changed]
+
+    @profiled("count")
+    def frequencies(self, include_stopwords: bool = False) -> Dict:
+        """
+        Corpus frequencies in the same shape as :func:`compute_frequencies`.
+
+        N-grams spanning two files are counted here, from each file's stored
+        edge tokens in the current file order.
+        """
+        words = self._totals[1]
+        if not include_stopwords:
+            words = Counter({w: c for w, c in words.items() if w not in STOPWORDS})
+
+        grams = {}
+        for n, boundary in self._boundary_counts().items():
+            grams[n] = Counter(self._totals[n])
+            grams[n].update(boundary)
+
+        return {
+            "words": words,
+            "bigrams": grams[2],
+            "trigrams": grams[3],
+            "ngrams": {n: grams[n] for n in range(4, self.max_n + 1)},
+            "total_tokens": sum(self._files[key]["tokens"] for key in self._order),
+            "total_content_tokens": sum(words.values()),
+        }
+
+    def file_stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-file token and unique-token counts, keyed by file name."""
+        return {
+            self._files[key]["name"]: {
+                "tokens": self._files[key]["tokens"],
+                "unique": self._files[key]["unique"],
+            }
+            for key in self._order
+        }
+
+    def _boundary_counts(self) -> Dict[int, Counter]:
+        """Count n-grams that start in one file and end in a later one."""
+        boundary = {n: Counter() for n in range(2, self.max_n + 1)}
+        edges = [self._files[key] for key in self._order]
+        for i, entry in enumerate(edges):
+            tail = entry["tail"]
+            if not tail:
+                continue
+            # Tokens following this file, up to max_n - 1 of them
+            following: List[str] = []
+            for nxt in edges[i + 1:]:
+                following.extend(nxt["head"])
+                if len(following) >= self.max_n - 1:
+                    break
+            window = tail + following[:self.max_n - 1]
+            for n in boundary:
+                min_content = 1 if n == 2 else 2
+                # Starts within the tail whose gram runs past the file end
+                for s in range(max(len(tail) - n + 1, 0), len(tail)):
+                    gram = tuple(window[s:s + n])
+                    if len(gram) < n:
+                        break
+                    if sum(1 for w in gram if w not in STOPWORDS) >= min_content:
+                        boundary[n][gram] += 1
+        return boundary
+
+    def _apply(self, counts: Dict, sign: int) -> None:
+        """Add (+1) or subtract (-1) one file's counts from the totals."""
+        for n, file_counts in [(1, counts["words"]), *counts["ngrams"].items()]:
+            n = int(n)
+            totals = self._totals[n]
+            for key, c in file_counts.items():
+                if n > 1:
+                    key = tuple(key.split(" "))
+                value = totals[key] + sign * c
+                if value:
+                    totals[key] = value
+                else:
+                    del totals[key]
+
+    def _load(self, key: str) -> Dict:
+        """Load a file's stored counts."""
+        row = self._conn.execute(
+            "SELECT payload FROM files WHERE path = ? AND options = ?",
+            (key, self.options),
+        ).fetchone()
+        return json.loads(row[0])
+
+    def _store(
+        self,
+        key: str,
+        file_path: Path,
+        stat: Tuple[int, int],
+        counts: Dict,
+    ) -> None:
+        """Persist a file's counts and remember its (mtime_ns, size) stat."""
+        meta = {
+            "tokens": counts["tokens"],
+            "unique": counts["unique"],
+            "head": counts["head"],
+            "tail": counts["tail"],
+        }
+        payload = json.dumps({"words": counts["words"], "ngrams": counts["ngrams"]})
+        self._conn.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, self.options, file_path.name, *stat, json.dumps(meta), payload),
+        )
+        self._files[key] = {"name": file_path.name, "stat": stat, **meta}
+
+
 # =============================================================================
 # Output Formatters
 # =============================================================================
@@ -286,11 +732,12 @@ def format_ngram(ngram: Tuple[str, ...]) -> str:
     return " ".join(ngram)
 
 
+@profiled("render")
 def output_table(
     frequencies: Dict,
     domain_terms: List[Dict],
     repetitive: Dict,
-    file_tokens: Dict[str, List[str]],
+    file_stats: Dict[str, Dict[str, int]],
     top_n: int = 50,
     min_count: int = 3,
     show_files: bool = False,
@@ -302,7 +749,7 @@ def output_table(
     # Summary panel
     summary = f"[bold]{total:,}[/bold] total tokens"
     summary += f" | [bold]{content:,}[/bold] content words"
-    summary += f" | [dim]{len(file_tokens)} files[/dim]"
+    summary += f" | [dim]{len(file_stats)} files[/dim]"
     console.print(Panel(summary, title="[bold blue]Frequency Analysis[/bold blue]", expand=False))
 
     # Word frequency table
@@ -318,6 +765,10 @@ def output_table(
         frequencies["trigrams"], "Trigrams", top_n, min_count
     )
 
+    # Longer n-gram tables (--max-n)
+    for n, counts in frequencies["ngrams"].items():
+        _output_ngram_table(counts, f"{n}-grams", top_n, min_count)
+
     # Domain terms
     if domain_terms:
         _output_domain_table(domain_terms)
@@ -328,7 +779,7 @@ def output_table(
 
     # Per-file breakdown
     if show_files:
-        _output_file_breakdown(file_tokens)
+        _output_file_breakdown(file_stats)
 
 
 def _output_word_table(counts: Counter, top_n: int, min_count: int, total: int):
@@ -415,7 +866,7 @@ def _output_repetitive_table(repetitive: Dict):
         console.print(table)
 
 
-def _output_file_breakdown(file_tokens: Dict[str, List[str]]):
+def _output_file_breakdown(file_stats: Dict[str, Dict[str, int]]):
     """Output per-file token breakdown."""
     table = Table(title="Per-File Breakdown")
     table.add_column("File", style="green")
@@ -423,12 +874,12 @@ def _output_file_breakdown(file_tokens: Dict[str, List[str]]):
     table.add_column("Unique", style="cyan", justify="right")
     table.add_column("Lexical Diversity", style="yellow", justify="right")
 
-    for filename, tokens in sorted(file_tokens.items()):
-        unique = len(set(tokens))
-        diversity = (unique / len(tokens)) * 100 if tokens else 0
+    for filename, stats in sorted(file_stats.items()):
+        tokens, unique = stats["tokens"], stats["unique"]
+        diversity = (unique / tokens) * 100 if tokens else 0
         table.add_row(
             filename,
-            str(len(tokens)),
+            str(tokens),
             str(unique),
             f"{diversity:.1f}%",
         )
@@ -436,19 +887,32 @@ def _output_file_breakdown(file_tokens: Dict[str, List[str]]):
     console.print(table)
 
 
+@profiled("render")
 def output_json(
     frequencies: Dict,
     domain_terms: List[Dict],
     repetitive: Dict,
-    file_tokens: Dict[str, List[str]],
+    file_stats: Dict[str, Dict[str, int]],
     top_n: int = 50,
 ):
     """Output as JSON."""
+    data = json_report(frequencies, domain_terms, repetitive, file_stats, top_n)
+    print(json.dumps(data, indent=2))
+
+
+def json_report(
+    frequencies: Dict,
+    domain_terms: List[Dict],
+    repetitive: Dict,
+    file_stats: Dict[str, Dict[str, int]],
+    top_n: int = 50,
+) -> Dict:
+    """Build the JSON report (summary, top words and n-grams, files)."""
     data = {
         "summary": {
             "total_tokens": frequencies["total_tokens"],
             "content_tokens": frequencies["total_content_tokens"],
-            "files": len(file_tokens),
+            "files": len(file_stats),
         },
         "words": [
             {"word": w, "count": c}
@@ -467,19 +931,25 @@ def output_json(
             "bigrams": [{"phrase": p, "count": c} for p, c in repetitive["bigrams"]],
             "trigrams": [{"phrase": p, "count": c} for p, c in repetitive["trigrams"]],
         },
-        "files": {
-            name: {"tokens": len(toks), "unique": len(set(toks))}
-            for name, toks in file_tokens.items()
-        },
+        "files": file_stats,
     }
-    print(json.dumps(data, indent=2))
-
-
+    if frequencies["ngrams"]:
+        data["ngrams"] = {
+            str(n): [
+                {"phrase": format_ngram(ng), "count": c}
+                for ng, c in counts.most_common(top_n)
+            ]
+            for n, counts in frequencies["ngrams"].items()
+        }
+    return data
+
+
+@profiled("render")
 def output_jsonl(
     frequencies: Dict,
     domain_terms: List[Dict],
     repetitive: Dict,
-    file_tokens: Dict[str, List[str]],
+    file_stats: Dict[str, Dict[str, int]],
     top_n: int = 50,
 ):
     """Output as JSON Lines."""
@@ -495,12 +965,18 @@ def output_jsonl(
     for ngram, count in frequencies["trigrams"].most_common(top_n):
         print(json.dumps({"type": "trigram", "value": format_ngram(ngram), "count": count}))
 
+    # Longer n-grams
+    for n, counts in frequencies["ngrams"].items():
+        for ngram, count in counts.most_common(top_n):
+            print(json.dumps({"type": f"{n}-gram", "value": format_ngram(ngram), "count": count}))
+
 
+@profiled("render")
 def output_csv(
     frequencies: Dict,
     domain_terms: List[Dict],
     repetitive: Dict,
-    file_tokens: Dict[str, List[str]],
+    file_stats: Dict[str, Dict[str, int]],
     top_n: int = 50,
 ):
     """Output as CSV."""
@@ -519,6 +995,96 @@ def output_csv(
     for ngram, count in frequencies["trigrams"].most_common(top_n):
         writer.writerow(["trigram", format_ngram(ngram), count, ""])
 
+    for n, counts in frequencies["ngrams"].items():
+        for ngram, count in counts.most_common(top_n):
+            writer.writerow([f"{n}-gram", format_ngram(ngram), count, ""])
+
+
+def render_report(
+    frequencies: Dict,
+    file_stats: Dict[str, Dict[str, int]],
+    format: str,
+    top_n: int = 50,
+    min_count: int = 3,
+    show_files: bool = False,
+):
+    """Derive domain terms and repetitive phrases, then write the report."""
+    domain_terms = get_domain_term_frequencies(
+        frequencies["words"],
+        frequencies["total_tokens"],
+    )
+    repetitive = find_repetitive_phrases(
+        frequencies["bigrams"],
+        frequencies["trigrams"],
+    )
+
+    if format == "table":
+        output_table(
+            frequencies,
+            domain_terms,
+            repetitive,
+            file_stats,
+            top_n=top_n,
+            min_count=min_count,
+            show_files=show_files,
+        )
+    elif format == "json":
+        output_json(frequencies, domain_terms, repetitive, file_stats, top_n=top_n)
+    elif format == "jsonl":
+        output_jsonl(frequencies, domain_terms, repetitive, file_stats, top_n=top_n)
+    elif format == "csv":
+        output_csv(frequencies, domain_terms, repetitive, file_stats, top_n=top_n)
+
+
+# =============================================================================
+# Watch Mode
+# =============================================================================
+
+def watch_frequencies(
+    collect: Callable[[], List[Path]],
+    index: FrequencyIndex,
+    render: Callable[[Dict, Dict[str, Dict[str, int]]], None],
+    format: str,
+    include_stopwords: bool = False,
+    interval: float = 0.5,
+):
+    """
+    Re-render the report whenever a watched file changes.
+
+    Changed files are recounted through the FrequencyIndex, so each update
+    only re-tokenizes the touched files. Runs until interrupted.
+
+    Args:
+        collect: Returns the current list of files to analyze.
+        index: An up-to-date FrequencyIndex for the collected files.
+        render: Writes the report for (frequencies, file_stats).
+        format: Output format (table output is redrawn in place).
+        include_stopwords: Include stopwords in word frequencies.
+        interval: Seconds between polls for changes.
+    """
+    def redraw():
+        if format == "table":
+            console.clear()
+        render(index.frequencies(include_stopwords=include_stopwords), index.file_stats())
+
+    redraw()
+    log_status(f"Watching {len(index.file_stats())} files (Ctrl+C to stop)", format)
+
+    try:
+        for changes in watch_files(collect, interval=interval):
+            index.update(changes.files, jobs=1)
+            counted = time.perf_counter()
+            redraw()
+            done = time.perf_counter()
+            names = ", ".join(f.name for f in changes.changed + changes.removed)
+            log_status(
+                f"Updated {names}: count {index.stats.seconds * 1000:.0f} ms, "
+                f"report {(done - counted) * 1000:.0f} ms",
+                format,
+            )
+    except KeyboardInterrupt:
+        pass
+
 
 # =============================================================================
 # Main Command
@@ -526,6 +1092,7 @@ def output_csv(
 
 @app.command()
 def main(
+    ctx: typer.Context,
     paths: List[Path] = typer.Argument(
         ...,
         help="LaTeX files or directories to analyze",
@@ -569,6 +1136,13 @@ def main(
         "--trigrams-only",
         help="Only output trigram analysis",
     ),
+    max_n: int = typer.Option(
+        3,
+        "--max-n",
+        help="Also count 4-grams up to N-grams for phrase repetition",
+        min=3,
+        max=10,
+    ),
     recursive: bool = typer.Option(
         True,
         "--recursive/--no-recursive", "-r/-R",
@@ -579,6 +1153,49 @@ def main(
         "--sections-only", "-s",
         help="Only look in sections/ subdirectory",
     ),
+    follow_includes: bool = typer.Option(
+        False,
+        "--follow-includes", "-I",
+        help="Follow \\subfile/\\input/\\include from .tex files (or a directory's main.tex), in reading order",
+    ),
+    jobs: int = typer.Option(
+        0,
+        "--jobs", "-j",
+        help="Parallel worker processes (0 = one per CPU core)",
+        min=0,
+    ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental", "-i",
+        help="Reuse per-file counts from the frequency index; recount changed files only",
+    ),
+    rebuild_index: bool = typer.Option(
+        False,
+        "--rebuild-index",
+        help="Discard the frequency index before an --incremental run",
+    ),
+    watch: bool = typer.Option(
+        False,
+        "--watch", "-w",
+        help="Stay running and re-render the report when files change (uses the index)",
+    ),
+    interval: float = typer.Option(
+        0.5,
+        "--interval",
+        help="Seconds between checks for changed files (with --watch)",
+        min=0.05,
+    ),
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help="Print per-stage wall/CPU time and counts to stderr (parses in one process)",
+    ),
+    profile_out: Optional[Path] = typer.Option(
+        None,
+        "--profile-out",
+        help="Also write a Chrome trace (.json) or cProfile stats (other names); implies --profile",
+        dir_okay=False,
+    ),
 ):
     """
     Analyze word and n-gram frequencies in LaTeX documents.
@@ -599,92 +1216,97 @@ def main(
 
         # Per-file breakdown
         tex-frequency chapters/07-agents-part-2/ --show-files
+
+        # Edit loop: only recount files changed since the last run
+        tex-frequency chapters/ minibooks/ --incremental
+
+        # Keep the report up to date while editing
+        tex-frequency chapters/07-agents-part-2/ --watch
     """
+    # Profile in this process: stages inside worker processes are not seen
+    if profile or profile_out:
+        start_profiling(profile_out)
+        ctx.call_on_close(finish_profiling)
+        jobs = 1
+
     # Collect files
-    all_files: List[Path] = []
-
-    for path in paths:
-        if path.is_file():
-            all_files.append(path)
-        elif path.is_dir():
-            if sections_only:
-                all_files.extend(find_section_files(path))
-            else:
-                all_files.extend(find_tex_files(path, recursive=recursive))
+    collect = partial(
+        collect_files, paths, sections_only=sections_only, recursive=recursive,
+        follow_includes=follow_includes,
+    )
+    all_files = collect()
 
     if not all_files:
         console.print("[red]Error:[/red] No .tex files found", file=sys.stderr)
         raise typer.Exit(1)
+    profile_count(files=len(all_files))
+
+    if format not in ("table", "json", "jsonl", "csv"):
+        console.print(f"[red]Error:[/red] Unknown format: {format}", file=sys.stderr)
+        raise typer.Exit(1)
+
+    render = partial(
+        render_report,
+        format=format,
+        top_n=top,
+        min_count=min_count,
+        show_files=show_files,
+    )
 
     # Extract and analyze
-    if format == "table":
+    if incremental or watch:
+        with FrequencyIndex(max_n=max_n, rebuild=rebuild_index) as index:
+            if format == "table":
+                with Progress(
+                    SpinnerColumn(),
+                    TextColumn("[progress.description]{task.description}"),
+                    console=console,
+                ) as progress:
+                    task = progress.add_task("Updating index...", total=len(all_files))
+                    index.update(
+                        all_files,
+                        jobs=jobs,
+                        on_file_done=lambda _: progress.advance(task),
+                    )
+            else:
+                index.update(all_files, jobs=jobs)
+
+            if watch:
+                watch_frequencies(collect, index, render, format, include_stopwords, interval)
+                return
+
+            frequencies = index.frequencies(include_stopwords=include_stopwords)
+            file_stats = index.file_stats()
+            log_status(f"Frequency index: {index.stats.summary()}", format)
+    elif format == "table":
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             console=console,
         ) as progress:
-            task = progress.add_task("Analyzing...", total=1)
-            analysis = analyze_files(all_files)
+            task = progress.add_task("Analyzing...", total=len(all_files))
+            analysis = analyze_files(
+                all_files,
+                jobs=jobs,
+                on_file_done=lambda _: progress.advance(task),
+            )
             frequencies = compute_frequencies(
-                analysis["all_tokens"],
+                analysis["store"],
                 include_stopwords=include_stopwords,
+                max_n=max_n,
             )
-            progress.advance(task)
+        file_stats = analysis["file_stats"]
     else:
-        analysis = analyze_files(all_files)
+        analysis = analyze_files(all_files, jobs=jobs)
         frequencies = compute_frequencies(
-            analysis["all_tokens"],
+            analysis["store"],
             include_stopwords=include_stopwords,
+            max_n=max_n,
         )
+        file_stats = analysis["file_stats"]
 
-    # Compute additional metrics
-    domain_terms = get_domain_term_frequencies(
-        frequencies["words"],
-        frequencies["total_tokens"],
-    )
-    repetitive = find_repetitive_phrases(
-        frequencies["bigrams"],
-        frequencies["trigrams"],
-    )
-
-    # Output
-    if format == "table":
-        output_table(
-            frequencies,
-            domain_terms,
-            repetitive,
-            analysis["file_tokens"],
-            top_n=top,
-            min_count=min_count,
-            show_files=show_files,
-        )
-    elif format == "json":
-        output_json(
-            frequencies,
-            domain_terms,
-            repetitive,
-            analysis["file_tokens"],
-            top_n=top,
-        )
-    elif format == "jsonl":
-        output_jsonl(
-            frequencies,
-            domain_terms,
-            repetitive,
-            analysis["file_tokens"],
-            top_n=top,
-        )
-    elif format == "csv":
-        output_csv(
-            frequencies,
-            domain_terms,
-            repetitive,
-            analysis["file_tokens"],
-            top_n=top,
-        )
-    else:
-        console.print(f"[red]Error:[/red] Unknown format: {format}", file=sys.stderr)
-        raise typer.Exit(1)
+    profile_count(tokens=frequencies["total_tokens"])
+    render(frequencies, file_stats)
 
 
 if __name__ == "__main__":
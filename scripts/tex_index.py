@@ -0,0 +1,836 @@
+#!/usr/bin/env python3
+"""
+tex_index.py — Full-text search over the prose paragraphs of LaTeX documents.
+
+This tool loads the extracted prose paragraphs into an SQLite database with
+an FTS5 full-text index over their cleaned text, so ad-hoc questions
+("where do we say X?", "which sections mention MCP?") are answered in
+milliseconds instead of by grepping raw LaTeX or re-running tex_chunks:
+
+    - build:  Index paragraphs with their chapter, section, lines and word
+              counts; re-running only re-indexes new or changed files
+    - search: BM25-ranked matches with file:line locations and snippets,
+              or hit counts per section
+
+Queries use FTS5 syntax: words (all must occur), "exact phrases", OR, NOT,
+NEAR(a b, 5) and prefix* searches. Matching ignores case and stems English
+words (agent also finds agents). A query that is not valid FTS5 syntax is
+searched as plain words.
+
+Output Formats (search):
+    - table: Rich formatted table (default, human-readable)
+    - json:  Single JSON object with the query, timing and matches
+    - jsonl: One JSON object per match (streaming-friendly)
+
+Usage:
+    # Index the whole book (re-run after edits; unchanged files are skipped)
+    uv run --with rich,typer scripts/tex_index.py build chapters/ minibooks/
+
+    # Where do we say X?
+    uv run --with rich,typer scripts/tex_index.py search '"context window"'
+
+    # Which sections mention MCP?
+    uv run --with rich,typer scripts/tex_index.py search MCP --sections
+
+    # One chapter only, as JSONL for scripts
+    uv run --with rich,typer scripts/tex_index.py search 'NEAR(tool call, 3)' --chapter 06 -f jsonl
+
+    # The database lives in .tex_cache/ by default; keep another one elsewhere
+    uv run --with rich,typer scripts/tex_index.py build minibooks/ --db minibooks.sqlite
+
+Dependencies:
+    pip install rich typer
+    — or —
+    uv run --with rich,typer scripts/tex_index.py ...
+
+    Needs SQLite with FTS5, which Python's bundled SQLite includes on the
+    common platforms.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import sys
+import time
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+# =============================================================================
+# Dynamic Import Handling
+# =============================================================================
+
+def _import_with_hint(module_name: str, package_name: Optional[str] = None):
+    """
+    Import a module with a helpful error message if missing.
+
+    Args:
+        module_name: The module to import.
+        package_name: The pip/uv package name if different from module name.
+
+    Returns:
+        The imported module.
+
+    Raises:
+        SystemExit: If the module is not found, with helpful install instructions.
+    """
+    package_name = package_name or module_name
+    try:
+        return __import__(module_name)
+    except ImportError:
+        print(f"\n✗ Missing required package: {package_name}", file=sys.stderr)
+        print(f"\nInstall with:", file=sys.stderr)
+        print(f"    pip install {package_name}", file=sys.stderr)
+        print(f"\nOr run directly with uv:", file=sys.stderr)
+        print(f"    uv run --with rich,typer {sys.argv[0]} ...", file=sys.stderr)
+        sys.exit(1)
+
+
+# Import required packages with helpful errors
+typer_module = _import_with_hint("typer")
+typer = typer_module
+rich_module = _import_with_hint("rich")
+
+# Import local utilities
+try:
+    from tex_utils import (
+        Lazy,
+        ParseCache,
+        DEFAULT_CACHE_DIR,
+        PARSER_VERSION,
+        extract_paragraphs_from_files,
+        open_database,
+        load_source,
+        collect_files,
+        log_status,
+        lazy_import,
+        finish_profiling,
+        profile_count,
+        profiled,
+        start_profiling,
+        _display_path,
+    )
+except ImportError:
+    script_dir = Path(__file__).parent
+    sys.path.insert(0, str(script_dir))
+    from tex_utils import (
+        Lazy,
+        ParseCache,
+        DEFAULT_CACHE_DIR,
+        PARSER_VERSION,
+        extract_paragraphs_from_files,
+        open_database,
+        load_source,
+        collect_files,
+        log_status,
+        lazy_import,
+        finish_profiling,
+        profile_count,
+        profiled,
+        start_profiling,
+        _display_path,
+    )
+
+
+# rich is only imported for table output (or a progress spinner)
+Console = lazy_import("rich.console", "Console")
+Table = lazy_import("rich.table", "Table")
+escape = lazy_import("rich.markup", "escape")
+
+
+# =============================================================================
+# CLI Application
+# =============================================================================
+
+app = typer.Typer(
+    name="tex-index",
+    help="Index prose paragraphs in SQLite and search them with FTS5.",
+    add_completion=False,
+    rich_markup_mode="rich",
+)
+
+console = Lazy(Console)
+err_console = Lazy(lambda: Console(stderr=True))
+
+
+# =============================================================================
+# Corpus Index
+# =============================================================================
+
+# Bump when the schema or the indexed fields change to rebuild old databases
+INDEX_VERSION = 1
+
+# Default database location (next to the parse cache)
+DEFAULT_DB = DEFAULT_CACHE_DIR / "corpus.sqlite"
+
+# Match markers put into snippets by SQLite, replaced per output format
+_MARK_START, _MARK_END = "\x02", "\x03"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    chapter TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS paragraphs (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    chapter TEXT NOT NULL,
+    section TEXT NOT NULL,
+    line_start INTEGER NOT NULL,
+    line_end INTEGER NOT NULL,
+    word_count INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    cleaned_text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS paragraphs_path ON paragraphs (path);
+CREATE VIRTUAL TABLE IF NOT EXISTS paragraphs_fts USING fts5(
+    cleaned_text,
+    content='paragraphs',
+    content_rowid='id',
+    tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS paragraphs_insert AFTER INSERT ON paragraphs BEGIN
+    INSERT INTO paragraphs_fts (rowid, cleaned_text) VALUES (new.id, new.cleaned_text);
+END;
+CREATE TRIGGER IF NOT EXISTS paragraphs_delete AFTER DELETE ON paragraphs BEGIN
+    INSERT INTO paragraphs_fts (paragraphs_fts, rowid, cleaned_text)
+    VALUES ('delete', old.id, old.cleaned_text);
+END;
+"""
+
+
+@dataclass
+class IndexStats:
+    """
+    Work done by one CorpusIndex.update() call.
+
+    Attributes:
+        updated: Files (re)indexed because they were new or changed.
+        removed: Indexed files dropped because they were not requested.
+        unchanged: Files whose stored paragraphs were kept.
+        paragraphs: Paragraphs in the index afterwards.
+        seconds: Wall time of the update.
+    """
+    updated: int = 0
+    removed: int = 0
+    unchanged: int = 0
+    paragraphs: int = 0
+    seconds: float = 0.0
+
+    def summary(self) -> str:
+        """Return a one-line human-readable summary."""
+        return (
+            f"{self.updated} updated, {self.removed} removed, "
+            f"{self.unchanged} unchanged, {self.paragraphs:,} paragraphs "
+            f"in {self.seconds * 1000:.0f} ms"
+        )
+
+
+@dataclass
+class SearchHit:
+    """
+    One paragraph matching a search.
+
+    Attributes:
+        location: file:line of the paragraph start.
+        chapter: Chapter (or minibook) directory of the file.
+        section: Section heading the paragraph appears under.
+        line_start: Starting line number (1-indexed).
+        line_end: Ending line number (1-indexed).
+        word_count: Word count of the paragraph.
+        score: BM25 relevance (lower is better, as reported by SQLite).
+        snippet: Matching excerpt, with matches between the index markers.
+    """
+    location: str
+    chapter: str
+    section: str
+    line_start: int
+    line_end: int
+    word_count: int
+    score: float
+    snippet: str
+
+    def to_dict(self, highlight: Sequence[str] = ("**", "**")) -> dict:
+        """Convert to dictionary for JSON serialization, marking matches."""
+        d = asdict(self)
+        d["snippet"] = _mark(self.snippet, *highlight)
+        d["score"] = round(self.score, 4)
+        return d
+
+
+def _mark(snippet: str, start: str, end: str) -> str:
+    """Replace the index match markers in a snippet."""
+    return snippet.replace(_MARK_START, start).replace(_MARK_END, end)
+
+
+def chapter_of(file_path: Path) -> str:
+    """
+    Name of the chapter directory a file belongs to.
+
+    The innermost ``chapters/<name>`` wins, so a minibook's chapters are
+    told apart; other minibook files get the minibook's name.
+
+    Example:
+        >>> chapter_of(Path("chapters/07-agents-part-2/sections/02-triggers.tex"))
+        '07-agents-part-2'
+    """
+    parts = file_path.resolve().parts[:-1]
+    for container in ("chapters", "minibooks"):
+        for i in range(len(parts) - 2, -1, -1):
+            if parts[i] == container:
+                return parts[i + 1]
+    return file_path.resolve().parent.name
+
+
+def _plain_query(query: str) -> str:
+    """Quote each word so FTS5 syntax characters are searched literally."""
+    return " ".join('"' + word.replace('"', '""') + '"' for word in query.split())
+
+
+class CorpusIndex:
+    """
+    SQLite database of prose paragraphs with an FTS5 full-text index.
+
+    Paragraphs are stored with their file, chapter, section, line range,
+    word count, raw and cleaned text; an external-content FTS5 table over
+    the cleaned text is kept in sync by triggers. On :meth:`update`, files
+    are re-indexed only when their content hash changed (mtime and size are
+    checked first, so untouched files are not read), and files no longer
+    requested are dropped: the index always describes the most recently
+    requested file set.
+
+    Args:
+        db_path: SQLite database file.
+        rebuild: If True, discard all indexed paragraphs first, replacing
+            the file if it is not a usable database.
+
+    Raises:
+        RuntimeError: If the database cannot be opened or created.
+
+    Example:
+        >>> with CorpusIndex() as index:
+        ...     index.update(find_tex_files("chapters/"))
+        ...     for hit in index.search('"context window"'):
+        ...         print(hit.location)
+    """
+
+    def __init__(self, db_path: str | Path = DEFAULT_DB, rebuild: bool = False):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.stats = IndexStats()
+
+        try:
+            self._conn = open_database(self.db_path, _SCHEMA, recreate=rebuild)
+        except sqlite3.OperationalError as e:
+            raise RuntimeError(f"SQLite {sqlite3.sqlite_version} cannot create the index: {e}")
+        except (sqlite3.DatabaseError, OSError) as e:
+            raise RuntimeError(
+                f"{self.db_path} is not an index database ({e}); "
+                "build with --rebuild to replace it"
+            )
+        if rebuild:
+            self._clear()
+        self._conn.commit()
+
+    def __enter__(self) -> "CorpusIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Commit pending writes and close the database."""
+        self._conn.commit()
+        self._conn.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM paragraphs").fetchone()[0]
+
+    def _clear(self) -> None:
+        """Drop every indexed file and paragraph."""
+        self._conn.execute("DELETE FROM files")
+        self._conn.execute("DELETE FROM paragraphs")
+        self._conn.execute("INSERT INTO paragraphs_fts (paragraphs_fts) VALUES ('delete-all')")
+
+    @profiled("index")
+    def update(
+        self,
+        files: Sequence[Path],
+        min_words: int = 1,
+        jobs: Optional[int] = None,
+        cache: Optional[ParseCache] = None,
+        on_file_done: Optional[Callable[[Path], None]] = None,
+    ) -> List[Path]:
+        """
+        Bring the index up to date with a set of files.
+
+        Args:
+            files: LaTeX files making up the corpus, in reading order.
+            min_words: Minimum word count to index a paragraph. Changing it
+                (or the parser version) re-indexes every file.
+            jobs: Worker processes for re-parsing. None or 0 means one per
+                CPU core.
+            cache: Parse cache to extract changed files through.
+            on_file_done: Called with each file path once it has been handled.
+
+        Returns:
+            The files that were (re)indexed.
+        """
+        start = time.perf_counter()
+        options = f"v{INDEX_VERSION}|p{PARSER_VERSION}|{min_words}"
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'options'").fetchone()
+        if row is None or row[0] != options:
+            self._clear()
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('options', ?)", (options,))
+
+        requested = {str(Path(f).resolve()): Path(f) for f in files}
+        indexed = {
+            path: (mtime_ns, size, content_hash)
+            for path, mtime_ns, size, content_hash in self._conn.execute(
+                "SELECT path, mtime_ns, size, content_hash FROM files"
+            )
+        }
+
+        removed = [key for key in indexed if key not in requested]
+        changed: List[str] = []
+        sources = {}
+        for key, file_path in requested.items():
+            source = load_source(file_path)
+            entry = indexed.get(key)
+            if entry and entry[:2] == (source.mtime_ns, source.size):
+                pass
+            elif entry and entry[2] == source.content_hash:
+                # Touched but unchanged: refresh the stat fields only
+                self._conn.execute(
+                    "UPDATE files SET mtime_ns = ?, size = ? WHERE path = ?",
+                    (source.mtime_ns, source.size, key),
+                )
+            else:
+                changed.append(key)
+                sources[key] = (source.mtime_ns, source.size, source.content_hash)
+                continue
+            if on_file_done:
+                on_file_done(file_path)
+
+        for key in removed + changed:
+            self._conn.execute("DELETE FROM paragraphs WHERE path = ?", (key,))
+            self._conn.execute("DELETE FROM files WHERE path = ?", (key,))
+
+        paragraphs = extract_paragraphs_from_files(
+            [requested[key] for key in changed],
+            min_words=min_words,
+            jobs=jobs,
+            cache=cache,
+            on_file_done=on_file_done,
+        )
+        keys = {str(requested[key]): key for key in changed}
+        chapters = {key: chapter_of(requested[key]) for key in changed}
+        self._conn.executemany(
+            "INSERT INTO paragraphs"
+            " (path, chapter, section, line_start, line_end, word_count, text, cleaned_text)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    keys[p.source_path],
+                    chapters[keys[p.source_path]],
+                    p.section,
+                    p.line_start,
+                    p.line_end,
+                    p.word_count,
+                    p.text,
+                    p.cleaned_text,
+                )
+                for p in paragraphs
+            ),
+        )
+        self._conn.executemany(
+            "INSERT INTO files VALUES (?, ?, ?, ?, ?, 0)",
+            ((key, chapters[key], *sources[key]) for key in changed),
+        )
+        # Reading order of the requested set, for ranking ties
+        self._conn.executemany(
+            "UPDATE files SET position = ? WHERE path = ?",
+            ((position, key) for position, key in enumerate(requested)),
+        )
+        self._conn.commit()
+
+        self.stats = IndexStats(
+            updated=len(changed),
+            removed=len(removed),
+            unchanged=len(requested) - len(changed),
+            paragraphs=len(self),
+            seconds=time.perf_counter() - start,
+        )
+        return [requested[key] for key in changed]
+
+    def _match(self, sql: str, params: Dict) -> List[tuple]:
+        """Run an FTS5 query, retrying as plain words on a syntax error."""
+        try:
+            return self._conn.execute(sql, params).fetchall()
+        except sqlite3.OperationalError as e:
+            plain = _plain_query(params["query"])
+            if not plain or plain == params["query"]:
+                raise ValueError(f"Invalid search query: {e}") from None
+            return self._conn.execute(sql, {**params, "query": plain}).fetchall()
+
+    @profiled("search")
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        chapter: Optional[str] = None,
+        snippet_words: int = 24,
+    ) -> List[SearchHit]:
+        """
+        Paragraphs matching an FTS5 query, best first.
+
+        Args:
+            query: FTS5 query (plain words if it is not valid FTS5 syntax).
+            limit: Maximum number of matches.
+            chapter: Only search chapters whose directory name contains this.
+            snippet_words: Approximate length of each snippet in words.
+
+        Returns:
+            Matches ranked by BM25, ties in reading order.
+
+        Raises:
+            ValueError: If the query cannot be searched.
+        """
+        rows = self._match(
+            "SELECT p.path, p.chapter, p.section, p.line_start, p.line_end, p.word_count,"
+            " bm25(paragraphs_fts),"
+            f" snippet(paragraphs_fts, 0, '{_MARK_START}', '{_MARK_END}', '…', :words)"
+            " FROM paragraphs_fts"
+            " JOIN paragraphs p ON p.id = paragraphs_fts.rowid"
+            " JOIN files f ON f.path = p.path"
+            " WHERE paragraphs_fts MATCH :query AND p.chapter LIKE :chapter"
+            " ORDER BY bm25(paragraphs_fts), f.position, p.line_start"
+            " LIMIT :limit",
+            {"query": query, "words": snippet_words, "chapter": f"%{chapter or ''}%", "limit": limit},
+        )
+        return [
+            SearchHit(
+                location=f"{_display_path(path)}:{line_start}",
+                chapter=chapter_name,
+                section=section,
+                line_start=line_start,
+                line_end=line_end,
+                word_count=word_count,
+                score=score,
+                snippet=snippet,
+            )
+            for path, chapter_name, section, line_start, line_end, word_count, score, snippet
+            in rows
+        ]
+
+    @profiled("search")
+    def sections(self, query: str, chapter: Optional[str] = None) -> List[Dict]:
+        """
+        Per-section match counts for an FTS5 query.
+
+        Returns:
+            One dict per (chapter, section) with matching paragraphs: hits,
+            the location of the first match in reading order and the best
+            BM25 score; most hits first.
+        """
+        rows = self._match(
+            "SELECT p.chapter, p.section, p.path, p.line_start, bm25(paragraphs_fts)"
+            " FROM paragraphs_fts"
+            " JOIN paragraphs p ON p.id = paragraphs_fts.rowid"
+            " JOIN files f ON f.path = p.path"
+            " WHERE paragraphs_fts MATCH :query AND p.chapter LIKE :chapter"
+            " ORDER BY f.position, p.line_start",
+            {"query": query, "chapter": f"%{chapter or ''}%"},
+        )
+        groups: Dict[tuple, Dict] = {}
+        for chapter_name, section, path, line_start, score in rows:
+            group = groups.get((chapter_name, section))
+            if group is None:
+                groups[(chapter_name, section)] = {
+                    "chapter": chapter_name,
+                    "section": section,
+                    "hits": 1,
+                    "location": f"{_display_path(path)}:{line_start}",
+                    "score": score,
+                }
+            else:
+                group["hits"] += 1
+                group["score"] = min(group["score"], score)
+        # Stable sort keeps reading order among equal counts and scores
+        results = sorted(groups.values(), key=lambda g: (-g["hits"], g["score"]))
+        for group in results:
+            group["score"] = round(group["score"], 4)
+        return results
+
+
+# =============================================================================
+# Output Formatters
+# =============================================================================
+
+@profiled("render")
+def output_table(hits: List[SearchHit], query: str):
+    """Output search matches as a rich table."""
+    table = Table(title=f"Matches for {escape(query)}")
+    table.add_column("Location", style="cyan", overflow="fold")
+    table.add_column("Section", style="dim")
+    table.add_column("Words", justify="right")
+    table.add_column("Snippet", ratio=2)
+
+    for hit in hits:
+        snippet = _mark(escape(hit.snippet), "[bold yellow]", "[/bold yellow]")
+        table.add_row(hit.location, escape(hit.section), str(hit.word_count), snippet)
+
+    console.print(table)
+
+
+@profiled("render")
+def output_sections_table(sections: List[Dict], query: str):
+    """Output per-section match counts as a rich table."""
+    table = Table(title=f"Sections matching {escape(query)}")
+    table.add_column("Chapter", style="dim")
+    table.add_column("Section")
+    table.add_column("Hits", style="magenta", justify="right")
+    table.add_column("First match", style="cyan", overflow="fold")
+
+    for group in sections:
+        table.add_row(
+            escape(group["chapter"]),
+            escape(group["section"]) or "[dim](before first section)[/dim]",
+            str(group["hits"]),
+            group["location"],
+        )
+
+    console.print(table)
+
+
+# =============================================================================
+# Commands
+# =============================================================================
+
+@app.command()
+def build(
+    ctx: typer.Context,
+    paths: List[Path] = typer.Argument(
+        ...,
+        help="LaTeX files or directories to index",
+        exists=True,
+    ),
+    db: Path = typer.Option(
+        DEFAULT_DB,
+        "--db",
+        help="SQLite database file",
+        dir_okay=False,
+    ),
+    min_words: int = typer.Option(
+        1,
+        "--min-words", "-m",
+        help="Minimum words for a paragraph to be indexed",
+        min=1,
+    ),
+    recursive: bool = typer.Option(
+        True,
+        "--recursive/--no-recursive", "-r/-R",
+        help="Search directories recursively",
+    ),
+    sections_only: bool = typer.Option(
+        False,
+        "--sections-only", "-s",
+        help="Only look in sections/ subdirectory",
+    ),
+    follow_includes: bool = typer.Option(
+        False,
+        "--follow-includes", "-I",
+        help="Follow \\subfile/\\input/\\include from .tex files (or a directory's main.tex), in reading order",
+    ),
+    jobs: int = typer.Option(
+        0,
+        "--jobs", "-j",
+        help="Parallel worker processes (0 = one per CPU core)",
+        min=0,
+    ),
+    rebuild: bool = typer.Option(
+        False,
+        "--rebuild",
+        help="Discard the index and re-index every file",
+    ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Parse changed files without using the on-disk parse cache",
+    ),
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help="Print per-stage wall/CPU time and counts to stderr (parses in one process)",
+    ),
+    profile_out: Optional[Path] = typer.Option(
+        None,
+        "--profile-out",
+        help="Also write a Chrome trace (.json) or cProfile stats (other names); implies --profile",
+        dir_okay=False,
+    ),
+):
+    """
+    Index the prose paragraphs of LaTeX documents for full-text search.
+
+    Only new or changed files are re-parsed; files not given this time are
+    dropped from the index.
+
+    Examples:
+
+        # Index the book
+        tex-index build chapters/ minibooks/
+
+        # Index in reading order, following main.tex's includes
+        tex-index build main.tex -I
+    """
+    # Profile in this process: stages inside worker processes are not seen
+    if profile or profile_out:
+        start_profiling(profile_out)
+        ctx.call_on_close(finish_profiling)
+        jobs = 1
+
+    # Collect files
+    all_files = collect_files(
+        paths, sections_only=sections_only, recursive=recursive,
+        follow_includes=follow_includes,
+    )
+
+    if not all_files:
+        print("Error: No .tex files found", file=sys.stderr)
+        raise typer.Exit(1)
+    profile_count(files=len(all_files))
+
+    cache = None if no_cache else ParseCache.open()
+    try:
+        index = CorpusIndex(db, rebuild=rebuild)
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        raise typer.Exit(1)
+
+    # Spinner only for interactive runs
+    status = err_console.status("Indexing paragraphs...") if sys.stderr.isatty() else nullcontext()
+    with index, status:
+        index.update(all_files, min_words=min_words, jobs=jobs, cache=cache)
+
+    if cache:
+        cache.close()
+        print(f"Parse cache: {cache.stats.summary()}", file=sys.stderr)
+    profile_count(paragraphs=index.stats.paragraphs)
+    print(f"Corpus index: {index.stats.summary()} ({db})", file=sys.stderr)
+
+
+@app.command()
+def search(
+    query: str = typer.Argument(
+        ...,
+        help="FTS5 query: words, \"phrases\", OR, NOT, NEAR(a b, 5), prefix*",
+    ),
+    db: Path = typer.Option(
+        DEFAULT_DB,
+        "--db",
+        help="SQLite database file (see the build command)",
+        dir_okay=False,
+    ),
+    format: str = typer.Option(
+        "table",
+        "--format", "-f",
+        help="Output format: table, json, jsonl",
+    ),
+    limit: int = typer.Option(
+        20,
+        "--limit", "-n",
+        help="Maximum number of matches",
+        min=1,
+    ),
+    chapter: Optional[str] = typer.Option(
+        None,
+        "--chapter", "-c",
+        help="Only search chapters whose directory name contains this text",
+    ),
+    by_section: bool = typer.Option(
+        False,
+        "--sections",
+        help="Count matching paragraphs per section instead of listing them",
+    ),
+):
+    """
+    Search the indexed paragraphs, best matches first.
+
+    Examples:
+
+        # Where do we say X?
+        tex-index search '"context window"'
+
+        # Which sections mention MCP?
+        tex-index search MCP --sections
+
+        # Prefix search in one chapter
+        tex-index search 'retriev*' --chapter 02
+    """
+    if format not in ("table", "json", "jsonl"):
+        print(f"Error: Unknown format: {format}", file=sys.stderr)
+        raise typer.Exit(1)
+
+    if not db.is_file():
+        print(f"Error: No index at {db}; run: tex_index.py build chapters/ minibooks/",
+              file=sys.stderr)
+        raise typer.Exit(1)
+
+    try:
+        index = CorpusIndex(db)
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        raise typer.Exit(1)
+
+    with index:
+        start = time.perf_counter()
+        try:
+            if by_section:
+                results = index.sections(query, chapter=chapter)
+            else:
+                results = index.search(query, limit=limit, chapter=chapter)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            raise typer.Exit(1)
+        elapsed = time.perf_counter() - start
+        total = len(index)
+
+    noun = "sections" if by_section else "matches"
+    timing = f"{len(results)} {noun} in {elapsed * 1000:.1f} ms ({total:,} paragraphs indexed)"
+
+    if by_section:
+        if format == "table":
+            output_sections_table(results, query)
+        elif format == "json":
+            print(json.dumps({"query": query, "ms": round(elapsed * 1000, 2), "sections": results}, indent=2))
+        else:
+            for group in results:
+                print(json.dumps(group))
+    elif format == "table":
+        output_table(results, query)
+    elif format == "json":
+        print(json.dumps({
+            "query": query,
+            "ms": round(elapsed * 1000, 2),
+            "matches": [hit.to_dict() for hit in results],
+        }, indent=2))
+    else:
+        for hit in results:
+            print(json.dumps(hit.to_dict()))
+
+    log_status(timing, format)
+
+
+if __name__ == "__main__":
+    app()
@@ -15,6 +15,8 @@ Output Formats:
     - json:  Single JSON object with all paragraph data
     - jsonl: One JSON object per paragraph (streaming-friendly)
     - csv:   Comma-separated values
+    - parquet, arrow: Columnar table, one row per paragraph (for
+             dataframes; needs pyarrow)
 
 Usage:
     # Find short paragraphs (< 30 words)
@@ -29,10 +31,25 @@ Usage:
     # Output as JSON for processing
     uv run --with rich,typer scripts/tex_paragraphs.py chapters/07-agents-part-2/ -f json > paragraphs.json
 
+    # Every paragraph as a Parquet table for dataframes
+    uv run --with rich,typer,pyarrow scripts/tex_paragraphs.py chapters/ --no-short -f parquet > paragraphs.parquet
+
+    # Parsed paragraphs are cached in .tex_cache/; bypass or rebuild the cache
+    uv run --with rich,typer scripts/tex_paragraphs.py chapters/ --no-cache
+    uv run --with rich,typer scripts/tex_paragraphs.py chapters/ --rebuild-cache
+
+    # Parse files with 8 worker processes (default: one per CPU core)
+    uv run --with rich,typer scripts/tex_paragraphs.py chapters/ minibooks/ -j 8
+
+    # Stay running and refresh the report as files are saved
+    uv run --with rich,typer scripts/tex_paragraphs.py chapters/07-agents-part-2/ --watch
+
 Dependencies:
     pip install rich typer
     — or —
     uv run --with rich,typer scripts/tex_paragraphs.py ...
+
+    Optional: pyarrow (-f parquet / -f arrow).
 """
 
 from __future__ import annotations
@@ -40,10 +57,12 @@ from __future__ import annotations
 import csv
 import json
 import sys
+import time
 from collections import Counter
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 # =============================================================================
 # Dynamic Import Handling
@@ -80,33 +99,62 @@ typer_module = _import_with_hint("typer")
 typer = typer_module
 rich_module = _import_with_hint("rich")
 
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich import print as rprint
-
 # Import local utilities
 try:
     from tex_utils import (
+        Lazy,
         Paragraph,
+        ParseCache,
+        ColumnarWriter,
+        COLUMNAR_FORMATS,
+        PARAGRAPH_COLUMNS,
+        paragraph_row,
+        extract_paragraphs_from_files,
         extract_paragraphs_from_tex,
-        find_tex_files,
-        find_section_files,
-        tokenize_regex,
+        iter_paragraphs,
+        watch_files,
+        collect_files,
+        log_status,
+        lazy_import,
+        finish_profiling,
+        profile_count,
+        profiled,
+        start_profiling,
     )
 except ImportError:
     script_dir = Path(__file__).parent
     sys.path.insert(0, str(script_dir))
     from tex_utils import (
+        Lazy,
         Paragraph,
+        ParseCache,
+        ColumnarWriter,
+        COLUMNAR_FORMATS,
+        PARAGRAPH_COLUMNS,
+        paragraph_row,
+        extract_paragraphs_from_files,
         extract_paragraphs_from_tex,
-        find_tex_files,
-        find_section_files,
-        tokenize_regex,
+        iter_paragraphs,
+        watch_files,
+        collect_files,
+        log_status,
+        lazy_import,
+        finish_profiling,
+        profile_count,
+        profiled,
+        start_profiling,
     )
 
 
+# rich is only imported once table output (or a progress spinner) needs it
+Console = lazy_import("rich.console", "Console")
+Table = lazy_import("rich.table", "Table")
+Panel = lazy_import("rich.panel", "Panel")
+Progress = lazy_import("rich.progress", "Progress")
+SpinnerColumn = lazy_import("rich.progress", "SpinnerColumn")
+TextColumn = lazy_import("rich.progress", "TextColumn")
+
+
 # =============================================================================
 # CLI Application
 # =============================================================================
@@ -118,7 +166,7 @@ app = typer.Typer(
     rich_markup_mode="rich",
 )
 
-console = Console()
+console = Lazy(Console)
 
 
 # =============================================================================
@@ -138,6 +186,7 @@ class ParagraphAnalysis:
 # Analysis Functions
 # =============================================================================
 
+@profiled("analyze")
 def analyze_paragraphs(
     paragraphs: List[Paragraph],
     short_threshold: int = 30,
@@ -163,14 +212,10 @@ def analyze_paragraphs(
         context_after = None
 
         if i > 0:
-            prev = paragraphs[i - 1]
-            words = tokenize_regex(prev.cleaned_text)[:15]
-            context_before = " ".join(words) + ("..." if len(words) == 15 else "")
+            context_before = paragraphs[i - 1].tokens.preview(15)
 
         if i < len(paragraphs) - 1:
-            next_p = paragraphs[i + 1]
-            words = tokenize_regex(next_p.cleaned_text)[:15]
-            context_after = " ".join(words) + ("..." if len(words) == 15 else "")
+            context_after = paragraphs[i + 1].tokens.preview(15)
 
         if para.word_count < short_threshold and para.word_count >= min_words:
             short_paragraphs.append(ParagraphAnalysis(
@@ -251,6 +296,7 @@ def compute_histogram(word_counts: List[int], bin_size: int = 10) -> Dict[int, i
 # Output Formatters
 # =============================================================================
 
+@profiled("render")
 def output_table(
     analysis: Dict,
     mode: str,  # "short", "long", or "all"
@@ -393,8 +439,14 @@ def _output_file_summary(by_file: Dict[str, Dict]):
     console.print(table)
 
 
+@profiled("render")
 def output_json(analysis: Dict, mode: str):
     """Output as JSON."""
+    print(json.dumps(json_report(analysis, mode), indent=2))
+
+
+def json_report(analysis: Dict, mode: str) -> Dict:
+    """Build the JSON report (summary, stats, paragraphs, by_file)."""
     paragraphs_to_include = []
 
     if mode == "short":
@@ -438,30 +490,86 @@ def output_json(analysis: Dict, mode: str):
             for k, v in analysis["by_file"].items()
         },
     }
-    print(json.dumps(data, indent=2))
+    return data
 
 
-def output_jsonl(analysis: Dict, mode: str):
-    """Output as JSON Lines."""
-    if mode == "short":
-        for a in analysis["short"]:
-            data = a.paragraph.to_dict()
-            data["issue"] = a.issue
-            data["location"] = f"{a.paragraph.source_path}:{a.paragraph.line_start}"
-            print(json.dumps(data))
-    elif mode == "long":
-        for a in analysis["long"]:
-            data = a.paragraph.to_dict()
-            data["issue"] = a.issue
-            data["location"] = f"{a.paragraph.source_path}:{a.paragraph.line_start}"
-            print(json.dumps(data))
-    else:
-        for p in analysis["all_paragraphs"]:
+@profiled("render")
+def output_jsonl(
+    paragraphs: Iterable[Paragraph],
+    mode: str,
+    short_threshold: int = 30,
+    long_threshold: int = 150,
+    min_words: int = 5,
+) -> int:
+    """
+    Output as JSON Lines, streaming.
+
+    Classifies each paragraph as it arrives, so the records are written while
+    later files are still being parsed (JSONL carries no context or stats).
+
+    Returns:
+        Number of paragraphs extracted (written or not).
+    """
+    seen = 0
+    for p in paragraphs:
+        seen += 1
+        data = None
+
+        if mode == "all":
             data = p.to_dict()
+        elif mode == "short" and min_words <= p.word_count < short_threshold:
+            data = p.to_dict()
+            data["issue"] = "short"
+        elif mode == "long" and p.word_count > long_threshold:
+            data = p.to_dict()
+            data["issue"] = "long"
+
+        if data is not None:
             data["location"] = f"{p.source_path}:{p.line_start}"
             print(json.dumps(data))
 
+    return seen
+
+
+@profiled("render")
+def output_columnar(
+    paragraphs: Iterable[Paragraph],
+    format: str,
+    mode: str,
+    short_threshold: int = 30,
+    long_threshold: int = 150,
+    min_words: int = 5,
+) -> int:
+    """
+    Output as a Parquet or Arrow IPC file on stdout, streaming.
+
+    Paragraphs are classified as they arrive, as for JSONL, and written in
+    record batches: PARAGRAPH_COLUMNS plus the issue ("short", "long" or
+    empty in "all" mode).
+
+    Returns:
+        Number of paragraphs extracted (written or not).
+    """
+    sys.stdout.flush()
+    seen = 0
+    with ColumnarWriter(
+        sys.stdout.buffer, format, [*PARAGRAPH_COLUMNS, ("issue", "category")]
+    ) as out:
+        for p in paragraphs:
+            seen += 1
+            if mode == "all":
+                issue = ""
+            elif mode == "short" and min_words <= p.word_count < short_threshold:
+                issue = "short"
+            elif mode == "long" and p.word_count > long_threshold:
+                issue = "long"
+            else:
+                continue
+            out.write_row((*paragraph_row(p), issue))
+    return seen
+
 
+@profiled("render")
 def output_csv(analysis: Dict, mode: str):
     """Output as CSV."""
     writer = csv.writer(sys.stdout)
@@ -487,12 +595,116 @@ def output_csv(analysis: Dict, mode: str):
         ])
 
 
+def render_report(
+    paragraphs: List[Paragraph],
+    format: str,
+    mode: str,
+    max_words: int = 30,
+    long_threshold: int = 150,
+    min_words: int = 5,
+    show_context: bool = False,
+    show_histogram: bool = True,
+):
+    """Analyze paragraphs and write the report in the requested format."""
+    if format == "jsonl":
+        output_jsonl(
+            paragraphs,
+            mode=mode,
+            short_threshold=max_words,
+            long_threshold=long_threshold,
+            min_words=min_words,
+        )
+        return
+
+    analysis = analyze_paragraphs(
+        paragraphs,
+        short_threshold=max_words,
+        long_threshold=long_threshold,
+        min_words=min_words,
+    )
+
+    if format == "table":
+        output_table(
+            analysis,
+            mode=mode,
+            show_context=show_context,
+            show_histogram=show_histogram,
+        )
+    elif format == "json":
+        output_json(analysis, mode=mode)
+    elif format == "csv":
+        output_csv(analysis, mode=mode)
+
+
+# =============================================================================
+# Watch Mode
+# =============================================================================
+
+def watch_paragraphs(
+    collect: Callable[[], List[Path]],
+    per_file: Dict[Path, List[Paragraph]],
+    render: Callable[[List[Paragraph]], None],
+    format: str,
+    min_words: int = 5,
+    interval: float = 0.5,
+):
+    """
+    Re-render the report whenever a watched file changes.
+
+    Only touched files are re-extracted; every other file's paragraphs are
+    kept in memory from the previous pass. Runs until interrupted.
+
+    Args:
+        collect: Returns the current list of files to analyze.
+        per_file: Already-extracted paragraphs per file.
+        render: Writes the report for a list of paragraphs.
+        format: Output format (table output is redrawn in place).
+        min_words: Minimum word count to include a paragraph.
+        interval: Seconds between polls for changes.
+    """
+    files = list(per_file)
+
+    def redraw():
+        if format == "table":
+            console.clear()
+        paragraphs = [p for f in files for p in per_file[f]]
+        if paragraphs:
+            render(paragraphs)
+        else:
+            log_status("Warning: No paragraphs extracted", format)
+
+    redraw()
+    log_status(f"Watching {len(files)} files (Ctrl+C to stop)", format)
+
+    try:
+        for changes in watch_files(collect, interval=interval):
+            start = time.perf_counter()
+            for file_path in changes.removed:
+                per_file.pop(file_path, None)
+            for file_path in changes.changed:
+                per_file[file_path] = extract_paragraphs_from_tex(file_path, min_words=min_words)
+            files = changes.files
+            parsed = time.perf_counter()
+
+            redraw()
+            done = time.perf_counter()
+            names = ", ".join(f.name for f in changes.changed + changes.removed)
+            log_status(
+                f"Updated {names}: parse {(parsed - start) * 1000:.0f} ms, "
+                f"report {(done - parsed) * 1000:.0f} ms",
+                format,
+            )
+    except KeyboardInterrupt:
+        pass
+
+
 # =============================================================================
 # Main Command
 # =============================================================================
 
 @app.command()
 def main(
+    ctx: typer.Context,
     paths: List[Path] = typer.Argument(
         ...,
         help="LaTeX files or directories to analyze",
@@ -501,7 +713,7 @@ def main(
     format: str = typer.Option(
         "table",
         "--format", "-f",
-        help="Output format: table, json, jsonl, csv",
+        help="Output format: table, json, jsonl, csv, parquet, arrow",
     ),
     max_words: int = typer.Option(
         30,
@@ -551,6 +763,49 @@ def main(
         "--sections-only", "-s",
         help="Only look in sections/ subdirectory",
     ),
+    follow_includes: bool = typer.Option(
+        False,
+        "--follow-includes", "-I",
+        help="Follow \\subfile/\\input/\\include from .tex files (or a directory's main.tex), in reading order",
+    ),
+    jobs: int = typer.Option(
+        0,
+        "--jobs", "-j",
+        help="Parallel worker processes (0 = one per CPU core)",
+        min=0,
+    ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Parse every file without using the on-disk parse cache",
+    ),
+    rebuild_cache: bool = typer.Option(
+        False,
+        "--rebuild-cache",
+        help="Discard the parse cache and re-parse every file",
+    ),
+    watch: bool = typer.Option(
+        False,
+        "--watch", "-w",
+        help="Stay running and re-render the report when files change",
+    ),
+    interval: float = typer.Option(
+        0.5,
+        "--interval",
+        help="Seconds between checks for changed files (with --watch)",
+        min=0.05,
+    ),
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help="Print per-stage wall/CPU time and counts to stderr (parses in one process)",
+    ),
+    profile_out: Optional[Path] = typer.Option(
+        None,
+        "--profile-out",
+        help="Also write a Chrome trace (.json) or cProfile stats (other names); implies --profile",
+        dir_okay=False,
+    ),
 ):
     """
     Analyze paragraph structure in LaTeX documents.
@@ -574,7 +829,16 @@ def main(
 
         # Output all paragraphs as JSON
         tex-paragraphs chapters/07-agents-part-2/ --no-short -f json > paras.json
+
+        # Keep the report up to date while editing
+        tex-paragraphs chapters/07-agents-part-2/ --watch
     """
+    # Profile in this process: stages inside worker processes are not seen
+    if profile or profile_out:
+        start_profiling(profile_out)
+        ctx.call_on_close(finish_profiling)
+        jobs = 1
+
     # Determine mode
     if long and not short:
         mode = "long"
@@ -584,23 +848,72 @@ def main(
         mode = "all"
 
     # Collect files
-    all_files: List[Path] = []
-
-    for path in paths:
-        if path.is_file():
-            all_files.append(path)
-        elif path.is_dir():
-            if sections_only:
-                all_files.extend(find_section_files(path))
-            else:
-                all_files.extend(find_tex_files(path, recursive=recursive))
+    collect = partial(
+        collect_files, paths, sections_only=sections_only, recursive=recursive,
+        follow_includes=follow_includes,
+    )
+    all_files = collect()
 
     if not all_files:
         console.print("[red]Error:[/red] No .tex files found", file=sys.stderr)
         raise typer.Exit(1)
+    profile_count(files=len(all_files))
+
+    if format not in ("table", "json", "jsonl", "csv", *COLUMNAR_FORMATS):
+        console.print(f"[red]Error:[/red] Unknown format: {format}", file=sys.stderr)
+        raise typer.Exit(1)
+    if format in COLUMNAR_FORMATS:
+        _import_with_hint("pyarrow")
+        if watch:
+            print(f"Error: --watch needs a text format, not {format}", file=sys.stderr)
+            raise typer.Exit(1)
+        if sys.stdout.isatty():
+            print(f"Error: {format} output is binary; redirect it to a file", file=sys.stderr)
+            raise typer.Exit(1)
+
+    # Extract paragraphs (through the parse cache unless disabled)
+    cache = None if no_cache else ParseCache.open(rebuild=rebuild_cache)
+
+    render = partial(
+        render_report,
+        format=format,
+        mode=mode,
+        max_words=max_words,
+        long_threshold=long_threshold,
+        min_words=min_words,
+        show_context=show_context,
+        show_histogram=not no_histogram,
+    )
 
-    # Extract paragraphs
-    all_paragraphs: List[Paragraph] = []
+    if watch:
+        per_file = {
+            f: cache.extract(f, min_words=min_words) if cache
+            else extract_paragraphs_from_tex(f, min_words=min_words)
+            for f in all_files
+        }
+        if cache:
+            cache.close()
+        watch_paragraphs(collect, per_file, render, format, min_words, interval)
+        return
+
+    # JSONL and columnar output stream: each paragraph is written as soon
+    # as it is parsed
+    if format in ("jsonl", *COLUMNAR_FORMATS):
+        paragraphs = iter_paragraphs(all_files, min_words=min_words, cache=cache)
+        thresholds = dict(
+            short_threshold=max_words, long_threshold=long_threshold, min_words=min_words
+        )
+        if format == "jsonl":
+            extracted = output_jsonl(paragraphs, mode=mode, **thresholds)
+        else:
+            extracted = output_columnar(paragraphs, format, mode=mode, **thresholds)
+        if cache:
+            cache.close()
+            log_status(f"Parse cache: {cache.stats.summary()}", format)
+        profile_count(paragraphs=extracted)
+        if not extracted:
+            print("Warning: No paragraphs extracted", file=sys.stderr)
+        return
 
     if format == "table":
         with Progress(
@@ -609,45 +922,28 @@ def main(
             console=console,
         ) as progress:
             task = progress.add_task("Extracting paragraphs...", total=len(all_files))
-
-            for file_path in all_files:
-                paras = extract_paragraphs_from_tex(file_path, min_words=min_words)
-                all_paragraphs.extend(paras)
-                progress.advance(task)
+            all_paragraphs = extract_paragraphs_from_files(
+                all_files,
+                min_words=min_words,
+                jobs=jobs,
+                cache=cache,
+                on_file_done=lambda _: progress.advance(task),
+            )
     else:
-        for file_path in all_files:
-            paras = extract_paragraphs_from_tex(file_path, min_words=min_words)
-            all_paragraphs.extend(paras)
+        all_paragraphs = extract_paragraphs_from_files(
+            all_files, min_words=min_words, jobs=jobs, cache=cache
+        )
 
+    if cache:
+        cache.close()
+        log_status(f"Parse cache: {cache.stats.summary()}", format)
+
+    profile_count(paragraphs=len(all_paragraphs))
     if not all_paragraphs:
         console.print("[yellow]Warning:[/yellow] No paragraphs extracted", file=sys.stderr)
         raise typer.Exit(0)
 
-    # Analyze
-    analysis = analyze_paragraphs(
-        all_paragraphs,
-        short_threshold=max_words,
-        long_threshold=long_threshold,
-        min_words=min_words,
-    )
-
-    # Output
-    if format == "table":
-        output_table(
-            analysis,
-            mode=mode,
-            show_context=show_context,
-            show_histogram=not no_histogram,
-        )
-    elif format == "json":
-        output_json(analysis, mode=mode)
-    elif format == "jsonl":
-        output_jsonl(analysis, mode=mode)
-    elif format == "csv":
-        output_csv(analysis, mode=mode)
-    else:
-        console.print(f"[red]Error:[/red] Unknown format: {format}", file=sys.stderr)
-        raise typer.Exit(1)
+    render(all_paragraphs)
 
 
 if __name__ == "__main__":
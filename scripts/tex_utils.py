@@ -7,11 +7,25 @@ LaTeX documents. It's designed for textbook authoring workflows where you need
 to analyze prose quality, repetition, and structure.
 
 Features:
-    - LaTeX-aware paragraph extraction (skips figures, tables, boxes)
+    - LaTeX-aware paragraph extraction (single-pass lexer; skips figures, tables, boxes)
     - Configurable environment exclusion
-    - Clean text extraction preserving semantic content
-    - Tokenization (simple and regex-based)
+    - Clean text extraction preserving semantic content (precompiled LatexCleaner)
+    - Memory-mapped source files shared across analyses, with line indexes
+    - Persistent parse cache (SQLite, keyed by content hash)
+    - Parallel multi-process extraction with deterministic ordering
+    - Streaming paragraph extraction (iter_paragraphs)
+    - Tokenization (simple and regex-based; token spans computed once per paragraph)
     - N-gram generation
+    - Interned token store (array-backed ids, shared vocabulary)
+    - Positional inverted index over paragraphs for pattern search
+    - One-pass multi-pattern matching (phrase automaton + merged regex)
+    - Sliding-window and token-budgeted chunking
+    - Streaming JSON/JSONL writer (optional orjson encoder)
+    - Columnar Parquet/Arrow export in record batches (needs pyarrow)
+    - Include-graph resolution (\\subfile, \\input, \\include) in reading order
+    - Polling file watcher for --watch modes
+    - Lazy imports for optional and display-only dependencies
+    - Per-stage profiling (wall/CPU time, counters, Chrome trace, cProfile)
 
 Usage:
     This module is imported by the tex-* CLI tools. You generally don't run it directly.
@@ -21,27 +35,414 @@ Usage:
     >>> clean_text = clean_latex_text(raw_latex)
 
 Dependencies:
-    None (stdlib only) — this module has no external dependencies.
+    None (stdlib only). NumPy is used when installed to vectorize n-gram
+    counting; results are identical without it. Parquet/Arrow output needs
+    pyarrow.
 """
 
 from __future__ import annotations
 
+import hashlib
+import importlib
+import json
+import math
+import mmap
 import os
 import re
-from dataclasses import dataclass, field, asdict
+import sqlite3
+import sys
+import time
+from array import array
+from bisect import bisect_right
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache, partial, reduce, wraps
+from itertools import islice
 from pathlib import Path
-from typing import Iterator, List, Optional, Tuple
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+# =============================================================================
+# Lazy Imports
+# =============================================================================
+
+@lru_cache(maxsize=None)
+def optional_import(module_name: str):
+    """
+    Import an optional dependency on first use.
+
+    Returns:
+        The module, or None when it is not installed. The result is cached,
+        so repeated checks cost a dictionary lookup.
+
+    Example:
+        >>> np = optional_import("numpy")
+        >>> if np is not None:
+        ...     counts = np.bincount(ids)
+    """
+    try:
+        return importlib.import_module(module_name)
+    except ImportError:
+        return None
+
+
+class Lazy:
+    """
+    Stand-in for an object that is only created when it is first used.
+
+    Attribute access and calls are forwarded to the object, which is built
+    by ``factory`` the first time either happens. The tex-* CLIs use this
+    for rich: JSON, JSONL and CSV runs never render a table, so they never
+    pay for importing ``rich.console`` and friends.
+
+    Example:
+        >>> Table = lazy_import("rich.table", "Table")
+        >>> console = Lazy(lazy_import("rich.console", "Console"))
+        >>> console.print(Table(title="Only now is rich imported"))
+    """
+
+    __slots__ = ("_factory", "_value")
+
+    def __init__(self, factory: Callable[[], object]):
+        self._factory = factory
+        self._value = None
+
+    def _resolve(self):
+        """Build the object on first use and return it."""
+        if self._value is None:
+            self._value = self._factory()
+        return self._value
+
+    def __getattr__(self, name: str):
+        return getattr(self._resolve(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    # Special methods are looked up on the type, so forward the ones rich
+    # uses on a console (``with console:`` inside live displays)
+    def __enter__(self):
+        return self._resolve().__enter__()
+
+    def __exit__(self, *exc_info):
+        return self._resolve().__exit__(*exc_info)
+
+
+def lazy_import(module_name: str, attr: Optional[str] = None) -> Lazy:
+    """
+    Import a module, or one of its attributes, on first use.
+
+    Args:
+        module_name: Dotted module name, e.g. ``"rich.table"``.
+        attr: Optional attribute of the module to stand in for.
+
+    Returns:
+        A :class:`Lazy` proxy for the module or attribute.
+    """
+    def load():
+        module = importlib.import_module(module_name)
+        return getattr(module, attr) if attr else module
+    return Lazy(load)
 
 
 # =============================================================================
-# Data Classes
+# Profiling
 # =============================================================================
 
 @dataclass
+class StageStats:
+    """Accumulated timing for one stage (at one position in the stage tree)."""
+    name: str
+    depth: int
+    calls: int = 0
+    wall: float = 0.0        # seconds, including nested stages
+    cpu: float = 0.0         # process CPU seconds, including nested stages
+    child_wall: float = 0.0  # wall seconds spent in nested stages
+
+    @property
+    def self_wall(self) -> float:
+        """Wall seconds not attributed to a nested stage."""
+        return self.wall - self.child_wall
+
+
+class _StageTimer:
+    """Context manager timing one entry into a stage."""
+
+    __slots__ = ("profiler", "name", "counts", "stats", "wall", "cpu")
+
+    def __init__(self, profiler: "Profiler", name: str, counts: Dict[str, int]):
+        self.profiler = profiler
+        self.name = name
+        self.counts = counts
+
+    def __enter__(self) -> "_StageTimer":
+        self.stats = self.profiler._enter(self.name)
+        self.cpu = time.process_time()
+        self.wall = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        wall = time.perf_counter() - self.wall
+        cpu = time.process_time() - self.cpu
+        self.profiler._exit(self.stats, wall, cpu, self.wall, self.counts)
+
+
+class _NullStage:
+    """Stage context manager used while profiling is off."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullStage":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+
+_NULL_STAGE = _NullStage()
+
+
+class Profiler:
+    """
+    Per-stage wall/CPU timing and counters for the tex-* ``--profile`` flag.
+
+    Stages nest: a stage entered while another is open is recorded under
+    it, so the report can show both total and self time (e.g. "parse"
+    excluding the "clean" and "tokenize" calls it makes). Counters such as
+    files, bytes and paragraphs are summed across the run.
+
+    Optionally records every stage entry as a Chrome trace event
+    (chrome://tracing, Perfetto) or runs cProfile alongside.
+
+    Example:
+        >>> profiler = start_profiling()
+        >>> with profile_stage("render"):
+        ...     output_table(results)
+        >>> print(finish_profiling().report())
+    """
+
+    def __init__(self, trace: bool = False, cprofile: bool = False):
+        self.stages: Dict[Tuple[str, ...], StageStats] = {}
+        self.counts: Counter = Counter()
+        self.events: Optional[List[dict]] = [] if trace else None
+        self.output: Optional[Path] = None
+        self._stack: List[Tuple[str, ...]] = []
+        self._cprofile = None
+        if cprofile:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        self._start_cpu = time.process_time()
+        self._start_wall = time.perf_counter()
+        self.wall = 0.0
+        self.cpu = 0.0
+
+    def stage(self, name: str, **counts: int) -> _StageTimer:
+        """Time a stage; ``counts`` are added to the run's counters on exit."""
+        return _StageTimer(self, name, counts)
+
+    def count(self, **counts: int) -> None:
+        """Add to the run's counters."""
+        self.counts.update(counts)
+
+    def _enter(self, name: str) -> StageStats:
+        """Open a stage entry under the innermost open stage."""
+        stack = self._stack
+        key = (stack[-1] if stack else ()) + (name,)
+        stack.append(key)
+        stats = self.stages.get(key)
+        if stats is None:
+            stats = self.stages[key] = StageStats(name, len(key) - 1)
+        return stats
+
+    def _exit(
+        self,
+        stats: StageStats,
+        wall: float,
+        cpu: float,
+        started: float,
+        counts: Dict[str, int],
+    ) -> None:
+        """Close a stage entry: accumulate it and credit its parent."""
+        key = self._stack.pop()
+        stats.calls += 1
+        stats.wall += wall
+        stats.cpu += cpu
+        if len(key) > 1:
+            self.stages[key[:-1]].child_wall += wall
+        if counts:
+            self.counts.update(counts)
+        if self.events is not None:
+            self.events.append({
+                "name": stats.name,
+                "ph": "X",
+                "ts": round((started - self._start_wall) * 1e6, 1),
+                "dur": round(wall * 1e6, 1),
+                "pid": os.getpid(),
+                "tid": 0,
+            })
+
+    def stop(self) -> None:
+        """Stop the run clock (and cProfile)."""
+        self.wall = time.perf_counter() - self._start_wall
+        self.cpu = time.process_time() - self._start_cpu
+        if self._cprofile is not None:
+            self._cprofile.disable()
+
+    def write(self, path: str | Path) -> None:
+        """Write a Chrome trace (``.json``) or a cProfile stats file."""
+        path = Path(path)
+        if path.suffix.lower() == ".json":
+            trace = {
+                "traceEvents": sorted(self.events or [], key=lambda e: e["ts"]),
+                "displayTimeUnit": "ms",
+                "otherData": {"counts": dict(self.counts)},
+            }
+            path.write_text(json.dumps(trace), encoding="utf-8")
+        elif self._cprofile is not None:
+            self._cprofile.dump_stats(str(path))
+
+    def report(self) -> str:
+        """Format the stage table and counters as plain text."""
+        total = self.wall or sum(s.wall for s in self.stages.values() if s.depth == 0)
+        lines = [
+            f"Profile: {total * 1000:,.1f} ms wall, {self.cpu * 1000:,.1f} ms CPU",
+            f"  {'stage':<24} {'calls':>8} {'wall ms':>10} {'self ms':>10}"
+            f" {'CPU ms':>10} {'share':>7}",
+        ]
+        # Depth-first, each level in the order stages were first entered
+        children: Dict[Tuple[str, ...], List[Tuple[str, ...]]] = {}
+        for key in self.stages:
+            children.setdefault(key[:-1], []).append(key)
+        order: List[Tuple[str, ...]] = []
+        pending = list(reversed(children.get((), [])))
+        while pending:
+            key = pending.pop()
+            order.append(key)
+            pending.extend(reversed(children.get(key, [])))
+
+        for key in order:
+            s = self.stages[key]
+            share = s.wall / total if total else 0.0
+            lines.append(
+                f"  {'  ' * s.depth + s.name:<24} {s.calls:>8,} {s.wall * 1000:>10,.1f}"
+                f" {s.self_wall * 1000:>10,.1f} {s.cpu * 1000:>10,.1f} {share:>7.1%}"
+            )
+        if self.counts:
+            lines.append("  counts: " + ", ".join(
+                f"{name} {value:,}" for name, value in self.counts.items()
+            ))
+        return "\n".join(lines)
+
+
+_PROFILER: Optional[Profiler] = None
+
+
+def start_profiling(output: Optional[str | Path] = None) -> Profiler:
+    """
+    Start the process-wide profiler used by :func:`profile_stage`.
+
+    Args:
+        output: Optional file for :func:`finish_profiling` to write: a Chrome
+            trace when it ends in ``.json``, otherwise cProfile stats.
+    """
+    global _PROFILER
+    suffix = Path(output).suffix.lower() if output else ""
+    _PROFILER = Profiler(trace=suffix == ".json", cprofile=bool(output) and suffix != ".json")
+    _PROFILER.output = Path(output) if output else None
+    return _PROFILER
+
+
+def finish_profiling(file=None) -> Optional[Profiler]:
+    """
+    Stop the process-wide profiler, write its output file and print the report.
+
+    Args:
+        file: Stream for the report (default: stderr, so data formats on
+            stdout stay clean).
+
+    Returns:
+        The stopped Profiler, or None if profiling was not started.
+    """
+    global _PROFILER
+    profiler, _PROFILER = _PROFILER, None
+    if profiler is None:
+        return None
+    profiler.stop()
+    print(profiler.report(), file=file or sys.stderr)
+    if profiler.output:
+        profiler.write(profiler.output)
+        print(f"  wrote {profiler.output}", file=file or sys.stderr)
+    return profiler
+
+
+def profile_stage(name: str, **counts: int):
+    """
+    Time a block as a profiling stage; a no-op while profiling is off.
+
+    Example:
+        >>> with profile_stage("render"):
+        ...     output_table(results)
+    """
+    if _PROFILER is None:
+        return _NULL_STAGE
+    return _PROFILER.stage(name, **counts)
+
+
+def profile_count(**counts: int) -> None:
+    """Add to the profiler's counters (files, bytes, paragraphs, ...)."""
+    if _PROFILER is not None:
+        _PROFILER.count(**counts)
+
+
+def profiled(name: str):
+    """
+    Decorator: time every call of a function as a profiling stage.
+
+    While profiling is off this costs one global lookup per call.
+    """
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _PROFILER is None:
+                return func(*args, **kwargs)
+            with _PROFILER.stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# =============================================================================
+# Data Classes
+# =============================================================================
+
+@lru_cache(maxsize=None)
+def _display_path(source_path: str) -> str:
+    """Return `source_path` as shown in locations.
+
+    The path relative to the current directory is used when it is shorter and
+    does not climb too far. Cached per path, since every paragraph of a file
+    shares it (the tex-* tools never change directory while running).
+    """
+    try:
+        rel_path = os.path.relpath(source_path)
+        # Use relative path if it's shorter or doesn't go up too many directories
+        if not rel_path.startswith("../../../") and len(rel_path) < len(source_path):
+            return rel_path
+    except ValueError:
+        pass  # On Windows, relpath can fail across drives
+    return source_path
+
+
 class Paragraph:
     """
     A paragraph of prose text extracted from a LaTeX file.
 
+    A slotted record: a book yields tens of thousands of these, so there is no
+    per-instance ``__dict__``. The cleaned text and word count are computed on
+    first access unless passed in (the parser and the parse cache always pass
+    them), and the location string is cached. Treat the source fields as
+    immutable once the paragraph has been created.
+
     Attributes:
         text: The raw LaTeX text of the paragraph.
         cleaned_text: The text with LaTeX commands stripped (computed lazily).
@@ -50,23 +451,76 @@ class Paragraph:
         line_start: Starting line number (1-indexed).
         line_end: Ending line number (1-indexed).
         section: Current section heading when this paragraph appears.
-        word_count: Approximate word count of cleaned text.
-    """
-    text: str
-    source_file: str
-    source_path: str
-    line_start: int
-    line_end: int
-    section: str = ""
-    cleaned_text: str = ""
-    word_count: int = 0
-
-    def __post_init__(self):
-        """Compute derived fields after initialization."""
-        if not self.cleaned_text:
-            self.cleaned_text = clean_latex_text(self.text)
-        if self.word_count == 0:
-            self.word_count = len(tokenize_regex(self.cleaned_text))
+        word_count: Approximate word count of cleaned text (computed lazily).
+    """
+
+    __slots__ = (
+        "text",
+        "source_file",
+        "source_path",
+        "line_start",
+        "line_end",
+        "section",
+        "_cleaned_text",
+        "_word_count",
+        "_tokens",
+        "_location",
+    )
+
+    def __init__(
+        self,
+        text: str,
+        source_file: str,
+        source_path: str,
+        line_start: int,
+        line_end: int,
+        section: str = "",
+        cleaned_text: str = "",
+        word_count: int = 0,
+        tokens: Optional[TokenizedText] = None,
+    ):
+        self.text = text
+        self.source_file = source_file
+        self.source_path = source_path
+        self.line_start = line_start
+        self.line_end = line_end
+        self.section = section
+        # Falsy values mean "not computed yet", as with the former dataclass
+        self._cleaned_text: Optional[str] = cleaned_text or None
+        self._word_count: Optional[int] = word_count or None
+        self._tokens = tokens
+        self._location: Optional[str] = None
+
+    @property
+    def cleaned_text(self) -> str:
+        """The text with LaTeX commands stripped."""
+        if self._cleaned_text is None:
+            self._cleaned_text = clean_latex_text(self.text)
+        return self._cleaned_text
+
+    @cleaned_text.setter
+    def cleaned_text(self, value: str) -> None:
+        self._cleaned_text = value
+        self._tokens = None
+
+    @property
+    def tokens(self) -> TokenizedText:
+        """Word tokens of the cleaned text, tokenized once and shared by every
+        analysis (word counts, context previews, n-grams, snippets)."""
+        if self._tokens is None:
+            self._tokens = TokenizedText(self.cleaned_text)
+        return self._tokens
+
+    @property
+    def word_count(self) -> int:
+        """Approximate word count of the cleaned text."""
+        if self._word_count is None:
+            self._word_count = len(self.tokens)
+        return self._word_count
+
+    @word_count.setter
+    def word_count(self, value: int) -> None:
+        self._word_count = value
 
     @property
     def location(self) -> str:
@@ -74,20 +528,73 @@ class Paragraph:
 
         Uses relative path from current directory when possible for readability.
         """
-        try:
-            rel_path = os.path.relpath(self.source_path)
-            # Use relative path if it's shorter or doesn't go up too many directories
-            if not rel_path.startswith("../../../") and len(rel_path) < len(self.source_path):
-                return f"{rel_path}:{self.line_start}"
-        except ValueError:
-            pass  # On Windows, relpath can fail across drives
-        return f"{self.source_path}:{self.line_start}"
-
-    def to_dict(self) -> dict:
-        """Convert to dictionary for JSON serialization."""
-        d = asdict(self)
-        d["location"] = self.location
-        return d
+        if self._location is None:
+            self._location = f"{_display_path(self.source_path)}:{self.line_start}"
+        return self._location
+
+    def _key(self) -> tuple:
+        return (
+            self.text,
+            self.source_file,
+            self.source_path,
+            self.line_start,
+            self.line_end,
+            self.section,
+            self.cleaned_text,
+            self.word_count,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._key() == other._key()
+
+    __hash__ = None  # mutable, like the dataclass it replaces
+
+    # Keys of to_dict(), in output order
+    FIELDS = (
+        "text",
+        "source_file",
+        "source_path",
+        "line_start",
+        "line_end",
+        "section",
+        "cleaned_text",
+        "word_count",
+        "location",
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"Paragraph(location={self.location!r}, line_end={self.line_end}, "
+            f"section={self.section!r}, word_count={self.word_count}, "
+            f"text={self.text[:40]!r})"
+        )
+
+    def __reduce__(self):
+        # Ship the derived fields to worker processes, not the cached location
+        return (Paragraph, (*self._key(), self._tokens))
+
+    def to_dict(self, fields: Optional[Sequence[str]] = None) -> dict:
+        """Convert to dictionary for JSON serialization.
+
+        Args:
+            fields: Keys to include, in order (default: all of ``FIELDS``).
+                Derived fields that are not requested are not computed.
+        """
+        if fields is not None:
+            return {name: getattr(self, name) for name in fields}
+        return {
+            "text": self.text,
+            "source_file": self.source_file,
+            "source_path": self.source_path,
+            "line_start": self.line_start,
+            "line_end": self.line_end,
+            "section": self.section,
+            "cleaned_text": self.cleaned_text,
+            "word_count": self.word_count,
+            "location": self.location,
+        }
 
 
 @dataclass
@@ -95,51 +602,83 @@ class Chunk:
     """
     A sliding window of consecutive paragraphs for context-aware analysis.
 
+    Derived fields (text, sections, word totals, location) are computed on
+    first access and cached, since output formatters read them repeatedly.
+    Treat a chunk's paragraph list as immutable once it has been created.
+
     Attributes:
         paragraphs: List of Paragraph objects in this chunk.
         chunk_id: Sequential identifier for this chunk.
+        estimated_tokens: Estimated LLM token count, set by token-budgeted
+            chunking (None for fixed-window chunks).
     """
     paragraphs: List[Paragraph]
     chunk_id: int
-
-    @property
+    estimated_tokens: Optional[int] = None
+
+    # Keys of to_dict(), in output order (estimated_tokens only when set)
+    FIELDS = (
+        "chunk_id",
+        "location",
+        "source_files",
+        "sections",
+        "total_words",
+        "estimated_tokens",
+        "text",
+        "paragraphs",
+    )
+
+    @cached_property
     def text(self) -> str:
         """Combined text of all paragraphs."""
         return "\n\n".join(p.cleaned_text for p in self.paragraphs)
 
-    @property
+    @cached_property
     def source_files(self) -> List[str]:
         """Unique source files represented in this chunk."""
         return list(dict.fromkeys(p.source_file for p in self.paragraphs))
 
-    @property
+    @cached_property
     def sections(self) -> List[str]:
         """Unique sections represented in this chunk."""
         return list(dict.fromkeys(p.section for p in self.paragraphs if p.section))
 
-    @property
+    @cached_property
     def total_words(self) -> int:
         """Total word count across all paragraphs."""
         return sum(p.word_count for p in self.paragraphs)
 
-    @property
+    @cached_property
     def location(self) -> str:
         """Return file:line format for the first paragraph."""
         if self.paragraphs:
             return self.paragraphs[0].location
         return ""
 
-    def to_dict(self) -> dict:
-        """Convert to dictionary for JSON serialization."""
-        return {
-            "chunk_id": self.chunk_id,
-            "location": self.location,
-            "source_files": self.source_files,
-            "sections": self.sections,
-            "total_words": self.total_words,
-            "text": self.text,
-            "paragraphs": [p.to_dict() for p in self.paragraphs],
-        }
+    def to_dict(
+        self,
+        fields: Optional[Sequence[str]] = None,
+        paragraph_fields: Optional[Sequence[str]] = None,
+    ) -> dict:
+        """Convert to dictionary for JSON serialization.
+
+        Args:
+            fields: Keys to include, in order (default: all of ``FIELDS``).
+                Leaving out ``text`` or ``paragraphs`` keeps the paragraph
+                text out of the output.
+            paragraph_fields: Keys of each entry in ``paragraphs`` (default:
+                all of ``Paragraph.FIELDS``).
+        """
+        d = {}
+        for name in self.FIELDS if fields is None else fields:
+            if name == "paragraphs":
+                d[name] = [p.to_dict(paragraph_fields) for p in self.paragraphs]
+            elif name == "estimated_tokens":
+                if self.estimated_tokens is not None:
+                    d[name] = self.estimated_tokens
+            else:
+                d[name] = getattr(self, name)
+        return d
 
 
 # =============================================================================
@@ -173,13 +712,183 @@ DEFAULT_EXCLUDED_ENVIRONMENTS = frozenset({
 # LaTeX Text Cleaning
 # =============================================================================
 
+# Commands whose braced argument is kept as plain text (e.g. \textbf{x} -> x)
+DEFAULT_CONTENT_COMMANDS: Tuple[str, ...] = (
+    "textbf", "textit", "emph", "keyterm",
+    "texttt", "textsf", "textsc", "textrm",
+    "underline", "uline",
+)
+
+# Citation commands removed together with an optional [..] and their {keys}
+DEFAULT_CITE_COMMANDS: Tuple[str, ...] = (
+    "parencite", "textcite", "cite", "autocite", "footcite",
+)
+
+# Reference-like commands removed together with their {argument}
+DEFAULT_REF_COMMANDS: Tuple[str, ...] = (
+    "Cref", "cref", "ref", "eqref", "pageref", "label", "index",
+)
+
+# Literal replacements for special characters, applied in this order
+_SPECIAL_REPLACEMENTS: Tuple[Tuple[str, str], ...] = (
+    ("~", " "),       # Non-breaking space
+    ("---", " — "),   # Em dash
+    ("--", " – "),    # En dash
+    ("``", '"'),      # Opening quotes
+    ("''", '"'),      # Closing quotes
+)
+
+
+class LatexCleaner:
+    """
+    Precompiled, few-pass LaTeX-to-text cleaner.
+
+    All rules are compiled once on construction and grouped into combined
+    alternations, so cleaning a string takes six regex passes (plus a few
+    C-speed ``str.replace`` calls for literal characters) instead of the ~35
+    separate ``re.sub`` calls of the original implementation. The output is
+    identical to that implementation. Inputs whose content commands are
+    nested (e.g. ``\\textbf{\\emph{x}}``) fall back to the original
+    one-pass-per-command order, since the result depends on it.
+
+    A shared default instance backs :func:`clean_latex_text`. Construct your
+    own instance to customise which commands are unwrapped or removed.
+
+    Args:
+        content_commands: Commands whose braced argument is kept as text.
+        cite_commands: Citation commands removed with their keys.
+        ref_commands: Reference/label commands removed with their argument.
+
+    Example:
+        >>> cleaner = LatexCleaner(content_commands=("textbf", "mytermcmd"))
+        >>> cleaner.clean(r"A \\mytermcmd{term} and \\cite{key}.")
+        'A term and .'
+    """
+
+    def __init__(
+        self,
+        content_commands: Tuple[str, ...] = DEFAULT_CONTENT_COMMANDS,
+        cite_commands: Tuple[str, ...] = DEFAULT_CITE_COMMANDS,
+        ref_commands: Tuple[str, ...] = DEFAULT_REF_COMMANDS,
+    ):
+        self.content_commands = tuple(content_commands)
+        self.cite_commands = tuple(cite_commands)
+        self.ref_commands = tuple(ref_commands)
+
+        # Pass 1: comments (but not escaped percent signs). Matching the '%'
+        # before the lookbehind lets the regex engine scan for the literal.
+        self._comment_re = re.compile(r'%(?<!\\%)[^\n]*')
+
+        # Pass 2: content commands, one combined alternation. The per-command
+        # patterns are kept for the nested fallback path.
+        content_names = _alternation(self.content_commands)
+        self._content_re = re.compile(rf'\\(?:{content_names})\{{([^}}]+)\}}')
+        self._content_nested_re = re.compile(rf'\\(?:{content_names})\{{')
+        self._content_sequential = [
+            re.compile(rf'\\{re.escape(cmd)}\{{([^}}]+)\}}')
+            for cmd in self.content_commands
+        ]
+
+        # Pass 3: citations and references. The "Section~\ref{...}"
+        # placeholders of the original implementation could never match once
+        # \ref{...} had been removed, so they are not carried over.
+        self._remove_re = re.compile(
+            rf'\\(?:{_alternation(self.cite_commands)})(?:\[[^\]]*\])?\{{[^}}]+\}}'
+            rf'|\\(?:{_alternation(self.ref_commands)})\{{[^}}]+\}}'
+        )
+
+        # Pass 4: environment delimiters, then generic commands with a braced
+        # argument (begin/end are tried first, as in the original order)
+        self._env_and_command_re = re.compile(
+            r'\\begin\{[^}]+\}(?:\[[^\]]*\])?(?:\{[^}]*\})?'
+            r'|\\end\{[^}]+\}'
+            r'|\\[a-zA-Z]+\*?(?:\[[^\]]*\])?\{[^}]*\}'
+        )
+
+        # Pass 5: remaining commands without arguments
+        self._bare_command_re = re.compile(r'\\[a-zA-Z]+\*?')
+
+        # Pass 6: inline math, then remaining braces and backslashes (special
+        # characters are plain str.replace calls in between)
+        self._math_re = re.compile(r'\$[^$]+\$')
+        self._braces_re = re.compile(r'[{}\\]+')
+
+        # Whitespace normalization for preserve_structure=True
+        self._spaces_re = re.compile(r'[ \t]+')
+        self._blank_lines_re = re.compile(r'\n{3,}')
+
+    def clean(self, text: str, preserve_structure: bool = False) -> str:
+        """
+        Remove LaTeX commands from text, preserving readable content.
+
+        Args:
+            text: Raw LaTeX text.
+            preserve_structure: If True, keep paragraph breaks as newlines.
+
+        Returns:
+            Cleaned text with LaTeX commands removed.
+        """
+        text = self._comment_re.sub('', text)
+        text = self._unwrap_content(text)
+        text = self._remove_re.sub('', text)
+        text = self._env_and_command_re.sub('', text)
+        text = self._bare_command_re.sub('', text)
+        for old, new in _SPECIAL_REPLACEMENTS:
+            text = text.replace(old, new)
+        text = self._math_re.sub('', text)
+        text = self._braces_re.sub('', text)
+
+        if preserve_structure:
+            text = self._spaces_re.sub(' ', text)
+            text = self._blank_lines_re.sub('\n\n', text)
+            return text.strip()
+
+        # Same result as collapsing \s+ to ' ' and stripping, but faster
+        return ' '.join(text.split())
+
+    __call__ = clean
+
+    def _unwrap_content(self, text: str) -> str:
+        """Unwrap content commands, keeping their argument text."""
+        if '\\' not in text:
+            return text
+
+        nested = False
+
+        def unwrap(match: re.Match) -> str:
+            nonlocal nested
+            inner = match.group(1)
+            if self._content_nested_re.search(inner):
+                nested = True
+            return inner
+
+        result = self._content_re.sub(unwrap, text)
+        if not nested:
+            return result
+
+        # Nested content commands: replay the original per-command passes
+        for pattern in self._content_sequential:
+            text = pattern.sub(r'\1', text)
+        return text
+
+
+def _alternation(names: Tuple[str, ...]) -> str:
+    """Build a regex alternation from command names, longest first."""
+    return "|".join(re.escape(n) for n in sorted(names, key=len, reverse=True))
+
+
+_DEFAULT_CLEANER = LatexCleaner()
+
+
+@profiled("clean")
 def clean_latex_text(text: str, preserve_structure: bool = False) -> str:
     """
     Remove LaTeX commands from text, preserving readable content.
 
     This function strips LaTeX markup while keeping the semantic text content.
     It's designed to produce text suitable for word counting, readability
-    analysis, and frequency analysis.
+    analysis, and frequency analysis. It delegates to a shared, precompiled
+    :class:`LatexCleaner`.
 
     Args:
         text: Raw LaTeX text.
@@ -192,74 +901,17 @@ def clean_latex_text(text: str, preserve_structure: bool = False) -> str:
         >>> clean_latex_text(r"This is \\textbf{important} text.")
         'This is important text.'
     """
-    # Remove comments (but not escaped percent signs)
-    text = re.sub(r'(?<!\\)%.*$', '', text, flags=re.MULTILINE)
-
-    # Commands that extract their argument content
-    content_commands = [
-        r'\\textbf', r'\\textit', r'\\emph', r'\\keyterm',
-        r'\\texttt', r'\\textsf', r'\\textsc', r'\\textrm',
-        r'\\underline', r'\\uline',
-    ]
-    for cmd in content_commands:
-        text = re.sub(rf'{cmd}\{{([^}}]+)\}}', r'\1', text)
-
-    # Commands that should be removed entirely (citations, refs)
-    remove_commands = [
-        r'\\parencite(?:\[[^\]]*\])?\{[^}]+\}',
-        r'\\textcite(?:\[[^\]]*\])?\{[^}]+\}',
-        r'\\cite(?:\[[^\]]*\])?\{[^}]+\}',
-        r'\\autocite(?:\[[^\]]*\])?\{[^}]+\}',
-        r'\\footcite(?:\[[^\]]*\])?\{[^}]+\}',
-        r'\\Cref\{[^}]+\}',
-        r'\\cref\{[^}]+\}',
-        r'\\ref\{[^}]+\}',
-        r'\\eqref\{[^}]+\}',
-        r'\\pageref\{[^}]+\}',
-        r'\\label\{[^}]+\}',
-        r'\\index\{[^}]+\}',
-    ]
-    for pattern in remove_commands:
-        text = re.sub(pattern, '', text)
-
-    # Section-like refs (replace with placeholder to avoid word-joining)
-    text = re.sub(r'Section~\\ref\{[^}]+\}', 'Section X', text)
-    text = re.sub(r'Figure~\\ref\{[^}]+\}', 'Figure X', text)
-    text = re.sub(r'Table~\\ref\{[^}]+\}', 'Table X', text)
-    text = re.sub(r'Chapter~\\ref\{[^}]+\}', 'Chapter X', text)
-
-    # Environment delimiters
-    text = re.sub(r'\\begin\{[^}]+\}(?:\[[^\]]*\])?(?:\{[^}]*\})?', '', text)
-    text = re.sub(r'\\end\{[^}]+\}', '', text)
-
-    # Generic commands with braced arguments (greedy but imperfect)
-    text = re.sub(r'\\[a-zA-Z]+\*?(?:\[[^\]]*\])?\{[^}]*\}', '', text)
-
-    # Remaining commands without arguments
-    text = re.sub(r'\\[a-zA-Z]+\*?', '', text)
-
-    # Special characters and spacing
-    text = re.sub(r'~', ' ', text)  # Non-breaking space
-    text = re.sub(r'---', ' — ', text)  # Em dash
-    text = re.sub(r'--', ' – ', text)  # En dash
-    text = re.sub(r'``|\'\'', '"', text)  # Quotes
-    text = re.sub(r'\$[^$]+\$', '', text)  # Inline math
-    text = re.sub(r'[{}\\]', '', text)  # Remaining braces and backslashes
-
-    # Normalize whitespace
-    if preserve_structure:
-        text = re.sub(r'[ \t]+', ' ', text)
-        text = re.sub(r'\n{3,}', '\n\n', text)
-    else:
-        text = re.sub(r'\s+', ' ', text)
-
-    return text.strip()
+    return _DEFAULT_CLEANER.clean(text, preserve_structure)
 
 
 # =============================================================================
 # Tokenization
 # =============================================================================
 
+# Words with optional internal apostrophes/hyphens
+_WORD_RE = re.compile(r"\b[a-zA-Z][a-zA-Z'\-]*[a-zA-Z]\b|\b[a-zA-Z]\b")
+
+
 def tokenize_simple(text: str) -> List[str]:
     """
     Simple whitespace-based tokenization.
@@ -273,6 +925,7 @@ def tokenize_simple(text: str) -> List[str]:
     return text.split()
 
 
+@profiled("tokenize")
 def tokenize_regex(text: str) -> List[str]:
     """
     Regex-based tokenization that handles punctuation properly.
@@ -289,8 +942,92 @@ def tokenize_regex(text: str) -> List[str]:
         >>> tokenize_regex("It's a well-known fact.")
         ["It's", 'a', 'well-known', 'fact']
     """
-    # Match words with optional internal apostrophes/hyphens
-    return re.findall(r"\b[a-zA-Z][a-zA-Z'\-]*[a-zA-Z]\b|\b[a-zA-Z]\b", text)
+    return _WORD_RE.findall(text)
+
+
+class TokenizedText:
+    """
+    The word tokens of a text as (start, end) offsets into it.
+
+    Tokenizes once, with the same rules as :func:`tokenize_regex`; word
+    counts, previews, lowercase token lists for n-grams and keyword-in-
+    context snippets are then slices of the text. The spans take 8 bytes
+    per token in an ``array`` instead of a list of token strings.
+
+    Args:
+        text: Cleaned text to tokenize.
+
+    Example:
+        >>> tokens = TokenizedText("It's a well-known fact.")
+        >>> len(tokens), tokens.words(0, 2)
+        (4, ["It's", 'a'])
+        >>> tokens.kwic(2, width=1)
+        ('a', 'well-known', 'fact')
+    """
+
+    __slots__ = ("text", "spans")
+
+    @profiled("tokenize")
+    def __init__(self, text: str):
+        self.text = text
+        # Flat start, end pairs
+        self.spans = array("I", [i for m in _WORD_RE.finditer(text) for i in m.span()])
+
+    def __len__(self) -> int:
+        return len(self.spans) // 2
+
+    def __reduce__(self):
+        return (_tokenized_from_spans, (self.text, self.spans))
+
+    def words(self, start: int = 0, stop: Optional[int] = None) -> List[str]:
+        """Tokens ``start:stop`` as strings."""
+        text, spans = self.text, self.spans
+        stop = len(self) if stop is None else min(stop, len(self))
+        return [text[spans[2 * i]:spans[2 * i + 1]] for i in range(start, stop)]
+
+    def lower(self) -> List[str]:
+        """All tokens, lowercased (as counted by frequency analysis)."""
+        text = self.text
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # A few non-ASCII characters change length when lowercased
+            return [word.lower() for word in self.words()]
+        spans = self.spans
+        return [lowered[spans[i]:spans[i + 1]] for i in range(0, len(spans), 2)]
+
+    def preview(self, n_words: int = 15) -> str:
+        """The first words joined by spaces, with "..." when there are more."""
+        words = self.words(0, n_words)
+        return " ".join(words) + ("..." if len(words) == n_words else "")
+
+    def kwic(self, index: int, width: int = 5) -> Tuple[str, str, str]:
+        """
+        Keyword in context: the text around token `index`.
+
+        Args:
+            index: Token index of the keyword.
+            width: Number of tokens of context on each side.
+
+        Returns:
+            (left, keyword, right) slices of the text, with the original
+            punctuation and spacing and outer whitespace stripped.
+        """
+        text, spans = self.text, self.spans
+        n = len(self)
+        first = max(index - width, 0)
+        last = min(index + width, n - 1)
+        start, end = spans[2 * index], spans[2 * index + 1]
+        left = text[spans[2 * first]:start] if first < index else ""
+        right = text[end:spans[2 * last + 1]] if last > index else ""
+        return left.strip(), text[start:end], right.strip()
+
+
+def _tokenized_from_spans(text: str, spans: array) -> TokenizedText:
+    """Rebuild a TokenizedText without tokenizing again (for pickling)."""
+    tokens = TokenizedText.__new__(TokenizedText)
+    tokens.text = text
+    tokens.spans = spans
+    return tokens
 
 
 def get_ngrams(tokens: List[str], n: int) -> List[Tuple[str, ...]]:
@@ -314,216 +1051,2314 @@ def get_ngrams(tokens: List[str], n: int) -> List[Tuple[str, ...]]:
 
 
 # =============================================================================
-# Paragraph Extraction
+# Interned Token Store
 # =============================================================================
 
-def extract_paragraphs_from_tex(
-    file_path: str | Path,
-    excluded_envs: Optional[frozenset[str]] = None,
-    min_words: int = 10,
-) -> List[Paragraph]:
-    """
-    Extract prose paragraphs from a LaTeX file.
+# Corpus size (tokens) below which importing NumPy for n-gram counting costs
+# more than vectorizing saves; see TokenStore.ngram_counts
+NUMPY_MIN_TOKENS = 100_000
 
-    This function parses a LaTeX file and extracts contiguous blocks of prose
-    text, excluding structural elements like figures, tables, and custom boxes.
-    It's designed to isolate the narrative content for quality analysis.
 
-    Args:
-        file_path: Path to the LaTeX file.
-        excluded_envs: Set of environment names to skip. Defaults to
-            DEFAULT_EXCLUDED_ENVIRONMENTS.
-        min_words: Minimum word count to include a paragraph.
+class TokenStore:
+    """
+    Compact, vocabulary-interned token corpus.
 
-    Returns:
-        List of Paragraph objects, ordered by appearance in the file.
+    Each distinct token is stored once in ``vocab``; the corpus itself is a
+    single ``array('I')`` of token ids (4 bytes per token), and each file is a
+    ``(start, end)`` span into it. Per-file views are zero-copy memoryviews,
+    and n-grams are counted over integer ids without building lists of
+    string tuples.
+
+    Attributes:
+        vocab: Token strings, indexed by id.
+        index: Token string -> id.
+        ids: Token ids of the whole corpus, in file order.
+        spans: File name -> (start, end) offsets into ``ids``.
 
     Example:
-        >>> paragraphs = extract_paragraphs_from_tex("chapter.tex")
-        >>> print(f"Found {len(paragraphs)} paragraphs")
+        >>> store = TokenStore()
+        >>> store.add("a.tex", ["the", "agent", "plans"])
+        >>> store.decode(store.view("a.tex"))
+        ['the', 'agent', 'plans']
     """
-    file_path = Path(file_path)
-    excluded_envs = excluded_envs or DEFAULT_EXCLUDED_ENVIRONMENTS
 
-    with open(file_path, "r", encoding="utf-8") as f:
-        lines = f.read().split("\n")
-
-    paragraphs: List[Paragraph] = []
-    current_para_lines: List[str] = []
-    current_start_line = 0
-    current_section = ""
-    env_depth = 0  # Track nested excluded environments
-
-    for line_num, line in enumerate(lines, 1):
-        stripped = line.strip()
-
-        # Track section headings
-        section_match = re.match(r'\\(sub)*section\*?\{([^}]+)\}', stripped)
-        if section_match:
-            current_section = section_match.group(2)
-
-        # Track environment nesting
-        begin_match = re.match(r'\\begin\{(\w+\*?)\}', stripped)
-        end_match = re.match(r'\\end\{(\w+\*?)\}', stripped)
-
-        if begin_match and begin_match.group(1) in excluded_envs:
-            # Save current paragraph before entering excluded environment
-            if current_para_lines:
-                _save_paragraph(
-                    paragraphs, current_para_lines, file_path,
-                    current_start_line, line_num - 1, current_section, min_words
+    def __init__(self):
+        self.vocab: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.ids = array("I")
+        self.spans: Dict[str, Tuple[int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, name: str, tokens: Iterable[str]) -> None:
+        """Intern and append the tokens of one file."""
+        index = self.index
+        start = len(self.ids)
+        # setdefault evaluates len(index) first, so new tokens get the next id
+        self.ids.extend([index.setdefault(t, len(index)) for t in tokens])
+        if len(index) > len(self.vocab):
+            self.vocab.extend(islice(index, len(self.vocab), None))
+        self.spans[name] = (start, len(self.ids))
+
+    def view(self, name: str) -> memoryview:
+        """Zero-copy view of one file's token ids."""
+        start, end = self.spans[name]
+        return memoryview(self.ids)[start:end]
+
+    def file_views(self) -> Dict[str, memoryview]:
+        """Zero-copy views of every file's token ids."""
+        return {name: self.view(name) for name in self.spans}
+
+    def decode(self, ids: Iterable[int]) -> List[str]:
+        """Map token ids back to strings."""
+        vocab = self.vocab
+        return [vocab[i] for i in ids]
+
+    def mask(self, words: frozenset[str]) -> bytes:
+        """Return a per-id mask: 1 where the vocabulary word is in ``words``."""
+        return bytes(1 if w in words else 0 for w in self.vocab)
+
+    @profiled("words")
+    def word_counts(self, exclude: Optional[bytes] = None) -> Counter:
+        """
+        Count tokens, optionally skipping ids flagged in an ``exclude`` mask.
+
+        Returns:
+            Counter keyed by token string, in first-occurrence order.
+        """
+        vocab = self.vocab
+        return Counter({
+            vocab[i]: c for i, c in Counter(self.ids).items()
+            if exclude is None or not exclude[i]
+        })
+
+    @profiled("ngrams")
+    def ngram_counts(
+        self,
+        n: int,
+        stop_mask: Optional[bytes] = None,
+        min_content: int = 0,
+        engine: str = "auto",
+    ) -> Counter:
+        """
+        Count n-grams over token ids.
+
+        Each n-gram is packed into a single integer key (base = vocabulary
+        size) while counting, so no per-occurrence tuples are built; only the
+        distinct n-grams are decoded back to strings at the end. When NumPy
+        is installed the counting is vectorized (see :meth:`_ngram_counts_numpy`);
+        below ``NUMPY_MIN_TOKENS`` tokens, "auto" stays in pure Python unless
+        NumPy is already imported, since importing it would cost more than
+        the vectorized counting saves.
+
+        Args:
+            n: N-gram size (any n >= 1).
+            stop_mask: Per-id stopword mask (see :meth:`mask`).
+            min_content: Minimum non-stopword tokens an n-gram needs.
+            engine: "numpy", "python", or "auto" (NumPy when available and
+                worthwhile).
+
+        Returns:
+            Counter keyed by n-gram tuples of strings, in first-occurrence
+            order (the same ordering a Counter over get_ngrams() gives).
+        """
+        if engine == "auto" and len(self.ids) < NUMPY_MIN_TOKENS and "numpy" not in sys.modules:
+            engine = "python"
+        np = optional_import("numpy") if engine != "python" else None
+        if engine == "numpy" or (engine == "auto" and np is not None):
+            if np is None:
+                raise ImportError("engine='numpy' requires NumPy (pip install numpy)")
+            return self._ngram_counts_numpy(n, stop_mask, min_content)
+
+        ids = self.ids
+        base = max(len(self.vocab), 1)
+        max_stop = n - min_content
+        stop = stop_mask if stop_mask is not None and min_content > 0 else None
+
+        # Common sizes get inline packing; other sizes use a generic fold
+        if n == 2:
+            pairs = zip(ids, ids[1:])
+            if stop is not None:
+                keys = (a * base + b for a, b in pairs if stop[a] + stop[b] <= max_stop)
+            else:
+                keys = (a * base + b for a, b in pairs)
+        elif n == 3:
+            triples = zip(ids, ids[1:], ids[2:])
+            if stop is not None:
+                keys = (
+                    (a * base + b) * base + c for a, b, c in triples
+                    if stop[a] + stop[b] + stop[c] <= max_stop
                 )
-                current_para_lines = []
-            env_depth += 1
-            continue
+            else:
+                keys = ((a * base + b) * base + c for a, b, c in triples)
+        else:
+            grams = zip(*(ids[i:] for i in range(n)))
+            if stop is not None:
+                grams = (g for g in grams if sum(map(stop.__getitem__, g)) <= max_stop)
+            keys = (reduce(lambda key, i: key * base + i, g, 0) for g in grams)
+
+        return Counter({
+            self._unpack(key, n, base): count
+            for key, count in Counter(keys).items()
+        })
+
+    def _ngram_counts_numpy(
+        self,
+        n: int,
+        stop_mask: Optional[bytes],
+        min_content: int,
+    ) -> Counter:
+        """
+        Vectorized n-gram counting with NumPy.
+
+        N-grams are packed into int64 keys (``key = key * base + id``) and
+        counted with ``np.unique``. When ``base ** n`` would overflow int64,
+        the n-gram is split across several int64 keys and grouped with a
+        stable ``np.lexsort``, so any n is supported. Stopword filtering uses
+        a windowed sum over the per-token mask, computed once for all
+        positions.
+        """
+        np = optional_import("numpy")
+        ids = np.frombuffer(self.ids, dtype=np.uint32).astype(np.int64)
+        m = len(ids) - n + 1
+        if m <= 0:
+            return Counter()
+        base = max(len(self.vocab), 1)
+
+        # Start offsets of the n-grams to count
+        if stop_mask is not None and min_content > 0:
+            stops = np.frombuffer(stop_mask, dtype=np.uint8)[ids].astype(np.int64)
+            csum = np.concatenate(([0], np.cumsum(stops)))
+            starts = np.flatnonzero((csum[n:] - csum[:-n]) <= n - min_content)
+        else:
+            starts = np.arange(m)
+        if len(starts) == 0:
+            return Counter()
+
+        # Pack as many positions per int64 key as fit without overflow (a
+        # one-word vocabulary has base 1, so stop at n)
+        per_key = 1
+        while per_key < n and base ** (per_key + 1) < 2 ** 63:
+            per_key += 1
+        keys = []
+        for lo in range(0, n, per_key):
+            key = ids[starts + lo]
+            for pos in range(lo + 1, min(lo + per_key, n)):
+                key = key * base + ids[starts + pos]
+            keys.append(key)
+
+        if len(keys) == 1:
+            _, first, counts = np.unique(keys[0], return_index=True, return_counts=True)
+        else:
+            order = np.lexsort(keys[::-1])
+            new_group = np.zeros(len(order), dtype=bool)
+            new_group[0] = True
+            for key in keys:
+                ordered = key[order]
+                new_group[1:] |= ordered[1:] != ordered[:-1]
+            group_starts = np.flatnonzero(new_group)
+            counts = np.diff(np.append(group_starts, len(order)))
+            first = order[group_starts]  # lexsort is stable: earliest occurrence
+
+        # Restore first-occurrence order, then decode column-wise from the
+        # token ids at each n-gram's first position
+        by_first = np.argsort(first, kind="stable")
+        offsets = starts[first[by_first]]
+        counts = counts[by_first]
+        vocab = np.array(self.vocab, dtype=object)
+        columns = [vocab[ids[offsets + pos]].tolist() for pos in range(n)]
+        return Counter(dict(zip(zip(*columns), counts.tolist())))
+
+    def _unpack(self, key: int, n: int, base: int) -> Tuple[str, ...]:
+        """Decode a packed n-gram key back to its token strings."""
+        words = [""] * n
+        for pos in range(n - 1, -1, -1):
+            key, i = divmod(key, base)
+            words[pos] = self.vocab[i]
+        return tuple(words)
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the store (ids, vocabulary, index)."""
+        return (
+            self.ids.itemsize * len(self.ids)
+            + sys.getsizeof(self.vocab)
+            + sys.getsizeof(self.index)
+            + sum(sys.getsizeof(w) for w in self.vocab)
+        )
 
-        if end_match and end_match.group(1) in excluded_envs:
-            env_depth = max(0, env_depth - 1)
-            continue
 
-        # Skip content inside excluded environments
-        if env_depth > 0:
-            continue
+# =============================================================================
+# Source Files
+# =============================================================================
 
-        # Detect structural/non-prose lines
-        is_structural = (
-            stripped.startswith('%') or
-            stripped.startswith('\\begin{') or
-            stripped.startswith('\\end{') or
-            stripped.startswith('\\input{') or
-            stripped.startswith('\\include{') or
-            stripped.startswith('\\label{') or
-            stripped.startswith('\\pagebreak') or
-            stripped.startswith('\\newpage') or
-            stripped.startswith('\\clearpage') or
-            stripped.startswith('\\vspace') or
-            stripped.startswith('\\hspace') or
-            stripped.startswith('\\noindent') or
-            stripped.startswith('\\addcontentsline') or
-            re.match(r'^\\(sub)*section', stripped) or
-            re.match(r'^\\chapter', stripped) or
-            re.match(r'^\\part', stripped) or
-            stripped.startswith('% ===') or
-            stripped.startswith('% ---') or
-            stripped == ''
-        )
+def _max_mapped_files() -> int:
+    """Half the process's file descriptor budget (each mapping holds one)."""
+    try:
+        import resource
+        soft = resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+    except (ImportError, OSError, ValueError):
+        return 128
+    if soft == resource.RLIM_INFINITY or soft < 0:
+        return 1024
+    return max(16, min(1024, soft // 2))
 
-        # \paragraph{} starts a new logical paragraph
-        para_match = re.match(r'^\\paragraph\{([^}]+)\}(.*)$', stripped)
 
-        if is_structural or para_match:
-            # Save accumulated paragraph
-            if current_para_lines:
-                _save_paragraph(
-                    paragraphs, current_para_lines, file_path,
-                    current_start_line, line_num - 1, current_section, min_words
-                )
-                current_para_lines = []
-
-            # Handle \paragraph{} content on same line
-            if para_match:
-                remaining = para_match.group(2).strip()
-                if remaining:
-                    current_start_line = line_num
-                    current_para_lines = [remaining]
-            continue
+# Memory maps kept open at once
+MAX_MAPPED_FILES = _max_mapped_files()
 
-        # Accumulate prose lines
-        if not current_para_lines:
-            current_start_line = line_num
-        current_para_lines.append(stripped)
+# Line breaks in raw bytes, as universal newlines decoding sees them
+_NEWLINE_BYTES_RE = re.compile(rb"\r\n?|\n")
 
-    # Don't forget final paragraph
-    if current_para_lines:
-        _save_paragraph(
-            paragraphs, current_para_lines, file_path,
-            current_start_line, len(lines), current_section, min_words
-        )
 
-    return paragraphs
+class SourceFile:
+    """
+    A LaTeX source file, memory-mapped once and decoded on demand.
 
+    The raw bytes stay in the OS page cache and are shared by every analysis
+    in the process: the parse cache hashes them without decoding, and the
+    parser decodes them when it actually needs text. Decoded text is not
+    kept, so holding many files costs only their mappings and line indexes.
+    The line index is built over the raw bytes, so :meth:`line` decodes just
+    the requested line. (The parser numbers lines itself during its single
+    lexing pass and does not use the index.)
 
-def _save_paragraph(
-    paragraphs: List[Paragraph],
-    lines: List[str],
-    file_path: Path,
-    start_line: int,
-    end_line: int,
-    section: str,
-    min_words: int,
-) -> None:
-    """Helper to create and save a Paragraph if it meets criteria."""
-    text = " ".join(lines)
-    cleaned = clean_latex_text(text)
-    word_count = len(tokenize_regex(cleaned))
+    Args:
+        path: Path of the file.
+        use_mmap: Memory-map the file (default) or read its bytes into
+            memory. Reading is safer for files an editor may truncate and
+            rewrite while they are open: touching a mapping of a truncated
+            file raises SIGBUS.
 
-    if word_count >= min_words:
-        paragraphs.append(Paragraph(
-            text=text,
-            source_file=file_path.name,
-            source_path=str(file_path),
-            line_start=start_line,
-            line_end=end_line,
-            section=section,
-            cleaned_text=cleaned,
-            word_count=word_count,
-        ))
+    Attributes:
+        path: Path of the file.
+        mtime_ns: Modification time when the file was loaded.
+        size: Size in bytes when the file was loaded.
 
+    Example:
+        >>> source = load_source("chapter.tex")
+        >>> source.line(source.line_at(2048))
+        '\\\\section{Planning}'
+    """
 
-# =============================================================================
-# Chunk Creation
-# =============================================================================
+    def __init__(self, path: str | Path, use_mmap: bool = True):
+        self.path = Path(path)
+        stat = self.path.stat()
+        self.mtime_ns = stat.st_mtime_ns
+        self.size = stat.st_size
+        self._buffer: mmap.mmap | bytes = b""
+        if self.size:
+            with open(self.path, "rb") as f:
+                if use_mmap:
+                    self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                else:
+                    self._buffer = f.read()
 
-def create_chunks(
-    paragraphs: List[Paragraph],
-    window_size: int = 3,
-    overlap: int = 1,
-) -> List[Chunk]:
+    @property
+    @profiled("read")
+    def text(self) -> str:
+        """The file decoded as UTF-8 with universal newlines, like read_text()."""
+        profile_count(bytes=self.size)
+        text = str(self._buffer, "utf-8")
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return text
+
+    @cached_property
+    def content_hash(self) -> str:
+        """SHA-256 of the raw bytes, as used by ParseCache."""
+        return hashlib.sha256(self._buffer).hexdigest()
+
+    @cached_property
+    def line_offsets(self) -> array:
+        """Byte offset where each line starts (index 0 is line 1)."""
+        offsets = array("L", [0])
+        offsets.extend(m.end() for m in _NEWLINE_BYTES_RE.finditer(self._buffer))
+        return offsets
+
+    def line_at(self, offset: int) -> int:
+        """Return the 1-indexed line containing a byte offset (binary search)."""
+        return bisect_right(self.line_offsets, offset)
+
+    def line(self, line_num: int) -> str:
+        """Return a line by its 1-indexed number, without its line break."""
+        offsets = self.line_offsets
+        start = offsets[line_num - 1]
+        end = offsets[line_num] if line_num < len(offsets) else len(self._buffer)
+        return str(self._buffer[start:end], "utf-8").rstrip("\r\n")
+
+    def close(self) -> None:
+        """Unmap the file."""
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+
+class SourceCorpus:
     """
-    Create sliding window chunks from paragraphs.
+    Shares one SourceFile per path across the analyses in a process.
 
-    Chunks provide context for analysis that benefits from seeing multiple
-    consecutive paragraphs together (e.g., detecting repetition across
-    adjacent paragraphs, analyzing flow and transitions).
+    Files are re-mapped when their mtime or size changes, so long-running
+    watch modes see edits. The least recently used mappings are closed once
+    more than `max_files` are open.
 
     Args:
-        paragraphs: List of Paragraph objects.
-        window_size: Number of paragraphs per chunk.
-        overlap: Number of paragraphs shared between consecutive chunks.
+        max_files: Files kept open (or in memory) at once.
+        use_mmap: Memory-map files (default) or read them into memory; see
+            :class:`SourceFile`.
+
+    Example:
+        >>> corpus = SourceCorpus()
+        >>> corpus.get("chapter.tex") is corpus.get("chapter.tex")
+        True
+    """
+
+    def __init__(self, max_files: int = MAX_MAPPED_FILES, use_mmap: bool = True):
+        self.max_files = max_files
+        self.use_mmap = use_mmap
+        self._files: OrderedDict[str, SourceFile] = OrderedDict()
+
+    def get(self, path: str | Path) -> SourceFile:
+        """Return the mapped file, loading or re-mapping it if needed."""
+        key = os.path.abspath(path)
+        source = self._files.get(key)
+        if source is not None:
+            stat = os.stat(key)
+            if (stat.st_mtime_ns, stat.st_size) == (source.mtime_ns, source.size):
+                self._files.move_to_end(key)
+                return source
+            source.close()
+
+        source = self._files[key] = SourceFile(path, use_mmap=self.use_mmap)
+        self._files.move_to_end(key)
+        while len(self._files) > self.max_files:
+            self._files.popitem(last=False)[1].close()
+        return source
+
+    def close(self) -> None:
+        """Unmap every file."""
+        for source in self._files.values():
+            source.close()
+        self._files.clear()
 
-    Returns:
-        List of Chunk objects.
+
+_DEFAULT_CORPUS = SourceCorpus()
+
+
+@profiled("read")
+def load_source(path: str | Path) -> SourceFile:
+    """
+    Return the process-wide shared SourceFile for a path.
+
+    Example:
+        >>> text = load_source("chapter.tex").text
+    """
+    return _DEFAULT_CORPUS.get(path)
+
+
+def set_source_mapping(enabled: bool) -> None:
+    """
+    Choose whether load_source() memory-maps files or reads them.
+
+    Closes the files loaded so far, so later loads use the new mode.
+    Long-running watch modes read files instead of mapping them (see
+    :func:`watch_files`).
+    """
+    _DEFAULT_CORPUS.close()
+    _DEFAULT_CORPUS.use_mmap = enabled
+
+
+# =============================================================================
+# Paragraph Extraction
+# =============================================================================
+
+@profiled("parse")
+def extract_paragraphs_from_tex(
+    file_path: str | Path,
+    excluded_envs: Optional[frozenset[str]] = None,
+    min_words: int = 10,
+) -> List[Paragraph]:
+    """
+    Extract prose paragraphs from a LaTeX file.
+
+    This function parses a LaTeX file and extracts contiguous blocks of prose
+    text, excluding structural elements like figures, tables, and custom boxes.
+    It's designed to isolate the narrative content for quality analysis.
+
+    Args:
+        file_path: Path to the LaTeX file.
+        excluded_envs: Set of environment names to skip. Defaults to
+            DEFAULT_EXCLUDED_ENVIRONMENTS.
+        min_words: Minimum word count to include a paragraph.
+
+    Returns:
+        List of Paragraph objects, ordered by appearance in the file.
+
+    Example:
+        >>> paragraphs = extract_paragraphs_from_tex("chapter.tex")
+        >>> print(f"Found {len(paragraphs)} paragraphs")
+    """
+    return list(_iter_file_paragraphs(Path(file_path), excluded_envs, min_words))
+
+
+def iter_paragraphs(
+    files: Iterable[str | Path],
+    excluded_envs: Optional[frozenset[str]] = None,
+    min_words: int = 10,
+    cache: Optional[ParseCache] = None,
+) -> Iterator[Paragraph]:
+    """
+    Stream prose paragraphs from LaTeX files.
+
+    Files are parsed one at a time and each Paragraph is yielded as soon as
+    it closes, so consumers can emit the first records immediately and memory
+    stays bounded by the largest file rather than the corpus.
+
+    Args:
+        files: LaTeX files to parse, in output order.
+        excluded_envs: Set of environment names to skip. Defaults to
+            DEFAULT_EXCLUDED_ENVIRONMENTS.
+        min_words: Minimum word count to include a paragraph.
+        cache: Optional ParseCache; hits are replayed from the cache and
+            misses are stored once their file has been fully streamed.
+
+    Yields:
+        Paragraph objects, ordered by file and then by appearance.
+
+    Example:
+        >>> for para in iter_paragraphs(find_tex_files("chapters/")):
+        ...     print(para.location, para.word_count)
+    """
+    for file_path in files:
+        file_path = Path(file_path)
+
+        cached = cache.get(file_path, excluded_envs, min_words) if cache else None
+        if cached is not None:
+            yield from cached
+            continue
+
+        paragraphs: List[Paragraph] = []
+        for para in _iter_file_paragraphs(file_path, excluded_envs, min_words):
+            if cache:
+                paragraphs.append(para)
+            yield para
+
+        if cache:
+            cache.put(file_path, paragraphs, excluded_envs, min_words)
+
+
+# Commands that end the current paragraph when they start a line, with the
+# number of mandatory arguments consumed after them (arguments may span lines)
+_LINE_COMMANDS = {
+    "part": 1, "chapter": 1, "paragraph": 1,
+    "input": 1, "include": 1, "label": 1, "addcontentsline": 3,
+    "vspace": 1, "hspace": 1,
+    "pagebreak": 0, "newpage": 0, "clearpage": 0, "noindent": 0,
+}
+
+# Environments whose bodies are skipped verbatim instead of tokenized
+VERBATIM_ENVIRONMENTS = frozenset({"lstlisting", "verbatim", "verbatim*", "Verbatim", "minted"})
+
+# One master pattern; text between matches is prose or environment content.
+# Every branch starts with a literal and groups are positional so the regex
+# engine can skip ahead to the next "\n", "%" or "\\" (named groups around
+# the branches disable that and make the scan ~7x slower).
+_TEX_TOKEN_RE = re.compile(
+    r"\n"                                               # newline
+    r"|%[^\n]*"                                         # comment
+    r"|\\(begin|end)[ \t]*\{([^{}\n]*)\}"               # \begin/\end: groups 1-2
+    r"|\\((?:sub)*section|"                             # line command: group 3
+    + "|".join(_LINE_COMMANDS) + r")(?![a-zA-Z])"
+    r"|\\[^a-zA-Z\n]"                                   # escaped character
+)
+_ENV_TOKEN, _COMMAND_TOKEN = 2, 3  # match.lastindex of those two branches
+
+# Argument delimiters; a blank line ends a runaway argument, as in LaTeX
+_TEX_ARG_RE = re.compile(r"\\.|[{}\[\]]|\n[ \t]*\n")
+_TEX_ARG_START_RE = re.compile(r"\*?[ \t]*([\[{])")
+
+# Line states of the paragraph lexer
+_LINE_START, _LINE_PROSE, _LINE_SKIP = range(3)
+
+
+def _iter_file_paragraphs(
+    file_path: Path,
+    excluded_envs: Optional[frozenset[str]],
+    min_words: int,
+) -> Iterator[Paragraph]:
+    """Paragraph parser behind extract_paragraphs_from_tex and iter_paragraphs."""
+    text = load_source(file_path).text
+    blocks = _iter_prose_blocks(text, excluded_envs or DEFAULT_EXCLUDED_ENVIRONMENTS)
+    for lines, line_start, line_end, section in blocks:
+        para = _make_paragraph(lines, file_path, line_start, line_end, section, min_words)
+        if para:
+            yield para
+
+
+def _iter_prose_blocks(
+    text: str,
+    excluded_envs: frozenset[str],
+) -> Iterator[Tuple[List[str], int, int, str]]:
+    """
+    Split LaTeX source into prose blocks in a single tokenizing pass.
+
+    _TEX_TOKEN_RE finds newlines, comments, environment boundaries and the
+    line-level commands; everything between tokens is text. A line is prose
+    unless its first token is structural (comment, \\begin/\\end, heading,
+    layout command), and blank lines end paragraphs. Excluded environments
+    are skipped wherever they begin, including mid-line, and arguments of
+    line-level commands may span lines.
+
+    Yields:
+        (lines, line_start, line_end, section) per block, where lines are
+        the stripped prose lines joined by _make_paragraph.
+    """
+    lines: List[str] = []
+    start_line = 0
+    section = ""
+    depth = 0  # Nesting of excluded environments
+    line_num = 1
+    mode = _LINE_START
+    mark = 0  # Start of the undecided or prose part of the current line
+    pos = 0
+    search = _TEX_TOKEN_RE.search
+
+    while True:
+        m = search(text, pos)
+        end = m.start() if m else len(text)
+        if mode == _LINE_START and depth == 0 and text[mark:end].strip():
+            mode = _LINE_PROSE
+        kind = m.lastindex if m else None
+        char = text[end] if m else "\n"  # End of text closes the last line
+
+        if kind is None and char == "\n":
+            if depth == 0:
+                if mode == _LINE_PROSE:
+                    line = text[mark:end].strip()
+                    if line:
+                        if not lines:
+                            start_line = line_num
+                        lines.append(line)
+                elif mode == _LINE_START and lines:
+                    yield lines, start_line, line_num - 1, section
+                    lines = []
+            if m is None:
+                break
+            line_num += 1
+            mode = _LINE_START
+            mark = pos = m.end()
+            continue
+
+        pos = m.end()
+
+        if kind == _ENV_TOKEN:
+            name = m.group(2)
+            if mode == _LINE_START:
+                if lines:
+                    yield lines, start_line, line_num - 1, section
+                    lines = []
+                mode = _LINE_SKIP
+                if m.group(1) == "begin":
+                    pos = _skip_arguments(text, pos, 1)[0]
+                    line_num += text.count("\n", m.end(), pos)
+            if name not in excluded_envs:
+                continue
+            if m.group(1) == "end":
+                if depth:
+                    depth -= 1
+                    if depth == 0 and mode != _LINE_SKIP:
+                        mode, mark = _LINE_START, m.end()
+                continue
+            if depth == 0 and mode == _LINE_PROSE:
+                # Environment opens mid-line: the text before it ends the paragraph
+                line = text[mark:end].strip()
+                if line:
+                    if not lines:
+                        start_line = line_num
+                    lines.append(line)
+                if lines:
+                    yield lines, start_line, line_num, section
+                    lines = []
+            depth += 1
+            if name in VERBATIM_ENVIRONMENTS:
+                close = text.find(f"\\end{{{name}}}", pos)
+                close = len(text) if close < 0 else close
+                newlines = text.count("\n", pos, close)
+                if newlines:
+                    line_num += newlines
+                    mode, mark = _LINE_START, text.rfind("\n", pos, close) + 1
+                pos = close
+
+        elif kind == _COMMAND_TOKEN:
+            if mode != _LINE_START or depth:
+                continue  # Mid-line or inside an excluded environment: just text
+            if lines:
+                yield lines, start_line, line_num - 1, section
+                lines = []
+            cmd = m.group(3)
+            is_section = cmd.endswith("section")
+            pos, title = _skip_arguments(text, pos, 1 if is_section else _LINE_COMMANDS[cmd])
+            line_num += text.count("\n", m.end(), pos)
+            if is_section and title:
+                section = re.sub(r"\s*\n\s*", " ", title)
+            if cmd == "paragraph":
+                # \paragraph{} text on the same line starts the next paragraph
+                mode, mark = _LINE_PROSE, pos
+            else:
+                mode = _LINE_SKIP
+
+        elif mode == _LINE_START:
+            # A comment opens a structural line; an escape such as \% is text
+            if char == "%":
+                if lines:
+                    yield lines, start_line, line_num - 1, section
+                    lines = []
+                mode = _LINE_SKIP
+            elif depth == 0:
+                mode = _LINE_PROSE
+
+    # Don't forget final paragraph
+    if lines:
+        yield lines, start_line, line_num, section
+
+
+def _skip_arguments(text: str, pos: int, count: int) -> Tuple[int, Optional[str]]:
+    """
+    Skip a command's star, optional arguments and up to `count` mandatory ones.
+
+    Returns:
+        (position after the arguments, content of the last mandatory
+        argument or None).
+    """
+    content = None
+    while True:
+        m = _TEX_ARG_START_RE.match(text, pos)
+        if not m or (count == 0 and (m.group(1) == "{" or content is not None)):
+            return pos, content
+        end = _argument_end(text, m.start(1))
+        if end is None:
+            return pos, content
+        if m.group(1) == "{":
+            count -= 1
+            content = text[m.end(1):end - 1]
+        pos = end
+
+
+def _argument_end(text: str, start: int) -> Optional[int]:
+    """Return the index after the balanced {...} or [...] group at `start`."""
+    bracket = text[start] == "["
+    depth = 0
+    for m in _TEX_ARG_RE.finditer(text, start + 1):
+        token = m.group()
+        if token == "{":
+            depth += 1
+        elif token == "}":
+            if depth == 0:
+                return None if bracket else m.end()
+            depth -= 1
+        elif token == "]":
+            if bracket and depth == 0:
+                return m.end()
+        elif token[0] == "\n":
+            return None
+    return None
+
+
+def _make_paragraph(
+    lines: List[str],
+    file_path: Path,
+    start_line: int,
+    end_line: int,
+    section: str,
+    min_words: int,
+) -> Optional[Paragraph]:
+    """Helper to create a Paragraph if it meets criteria."""
+    text = " ".join(lines)
+    cleaned = clean_latex_text(text)
+    tokens = TokenizedText(cleaned)
+    word_count = len(tokens)
+
+    if word_count < min_words:
+        return None
+
+    return Paragraph(
+        text=text,
+        # Shared by every paragraph of the file rather than one copy each
+        source_file=sys.intern(file_path.name),
+        source_path=str(file_path),
+        line_start=start_line,
+        line_end=end_line,
+        section=section,
+        cleaned_text=cleaned,
+        word_count=word_count,
+        tokens=tokens,
+    )
+
+
+# =============================================================================
+# Parse Cache
+# =============================================================================
+
+# Default on-disk cache location (repository root, git-ignored)
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[1] / ".tex_cache"
+
+# Bump when extraction or cleaning output changes to invalidate old entries
+PARSER_VERSION = 2
+
+# Paragraph indexes kept in the cache (one per recently analyzed file set)
+MAX_STORED_INDEXES = 8
+
+
+_PARSE_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS paragraphs (
+    path TEXT NOT NULL,
+    options TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    PRIMARY KEY (path, options)
+);
+CREATE TABLE IF NOT EXISTS paragraph_index (
+    fingerprint TEXT PRIMARY KEY,
+    vocab TEXT NOT NULL,
+    offsets BLOB NOT NULL,
+    data BLOB NOT NULL
+);
+"""
+
+
+def _remove_database(db_path: Path) -> None:
+    """Delete a database file with its journals, so none is replayed later."""
+    for suffix in ("", "-journal", "-wal", "-shm"):
+        Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+
+
+def open_database(
+    db_path: str | Path,
+    schema: str,
+    rebuild: bool = False,
+    recreate: bool = True,
+) -> sqlite3.Connection:
+    """
+    Connect to an SQLite database and create its tables.
+
+    A file that is not a usable SQLite database (damaged, truncated, or
+    something else entirely) raises ``sqlite3.DatabaseError`` on the first
+    statement. With ``recreate``, such a file is deleted and created again.
+    Operational errors (a locked file, a missing SQLite feature) are
+    re-raised as they are, since deleting the file would not fix them.
+
+    Args:
+        db_path: SQLite database file.
+        schema: SQL script creating the tables (``IF NOT EXISTS``).
+        rebuild: If True, delete any existing file first.
+        recreate: If True, replace a file that is not a usable database.
+
+    Returns:
+        An open connection with the schema in place.
+
+    Raises:
+        sqlite3.DatabaseError: If the database cannot be opened or created.
+        OSError: If the existing file cannot be deleted.
+    """
+    db_path = Path(db_path)
+    if rebuild:
+        _remove_database(db_path)
+    conn = sqlite3.connect(str(db_path))
+    try:
+        conn.executescript(schema)
+        return conn
+    except sqlite3.OperationalError:
+        conn.close()
+        raise
+    except sqlite3.DatabaseError:
+        conn.close()
+        if not recreate:
+            raise
+
+    _remove_database(db_path)
+    conn = sqlite3.connect(str(db_path))
+    try:
+        conn.executescript(schema)
+    except sqlite3.DatabaseError:
+        conn.close()
+        raise
+    return conn
+
+
+@dataclass
+class CacheStats:
+    """
+    Hit/miss counters for a ParseCache.
+
+    Attributes:
+        hits: Files served from the cache.
+        misses: Files parsed because no valid entry existed.
+        bytes_read: Payload bytes loaded from the cache.
+        bytes_written: Payload bytes stored in the cache.
+    """
+    hits: int = 0
+    misses: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+
+    def summary(self) -> str:
+        """Return a one-line human-readable summary."""
+        return (
+            f"{self.hits} hits, {self.misses} misses, "
+            f"{_format_bytes(self.bytes_read)} read, "
+            f"{_format_bytes(self.bytes_written)} written"
+        )
+
+
+class ParseCache:
+    """
+    Persistent SQLite cache of extracted paragraphs.
+
+    Entries are keyed by file path and extraction options (excluded
+    environments, min_words, parser version). An entry is reused when the
+    file's mtime and size are unchanged, or when its content hash still
+    matches after a touch; otherwise the file is re-parsed with
+    :func:`extract_paragraphs_from_tex` and the entry is replaced. A cache
+    file that is not a usable database is deleted and created again.
+
+    Args:
+        cache_dir: Directory holding ``paragraphs.sqlite``.
+        rebuild: If True, discard all existing entries first.
+
+    Example:
+        >>> with ParseCache() as cache:
+        ...     paragraphs = cache.extract("chapter.tex", min_words=10)
+        ...     print(cache.stats.summary())
+    """
+
+    def __init__(self, cache_dir: str | Path = DEFAULT_CACHE_DIR, rebuild: bool = False):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.stats = CacheStats()
+        self._pending: Dict[Tuple[str, str], Tuple[int, int, str]] = {}
+        self._conn = open_database(
+            self.cache_dir / "paragraphs.sqlite", _PARSE_CACHE_SCHEMA, rebuild=rebuild
+        )
+
+    @classmethod
+    def open(
+        cls, cache_dir: str | Path = DEFAULT_CACHE_DIR, rebuild: bool = False
+    ) -> Optional["ParseCache"]:
+        """
+        Open the cache, or warn on stderr and return None if it is unusable.
+
+        A damaged cache file is recreated by the constructor; this only
+        gives up when that fails too (e.g. a read-only cache directory), so
+        callers can carry on parsing without a cache.
+        """
+        try:
+            return cls(cache_dir, rebuild=rebuild)
+        except (sqlite3.DatabaseError, OSError) as e:
+            print(f"Warning: parse cache disabled ({e})", file=sys.stderr)
+            return None
+
+    def __enter__(self) -> "ParseCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Commit pending writes and close the database."""
+        self._conn.commit()
+        self._conn.close()
+
+    def extract(
+        self,
+        file_path: str | Path,
+        excluded_envs: Optional[frozenset[str]] = None,
+        min_words: int = 10,
+    ) -> List[Paragraph]:
+        """
+        Cached equivalent of :func:`extract_paragraphs_from_tex`.
+
+        Args:
+            file_path: Path to the LaTeX file.
+            excluded_envs: Set of environment names to skip.
+            min_words: Minimum word count to include a paragraph.
+
+        Returns:
+            List of Paragraph objects, ordered by appearance in the file.
+        """
+        paragraphs = self.get(file_path, excluded_envs, min_words)
+        if paragraphs is None:
+            paragraphs = extract_paragraphs_from_tex(file_path, excluded_envs, min_words)
+            self.put(file_path, paragraphs, excluded_envs, min_words)
+        return paragraphs
+
+    @profiled("cache")
+    def get(
+        self,
+        file_path: str | Path,
+        excluded_envs: Optional[frozenset[str]] = None,
+        min_words: int = 10,
+    ) -> Optional[List[Paragraph]]:
+        """
+        Look up cached paragraphs for a file.
+
+        Returns:
+            The cached paragraphs, or None on a miss. After a miss, call
+            :meth:`put` with the freshly extracted paragraphs.
+        """
+        file_path = Path(file_path)
+        key, options = self._key(file_path, excluded_envs, min_words)
+
+        source = load_source(file_path)
+        row = self._conn.execute(
+            "SELECT mtime_ns, size, content_hash, payload FROM paragraphs"
+            " WHERE path = ? AND options = ?",
+            (key, options),
+        ).fetchone()
+
+        # Fast path: file untouched since it was cached
+        if row and row[0] == source.mtime_ns and row[1] == source.size:
+            return self._load(row[3], file_path)
+
+        # Touched but unchanged: refresh the stat fields only
+        if row and row[2] == source.content_hash:
+            self._conn.execute(
+                "UPDATE paragraphs SET mtime_ns = ?, size = ? WHERE path = ? AND options = ?",
+                (source.mtime_ns, source.size, key, options),
+            )
+            return self._load(row[3], file_path)
+
+        # Remember what was hashed, so put() stores the version we parse
+        self.stats.misses += 1
+        self._pending[(key, options)] = (source.mtime_ns, source.size, source.content_hash)
+        return None
+
+    @profiled("cache")
+    def put(
+        self,
+        file_path: str | Path,
+        paragraphs: List[Paragraph],
+        excluded_envs: Optional[frozenset[str]] = None,
+        min_words: int = 10,
+    ) -> None:
+        """Store freshly extracted paragraphs for a file."""
+        file_path = Path(file_path)
+        key, options = self._key(file_path, excluded_envs, min_words)
+
+        pending = self._pending.pop((key, options), None)
+        if pending is None:
+            source = load_source(file_path)
+            pending = (source.mtime_ns, source.size, source.content_hash)
+
+        payload = json.dumps([
+            [p.text, p.line_start, p.line_end, p.section, p.cleaned_text, p.word_count]
+            for p in paragraphs
+        ]).encode("utf-8")
+        self.stats.bytes_written += len(payload)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO paragraphs VALUES (?, ?, ?, ?, ?, ?)",
+            (key, options, *pending, payload),
+        )
+
+    def get_index(
+        self,
+        fingerprint: str,
+    ) -> Optional[Tuple[List[str], memoryview, memoryview]]:
+        """
+        Look up a stored ParagraphIndex by paragraph fingerprint.
+
+        Returns:
+            (vocab, offsets, data) with the arrays as zero-copy uint32 views,
+            or None if no index is stored for this fingerprint.
+        """
+        row = self._conn.execute(
+            "SELECT vocab, offsets, data FROM paragraph_index WHERE fingerprint = ?",
+            (fingerprint,),
+        ).fetchone()
+        if row is None:
+            return None
+        self.stats.bytes_read += len(row[1]) + len(row[2])
+        return json.loads(row[0]), memoryview(row[1]).cast("I"), memoryview(row[2]).cast("I")
+
+    def put_index(
+        self,
+        fingerprint: str,
+        vocab: List[str],
+        offsets: array,
+        data: array,
+    ) -> None:
+        """Store a ParagraphIndex, keeping only the most recent few."""
+        payload = (json.dumps(vocab), offsets.tobytes(), data.tobytes())
+        self.stats.bytes_written += sum(len(p) for p in payload)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO paragraph_index VALUES (?, ?, ?, ?)",
+            (fingerprint, *payload),
+        )
+        self._conn.execute(
+            "DELETE FROM paragraph_index WHERE rowid NOT IN"
+            " (SELECT rowid FROM paragraph_index ORDER BY rowid DESC LIMIT ?)",
+            (MAX_STORED_INDEXES,),
+        )
+
+    @staticmethod
+    def _key(
+        file_path: Path,
+        excluded_envs: Optional[frozenset[str]],
+        min_words: int,
+    ) -> Tuple[str, str]:
+        """Return the (path, options) primary key for a lookup."""
+        excluded_envs = excluded_envs or DEFAULT_EXCLUDED_ENVIRONMENTS
+        options = f"v{PARSER_VERSION}|{min_words}|{','.join(sorted(excluded_envs))}"
+        return str(file_path.resolve()), options
+
+    def _load(self, payload: bytes, file_path: Path) -> List[Paragraph]:
+        """Rebuild Paragraph objects from a cached payload."""
+        self.stats.hits += 1
+        self.stats.bytes_read += len(payload)
+        source_file, source_path = file_path.name, str(file_path)
+        return [
+            Paragraph(
+                text=text,
+                source_file=source_file,
+                source_path=source_path,
+                line_start=line_start,
+                line_end=line_end,
+                section=section,
+                cleaned_text=cleaned_text,
+                word_count=word_count,
+            )
+            for text, line_start, line_end, section, cleaned_text, word_count
+            in json.loads(payload)
+        ]
+
+
+def _format_bytes(n: int) -> str:
+    """Format a byte count as B/KB/MB."""
+    if n < 1024:
+        return f"{n} B"
+    if n < 1024 * 1024:
+        return f"{n / 1024:.1f} KB"
+    return f"{n / (1024 * 1024):.1f} MB"
+
+
+# =============================================================================
+# Paragraph Index
+# =============================================================================
+
+# Index tokens: maximal runs of regex word characters, so any word-character
+# literal matched by a pattern lies inside exactly one index token
+_INDEX_TOKEN_RE = re.compile(r"\w+")
+
+# Bump when index tokenization or layout changes to invalidate stored indexes
+PARAGRAPH_INDEX_VERSION = 2
+
+# Characters that re.IGNORECASE equates but that uppercase to several
+# characters (so the single-character rule in _fold_char cannot pair them)
+_CASE_MULTI = {"\u1fd3": "\u0390", "\u1fe3": "\u03b0", "\ufb06": "\ufb05"}
+
+# A required literal in a pattern: (case-folded text, left-bounded, right-bounded)
+Piece = Tuple[str, bool, bool]
+
+
+@lru_cache(maxsize=None)
+def _fold_char(c: str) -> str:
+    """Map a character to one representative of its re.IGNORECASE class."""
+    # Characters sharing an uppercase form match each other (ı, ſ, ς, ϐ, ...);
+    # [0] takes the simple lowercase of U+0130, which lowercases to two
+    upper = c.upper()
+    if len(upper) == 1:
+        return upper.lower()[0]
+    return _CASE_MULTI.get(c, c).lower()[0]
+
+
+def _fold(text: str) -> str:
+    """
+    Case-fold text character by character, the way re.IGNORECASE compares.
+
+    Unlike ``str.lower()`` or ``str.casefold()``, this never changes the
+    length or depends on context (final sigma), so a pattern literal that
+    matches inside a token also occurs inside the folded token.
+    """
+    if text.isascii():
+        return text.lower()
+    return "".join(map(_fold_char, text))
+
+
+class ParagraphIndex:
+    """
+    Positional inverted index over a list of paragraphs.
+
+    Maps each case-folded word token to its postings: ``(paragraph id,
+    token position)`` pairs, stored interleaved in one flat ``array('I')``
+    with per-token offsets. Paragraph ids are indexes into ``paragraphs``.
+
+    :meth:`search` answers regex patterns by first deriving the literal words
+    every match must contain (and which of them must be adjacent), then
+    intersecting posting lists; the regex itself only runs on the remaining
+    candidate paragraphs. Single-word patterns are answered from the index
+    alone. Tokens and pattern literals are folded the way ``re.IGNORECASE``
+    compares characters (see :func:`_fold`), so results are identical to
+    running ``re.search`` on every paragraph's ``cleaned_text``.
+
+    Args:
+        paragraphs: The indexed paragraphs.
+        vocab: Index tokens, in first-occurrence order.
+        offsets: ``offsets[i]:offsets[i + 1]`` is token i's slice of ``data``.
+        data: Interleaved (paragraph id, position) postings.
+
+    Example:
+        >>> index = ParagraphIndex.build(paragraphs)
+        >>> [paragraphs[i].location for i in index.search(r"three\\s+pillars")]
+    """
+
+    def __init__(
+        self,
+        paragraphs: Sequence[Paragraph],
+        vocab: List[str],
+        offsets: Sequence[int],
+        data: Sequence[int],
+    ):
+        self.paragraphs = paragraphs
+        self.vocab = vocab
+        self.index = {token: i for i, token in enumerate(vocab)}
+        self.offsets = offsets
+        self.data = data
+
+    @classmethod
+    def build(cls, paragraphs: Sequence[Paragraph]) -> "ParagraphIndex":
+        """Tokenize paragraphs and build their postings."""
+        postings: Dict[str, array] = {}
+        for pid, para in enumerate(paragraphs):
+            # Fold per token: lowercasing first can split tokens (U+0130)
+            for pos, token in enumerate(map(_fold, _INDEX_TOKEN_RE.findall(para.cleaned_text))):
+                entry = postings.get(token)
+                if entry is None:
+                    entry = postings[token] = array("I")
+                entry.append(pid)
+                entry.append(pos)
+
+        offsets = array("I", [0])
+        data = array("I")
+        for entry in postings.values():
+            data.extend(entry)
+            offsets.append(len(data))
+        return cls(paragraphs, list(postings), offsets, data)
+
+    @classmethod
+    @profiled("index")
+    def load_or_build(
+        cls,
+        paragraphs: Sequence[Paragraph],
+        cache: Optional[ParseCache] = None,
+    ) -> "ParagraphIndex":
+        """
+        Load the index for these paragraphs from a ParseCache, or build it.
+
+        Stored indexes are keyed by a fingerprint of the paragraphs' locations
+        and cleaned text, so any change to the paragraph set rebuilds.
+        """
+        if cache is None:
+            return cls.build(paragraphs)
+
+        fingerprint = cls.fingerprint(paragraphs)
+        stored = cache.get_index(fingerprint)
+        if stored is not None:
+            vocab, offsets, data = stored
+            return cls(paragraphs, vocab, offsets, data)
+
+        index = cls.build(paragraphs)
+        cache.put_index(fingerprint, index.vocab, index.offsets, index.data)
+        return index
+
+    @staticmethod
+    def fingerprint(paragraphs: Sequence[Paragraph]) -> str:
+        """Content hash identifying a paragraph list."""
+        digest = hashlib.sha256(f"v{PARAGRAPH_INDEX_VERSION}".encode())
+        for para in paragraphs:
+            digest.update(f"\0{para.source_path}:{para.line_start}\0".encode("utf-8"))
+            digest.update(para.cleaned_text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def postings(self, token: str) -> Sequence[int]:
+        """Interleaved (paragraph id, position) postings of one token."""
+        i = self.index.get(token)
+        if i is None:
+            return ()
+        return self.data[self.offsets[i]:self.offsets[i + 1]]
+
+    def narrows(self, pattern: str) -> bool:
+        """
+        True if :meth:`search` can narrow a pattern's candidates from the
+        postings, rather than running the regex on every paragraph.
+        """
+        runs = _pattern_pieces(pattern)
+        return bool(runs and _drop_weak_pieces(runs))
+
+    def search(self, pattern: str, flags: int = re.IGNORECASE) -> List[int]:
+        """
+        Ids of paragraphs whose cleaned text matches a regex pattern.
+
+        Args:
+            pattern: Regular expression, as passed to ``re.search``.
+            flags: Regex flags. Without ``re.IGNORECASE`` the index still
+                narrows candidates (it is case-folded), and the regex decides.
+
+        Returns:
+            Matching paragraph ids, in ascending order.
+        """
+        runs = _pattern_pieces(pattern)
+        regex = re.compile(pattern, flags)
+        if runs is not None:
+            runs = _drop_weak_pieces(runs)
+        if not runs:
+            candidates = range(len(self.paragraphs))
+        else:
+            candidates = None
+            for run in runs:
+                pids = self._run_candidates(run)
+                candidates = pids if candidates is None else candidates & pids
+                if not candidates:
+                    return []
+            candidates = sorted(candidates)
+
+            # A lone word (optionally \b-delimited) needs no regex check
+            if (
+                flags & (re.IGNORECASE | re.ASCII) == re.IGNORECASE
+                and len(runs) == 1
+                and len(runs[0]) == 1
+                and _is_plain_word(pattern, runs[0][0][0])
+            ):
+                return candidates
+
+        return [
+            pid for pid in candidates
+            if regex.search(self.paragraphs[pid].cleaned_text)
+        ]
+
+    def _run_candidates(self, run: List[Piece]) -> set:
+        """Paragraph ids containing a chain of adjacent pieces."""
+        # (pid, position) of the current chain end
+        ends = None
+        for text, left, right in run:
+            hits = set()
+            for token in self._matching_tokens(text, left, right):
+                postings = self.postings(token)
+                hits.update(zip(postings[::2], postings[1::2]))
+            if ends is None:
+                ends = hits
+            else:
+                ends = {(pid, pos + 1) for pid, pos in ends if (pid, pos + 1) in hits}
+            if not ends:
+                break
+        return {pid for pid, _ in ends}
+
+    def _matching_tokens(self, text: str, left: bool, right: bool) -> List[str]:
+        """Index tokens that can contain a piece, given its word boundaries."""
+        if left and right:
+            return [text] if text in self.index else []
+        if left:
+            return [t for t in self.vocab if t.startswith(text)]
+        if right:
+            return [t for t in self.vocab if t.endswith(text)]
+        return [t for t in self.vocab if text in t]
+
+
+def _drop_weak_pieces(runs: List[List[Piece]]) -> List[List[Piece]]:
+    """
+    Remove pieces too short to narrow the search (e.g. the "e" in "e.g."
+    matches every token ending in e), splitting their runs around them.
+    """
+    kept: List[List[Piece]] = []
+    for run in runs:
+        current: List[Piece] = []
+        for piece in run:
+            text, left, right = piece
+            if len(text) < 3 and not (left and right):
+                if current:
+                    kept.append(current)
+                current = []
+            else:
+                current.append(piece)
+        if current:
+            kept.append(current)
+    return kept
+
+
+def _is_plain_word(pattern: str, word: str) -> bool:
+    """True if a pattern is exactly ``word`` or ``\\bword\\b`` (case-folded)."""
+    if len(pattern) > 4 and pattern.startswith("\\b") and pattern.endswith("\\b"):
+        pattern = pattern[2:-2]
+    return _INDEX_TOKEN_RE.fullmatch(pattern) is not None and _fold(pattern) == word
+
+
+def _pattern_pieces(pattern: str) -> Optional[List[List[Piece]]]:
+    """
+    Derive the literal words every match of a regex must contain.
+
+    The pattern is split into atoms; runs of word characters that occur
+    exactly once become pieces, noting whether a word boundary is certain on
+    each side. Pieces separated only by mandatory non-word characters (such
+    as ``\\s+`` or ``", "``) must be adjacent index tokens and are chained
+    into one run. Groups, classes and optional elements impose no
+    requirement, which keeps the result a necessary condition.
+
+    Returns:
+        Runs of chained pieces (possibly empty), or None when the pattern
+        cannot be analyzed (top-level alternation, inline flags, unusual
+        escapes), in which case every paragraph is a candidate.
+    """
+    atoms = _regex_atoms(pattern)
+    if atoms is None:
+        return None
+
+    runs: List[List[Piece]] = []
+    run: List[Piece] = []
+    word = ""
+    word_left = False
+    gap_has_sep = False
+
+    def flush(next_kind: str) -> None:
+        nonlocal word, run
+        if word:
+            run.append((word, word_left, next_kind in ("sep", "boundary")))
+            word = ""
+
+    previous = "boundary_none"
+    for kind, value in atoms:
+        if kind == "word":
+            if not word:
+                word_left = previous in ("sep", "boundary")
+                # Adjacent to the previous piece only across non-word chars
+                if run and not (previous in ("sep", "boundary") and gap_has_sep):
+                    runs.append(run)
+                    run = []
+                gap_has_sep = False
+            word += value
+        else:
+            flush(kind)
+            if kind == "sep":
+                gap_has_sep = True
+            elif kind == "other" and run:
+                runs.append(run)
+                run = []
+        previous = kind
+    flush("end")
+    if run:
+        runs.append(run)
+    return runs
+
+
+def _regex_atoms(pattern: str) -> Optional[List[Tuple[str, str]]]:
+    """
+    Split a regex into (kind, value) atoms for :func:`_pattern_pieces`.
+
+    Kinds: "word" (one literal word character, case-folded), "sep" (exactly
+    one or more guaranteed non-word characters), "boundary" (``\\b``, ``^``,
+    ``$``) and "other" (anything else, including optional elements).
+    """
+    atoms: List[Tuple[str, str]] = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "|":
+            return None
+        if c == "(":
+            if re.match(r"\(\?[aiLmsux-]+\)", pattern[i:]):
+                return None
+            end = _group_end(pattern, i)
+            if end is None:
+                return None
+            atom, i = ("other", ""), end
+        elif c == "[":
+            end = _class_end(pattern, i)
+            if end is None:
+                return None
+            atom, i = ("other", ""), end
+        elif c == "\\":
+            if i + 1 >= n:
+                return None
+            e = pattern[i + 1]
+            i += 2
+            if e in "bAZ":
+                atom = ("boundary", "")
+            elif e in "sWntrfv":
+                atom = ("sep", "")
+            elif e in "BwdDS" or e.isdigit():
+                atom = ("other", "")
+            elif e.isalnum() or e == "_":
+                # \x, \u, \N and other escapes: too rare to be worth parsing
+                return None
+            else:
+                atom = ("sep", "")
+        elif c in "^$":
+            atom, i = ("boundary", ""), i + 1
+        elif c == ".":
+            atom, i = ("other", ""), i + 1
+        elif c in "?*+" or (c == "{" and re.match(r"\{\d*,?\d*\}", pattern[i:])):
+            return None  # quantifier with nothing to repeat
+        elif c.isalnum() or c == "_":
+            atom, i = ("word", _fold_char(c)), i + 1
+        else:
+            atom, i = ("sep", ""), i + 1
+
+        # Quantifier on the atom just read
+        quantifier = re.match(r"[?*+]|\{(\d*)(,?)(\d*)\}", pattern[i:])
+        if quantifier:
+            i += quantifier.end()
+            if i < n and pattern[i] in "?+":
+                i += 1  # lazy / possessive
+            q = quantifier.group(0)
+            minimum = 1 if q == "+" else 0 if q in "?*" else int(quantifier.group(1) or 0)
+            if minimum == 0 or atom[0] == "boundary":
+                atom = ("other", "")
+            elif atom[0] == "word":
+                # One copy is certain; further copies continue the same token
+                atoms.append(atom)
+                atom = ("other", "")
+        atoms.append(atom)
+    return atoms
+
+
+def _group_end(pattern: str, start: int) -> Optional[int]:
+    """Index just past the group opened at ``start``."""
+    depth = 0
+    i = start
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\":
+            i += 2
+            continue
+        if c == "[":
+            end = _class_end(pattern, i)
+            if end is None:
+                return None
+            i = end
+            continue
+        if c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return None
+
+
+def _class_end(pattern: str, start: int) -> Optional[int]:
+    """Index just past the character class opened at ``start``."""
+    i = start + 1
+    if i < len(pattern) and pattern[i] == "^":
+        i += 1
+    if i < len(pattern) and pattern[i] == "]":
+        i += 1  # a leading ] is literal
+    while i < len(pattern):
+        if pattern[i] == "\\":
+            i += 2
+            continue
+        if pattern[i] == "]":
+            return i + 1
+        i += 1
+    return None
+
+
+# =============================================================================
+# Multi-Pattern Matching
+# =============================================================================
+
+@dataclass
+class MatchStats:
+    """
+    Work done by a PatternMatcher.
+
+    Attributes:
+        hits: Texts matched, per pattern name.
+        seconds: Time spent per engine ("phrases", "combined", or the
+            name of a pattern that runs on its own or through an index).
+        texts: Texts scanned.
+        indexed: Patterns answered from a ParagraphIndex.
+    """
+    hits: Counter = field(default_factory=Counter)
+    seconds: Counter = field(default_factory=Counter)
+    texts: int = 0
+    indexed: int = 0
+
+
+class PhraseAutomaton:
+    """
+    Aho–Corasick automaton over word tokens for many literal phrases.
+
+    Phrases match case-insensitively as whole words: the trie is built on
+    each phrase's word tokens, so one left-to-right walk over a text's
+    tokens finds every phrase, and each candidate is then checked against
+    the exact phrase text (punctuation and spacing included).
+
+    Args:
+        phrases: Pattern name -> phrase. Phrases need at least one word
+            character.
+
+    Example:
+        >>> automaton = PhraseAutomaton({"sota": "state-of-the-art"})
+        >>> automaton.find("A State-of-the-Art model")
+        {'sota'}
+    """
+
+    def __init__(self, phrases: Dict[str, str]):
+        # Per node: word -> child, failure link, and (name, phrase) outputs
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[str, int, str, str, str]]] = [[]]
+
+        for name, phrase in phrases.items():
+            phrase = " ".join(phrase.lower().split())
+            words = _INDEX_TOKEN_RE.findall(phrase)
+            if not words:
+                raise ValueError(f"Phrase {name!r} has no word characters: {phrase!r}")
+            first = _INDEX_TOKEN_RE.search(phrase).start()
+            last = max(m.end() for m in _INDEX_TOKEN_RE.finditer(phrase))
+            node = 0
+            for word in words:
+                child = self._goto[node].get(word)
+                if child is None:
+                    child = self._goto[node][word] = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = child
+            self._out[node].append(
+                (name, len(words), phrase[:first], phrase[first:last], phrase[last:])
+            )
+
+        # Breadth-first failure links; outputs inherit along them
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for word, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and word not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(word, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find(self, text: str) -> set:
+        """Names of the phrases occurring in a text."""
+        text = text.lower()
+        found = set()
+        goto, fail, out = self._goto, self._fail, self._out
+        spans: List[Tuple[int, int]] = []
+        node = 0
+        for match in _INDEX_TOKEN_RE.finditer(text):
+            word = match.group()
+            spans.append(match.span())
+            while node and word not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(word, 0)
+            for name, length, lead, core, trail in out[node]:
+                if name in found:
+                    continue
+                start = spans[-length][0]
+                end = spans[-1][1]
+                if (
+                    text[start:end] == core
+                    and start >= len(lead)
+                    and text.startswith(lead, start - len(lead))
+                    and text.startswith(trail, end)
+                ):
+                    found.add(name)
+        return found
+
+
+class PatternMatcher:
+    """
+    Find which of many patterns occur in a text, in one pass where possible.
+
+    Literal phrases go through a :class:`PhraseAutomaton`; regexes are
+    merged into a single alternation of lookaheads, one named group per
+    pattern, and scanned with ``finditer``. At each position the first
+    matching alternative wins, so a pattern can only be hidden by an
+    earlier one matching at the same place; the scan is repeated for the
+    later, still-unmatched patterns until it finds nothing new (usually
+    once). Regexes that cannot be merged (backreferences, named groups,
+    inline global flags) run on their own. :meth:`search` can answer
+    regexes from a :class:`ParagraphIndex` instead (see there).
+
+    Args:
+        regexes: Pattern name -> regular expression.
+        phrases: Pattern name -> literal phrase (see PhraseAutomaton).
+        flags: Regex flags (case-insensitive by default).
+
+    Attributes:
+        names: All pattern names, regexes first.
+        stats: Hit counts and per-engine timing (see MatchStats).
+
+    Example:
+        >>> matcher = PatternMatcher({"three pillars": r"three\\s+pillars"},
+        ...                          {"delve": "delve into"})
+        >>> matcher.find("We delve into the three  pillars.")
+        {'three pillars', 'delve'}
+    """
+
+    def __init__(
+        self,
+        regexes: Optional[Dict[str, str]] = None,
+        phrases: Optional[Dict[str, str]] = None,
+        flags: int = re.IGNORECASE,
+    ):
+        regexes = regexes or {}
+        self.flags = flags
+        self.stats = MatchStats()
+        self.automaton = PhraseAutomaton(phrases) if phrases else None
+
+        # Validate every regex up front, then split mergeable from isolated
+        self._combined: List[Tuple[str, str]] = []
+        self._isolated: List[Tuple[str, re.Pattern]] = []
+        for name, pattern in regexes.items():
+            try:
+                compiled = re.compile(pattern, flags)
+            except re.error as e:
+                raise ValueError(f"Invalid regex for {name!r}: {e}") from None
+            if re.search(r"\\[1-9]|\(\?P[<=]|^\(\?[aiLmsux]+\)", pattern):
+                self._isolated.append((name, compiled))
+            else:
+                self._combined.append((name, pattern))
+        self.names = list(regexes) + list(phrases or {})
+        self._regex_cache: Dict[Tuple[int, ...], re.Pattern] = {}
+
+    def find(self, text: str) -> set:
+        """Names of the patterns occurring in a text."""
+        self.stats.texts += 1
+        return self._scan(text, tuple(range(len(self._combined))), self._isolated)
+
+    def search(
+        self,
+        texts: Sequence[str],
+        index: Optional["ParagraphIndex"] = None,
+    ) -> Dict[str, List[int]]:
+        """
+        Positions of the texts each pattern occurs in.
+
+        With a ParagraphIndex built over the same texts, every regex whose
+        required words the index can look up (see
+        :meth:`ParagraphIndex.narrows`) is answered by
+        :meth:`ParagraphIndex.search`, so it only runs on candidate texts.
+        Phrases and the remaining regexes take the one-pass :meth:`find`
+        scan. Results are the same either way.
+
+        Returns:
+            Dict mapping every pattern name to ascending text positions.
+        """
+        stats = self.stats
+        stats.texts += len(texts)
+        results: Dict[str, List[int]] = {name: [] for name in self.names}
+        combined = tuple(range(len(self._combined)))
+        isolated = self._isolated
+
+        if index is not None:
+            sources = dict(self._combined)
+            sources.update((name, regex.pattern) for name, regex in isolated)
+            indexed = {name: p for name, p in sources.items() if index.narrows(p)}
+            for name, pattern in indexed.items():
+                start = time.perf_counter()
+                results[name] = index.search(pattern, self.flags)
+                stats.seconds[name] += time.perf_counter() - start
+                stats.hits[name] += len(results[name])
+            stats.indexed += len(indexed)
+            combined = tuple(i for i in combined if self._combined[i][0] not in indexed)
+            isolated = [(name, regex) for name, regex in isolated if name not in indexed]
+
+        if self.automaton or combined or isolated:
+            for i, text in enumerate(texts):
+                for name in self._scan(text, combined, isolated):
+                    results[name].append(i)
+        return results
+
+    def _scan(
+        self,
+        text: str,
+        combined: Tuple[int, ...],
+        isolated: List[Tuple[str, re.Pattern]],
+    ) -> set:
+        """Names of the given patterns (and all phrases) occurring in a text."""
+        stats = self.stats
+        found = set()
+
+        if self.automaton:
+            start = time.perf_counter()
+            found |= self.automaton.find(text)
+            stats.seconds["phrases"] += time.perf_counter() - start
+
+        if combined:
+            start = time.perf_counter()
+            remaining = combined
+            while remaining:
+                new = {
+                    int(m.lastgroup[2:])
+                    for m in self._merged(remaining).finditer(text)
+                }
+                if not new:
+                    break
+                found.update(self._combined[i][0] for i in new)
+                # Only patterns after the first hit can have been shadowed
+                first = min(new)
+                remaining = tuple(i for i in remaining if i > first and i not in new)
+            stats.seconds["combined"] += time.perf_counter() - start
+
+        for name, regex in isolated:
+            start = time.perf_counter()
+            if regex.search(text):
+                found.add(name)
+            stats.seconds[name] += time.perf_counter() - start
+
+        stats.hits.update(found)
+        return found
+
+    def _merged(self, indexes: Tuple[int, ...]) -> re.Pattern:
+        """The lookahead alternation of some mergeable patterns (cached)."""
+        regex = self._regex_cache.get(indexes)
+        if regex is None:
+            regex = re.compile(
+                "|".join(f"(?=(?P<_p{i}>{self._combined[i][1]}))" for i in indexes),
+                self.flags,
+            )
+            self._regex_cache[indexes] = regex
+        return regex
+
+
+# =============================================================================
+# Parallel Extraction
+# =============================================================================
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def parallel_map(
+    func: Callable[[T], R],
+    items: Sequence[T],
+    jobs: Optional[int] = None,
+    on_done: Optional[Callable[[T], None]] = None,
+) -> List[R]:
+    """
+    Apply a function to each item in a process pool, preserving input order.
+
+    Runs serially when only one job is requested or there is at most one item,
+    which avoids process start-up costs for single-file invocations.
+
+    Args:
+        func: Picklable callable (a module-level function or a partial of one).
+        items: Inputs, typically file paths.
+        jobs: Worker processes. None or 0 means one per CPU core.
+        on_done: Called with each item as its result arrives (in completion
+            order), e.g. to advance a progress bar.
+
+    Returns:
+        Results in the same order as ``items``.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    jobs = min(jobs, len(items))
+
+    if jobs <= 1:
+        results = []
+        for item in items:
+            results.append(func(item))
+            if on_done:
+                on_done(item)
+        return results
+
+    # Deferred: the process pool machinery (multiprocessing) is the single
+    # largest import here, and single-file runs never need it
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    ordered: List[Optional[R]] = [None] * len(items)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(func, item): i for i, item in enumerate(items)}
+        for future in as_completed(futures):
+            i = futures[future]
+            ordered[i] = future.result()
+            if on_done:
+                on_done(items[i])
+    return ordered
+
+
+@profiled("extract")
+def extract_paragraphs_from_files(
+    files: Sequence[Path],
+    excluded_envs: Optional[frozenset[str]] = None,
+    min_words: int = 10,
+    jobs: Optional[int] = None,
+    cache: Optional[ParseCache] = None,
+    on_file_done: Optional[Callable[[Path], None]] = None,
+) -> List[Paragraph]:
+    """
+    Extract paragraphs from many files in parallel.
+
+    Cache hits are served in-process; only cache misses are sent to the
+    worker pool. Paragraphs are returned in file order regardless of the
+    order in which workers finish.
+
+    Args:
+        files: LaTeX files to parse.
+        excluded_envs: Set of environment names to skip.
+        min_words: Minimum word count to include a paragraph.
+        jobs: Worker processes. None or 0 means one per CPU core.
+        cache: Optional ParseCache to read from and populate.
+        on_file_done: Called with each file path once it has been handled.
+
+    Returns:
+        Paragraphs of all files, concatenated in file order.
+
+    Example:
+        >>> files = find_tex_files("chapters/")
+        >>> paragraphs = extract_paragraphs_from_files(files, jobs=4)
+    """
+    per_file: List[Optional[List[Paragraph]]] = [None] * len(files)
+    misses: List[int] = []
+
+    for i, file_path in enumerate(files):
+        cached = cache.get(file_path, excluded_envs, min_words) if cache else None
+        if cached is None:
+            misses.append(i)
+        else:
+            per_file[i] = cached
+            if on_file_done:
+                on_file_done(file_path)
+
+    extract = partial(
+        extract_paragraphs_from_tex,
+        excluded_envs=excluded_envs,
+        min_words=min_words,
+    )
+    results = parallel_map(
+        extract, [files[i] for i in misses], jobs=jobs, on_done=on_file_done
+    )
+    for i, paragraphs in zip(misses, results):
+        per_file[i] = paragraphs
+        if cache:
+            cache.put(files[i], paragraphs, excluded_envs, min_words)
+
+    return [p for paragraphs in per_file for p in paragraphs]
+
+
+# =============================================================================
+# Chunk Creation
+# =============================================================================
+
+def create_chunks(
+    paragraphs: Iterable[Paragraph],
+    window_size: int = 3,
+    overlap: int = 1,
+) -> List[Chunk]:
+    """
+    Create sliding window chunks from paragraphs.
+
+    Chunks provide context for analysis that benefits from seeing multiple
+    consecutive paragraphs together (e.g., detecting repetition across
+    adjacent paragraphs, analyzing flow and transitions). This is the
+    materialized form of :func:`iter_chunks`.
+
+    Args:
+        paragraphs: Paragraph objects (a list or any iterable).
+        window_size: Number of paragraphs per chunk.
+        overlap: Number of paragraphs shared between consecutive chunks.
+
+    Returns:
+        List of Chunk objects.
 
     Example:
         >>> paragraphs = extract_paragraphs_from_tex("chapter.tex")
         >>> chunks = create_chunks(paragraphs, window_size=3, overlap=1)
     """
-    if len(paragraphs) < window_size:
-        if paragraphs:
-            return [Chunk(paragraphs=paragraphs, chunk_id=0)]
-        return []
+    return list(iter_chunks(paragraphs, window_size, overlap))
 
-    chunks: List[Chunk] = []
-    step = window_size - overlap
 
-    for i in range(0, len(paragraphs) - window_size + 1, step):
-        chunk_paras = paragraphs[i:i + window_size]
-        chunks.append(Chunk(paragraphs=chunk_paras, chunk_id=len(chunks)))
+def iter_chunks(
+    paragraphs: Iterable[Paragraph],
+    window_size: int = 3,
+    overlap: int = 1,
+) -> Iterator[Chunk]:
+    """
+    Stream sliding window chunks from a paragraph iterator.
+
+    Only the current window (a bounded deque) is kept in memory, so it can
+    consume :func:`iter_paragraphs` directly and emit each chunk as soon as
+    its last paragraph arrives; memory is O(window_size) regardless of the
+    corpus size. A trailing window is added when the last step does not
+    reach the final paragraph.
+
+    Args:
+        paragraphs: Iterable of Paragraph objects.
+        window_size: Number of paragraphs per chunk.
+        overlap: Number of paragraphs shared between consecutive chunks.
+
+    Yields:
+        Chunk objects with sequential chunk_id values.
+    """
+    step = window_size - overlap
+    buffer: Deque[Paragraph] = deque(maxlen=window_size)
+    last_emitted: Optional[List[Paragraph]] = None
+    chunk_id = 0
+    seen = 0
+
+    for para in paragraphs:
+        buffer.append(para)
+        seen += 1
+        if seen >= window_size and (seen - window_size) % step == 0:
+            last_emitted = list(buffer)
+            yield Chunk(paragraphs=last_emitted, chunk_id=chunk_id)
+            chunk_id += 1
+
+    if seen < window_size:
+        # Fewer paragraphs than one window: a single short chunk
+        if buffer:
+            yield Chunk(paragraphs=list(buffer), chunk_id=0)
+        return
 
     # Ensure we capture trailing paragraphs not in last chunk
-    last_chunk_end = ((len(paragraphs) - window_size) // step) * step + window_size
-    if last_chunk_end < len(paragraphs):
-        remaining = paragraphs[-window_size:]
-        if not chunks or remaining != chunks[-1].paragraphs:
-            chunks.append(Chunk(paragraphs=remaining, chunk_id=len(chunks)))
+    remaining = list(buffer)
+    if remaining != last_emitted:
+        yield Chunk(paragraphs=remaining, chunk_id=chunk_id)
+
+
+class WordTokenEstimator:
+    """
+    Estimate LLM token counts from regex word counts.
+
+    Uses each paragraph's precomputed ``word_count`` (from
+    :func:`tokenize_regex`), so estimating is a multiplication rather than a
+    tokenizer run. Any ``Callable[[Paragraph], int]`` can be used in its
+    place, e.g. a wrapper around a real tokenizer.
+
+    Args:
+        tokens_per_word: Average tokens per word. English prose is around
+            1.3 tokens per word for common BPE vocabularies.
+
+    Example:
+        >>> estimate = WordTokenEstimator(tokens_per_word=1.3)
+        >>> estimate(paragraph)
+        78
+    """
 
-    return chunks
+    def __init__(self, tokens_per_word: float = 1.3):
+        self.tokens_per_word = tokens_per_word
+
+    def __call__(self, paragraph: Paragraph) -> int:
+        return math.ceil(paragraph.word_count * self.tokens_per_word)
+
+
+def iter_token_chunks(
+    paragraphs: Iterable[Paragraph],
+    max_tokens: Optional[int] = None,
+    target_tokens: Optional[int] = None,
+    overlap: int = 0,
+    estimator: Optional[Callable[[Paragraph], int]] = None,
+) -> Iterator[Chunk]:
+    """
+    Stream chunks packed greedily up to a token budget.
+
+    Consecutive paragraphs are added to the current chunk until the next one
+    would push it over ``max_tokens`` (a hard limit) or the chunk has reached
+    ``target_tokens`` (a soft limit: the paragraph that crosses it is kept).
+    A single paragraph larger than ``max_tokens`` becomes its own chunk.
+
+    Args:
+        paragraphs: Iterable of Paragraph objects.
+        max_tokens: Hard token budget per chunk.
+        target_tokens: Soft token target per chunk.
+        overlap: Paragraphs repeated from the end of the previous chunk at
+            the start of the next, as long as they fit the budget.
+        estimator: Token estimator; defaults to WordTokenEstimator().
+
+    Yields:
+        Chunk objects with ``estimated_tokens`` set.
+
+    Example:
+        >>> chunks = iter_token_chunks(iter_paragraphs(files), max_tokens=2000)
+    """
+    if max_tokens is None and target_tokens is None:
+        raise ValueError("Either max_tokens or target_tokens is required")
+
+    estimator = estimator or WordTokenEstimator()
+    current: List[Tuple[Paragraph, int]] = []
+    total = 0
+    chunk_id = 0
+    has_new = False  # Current chunk holds more than carried-over overlap
+
+    def start_next() -> None:
+        """Reset the window, carrying over up to `overlap` paragraphs."""
+        nonlocal current, total, has_new
+        keep = min(overlap, len(current) - 1) if overlap > 0 else 0
+        current = current[len(current) - keep:] if keep > 0 else []
+        total = sum(n for _, n in current)
+        has_new = False
+
+    for para in paragraphs:
+        n = estimator(para)
+
+        if max_tokens is not None and has_new and total + n > max_tokens:
+            yield Chunk([p for p, _ in current], chunk_id, total)
+            chunk_id += 1
+            start_next()
+
+        # Drop carried-over paragraphs that leave no room for this one
+        while max_tokens is not None and current and not has_new and total + n > max_tokens:
+            total -= current.pop(0)[1]
+
+        current.append((para, n))
+        total += n
+        has_new = True
+
+        if target_tokens is not None and total >= target_tokens:
+            yield Chunk([p for p, _ in current], chunk_id, total)
+            chunk_id += 1
+            start_next()
+
+    if has_new:
+        yield Chunk([p for p, _ in current], chunk_id, total)
+
+
+# =============================================================================
+# JSON Output
+# =============================================================================
+
+class JsonWriter:
+    """
+    Write JSON documents and JSON Lines records to a byte stream, one
+    record at a time.
+
+    A document's list is written item by item (see :meth:`write_document`),
+    so neither the full dict nor its serialized text is held in memory. The
+    stdlib encoder output is byte-identical to ``json.dumps(..., indent=2)``
+    for documents and ``json.dumps(...)`` for lines. With ``fast=True`` and
+    orjson installed, records are encoded by orjson instead: the same data,
+    but compact separators and UTF-8 rather than ``\\u`` escapes.
+
+    Args:
+        stream: Binary stream to write to (default: stdout's buffer).
+        fast: Use orjson when it is installed.
+
+    Example:
+        >>> writer = JsonWriter()
+        >>> writer.write_document({"summary": summary}, "chunks", (c.to_dict() for c in chunks))
+        >>> writer.flush()
+    """
+
+    def __init__(self, stream=None, fast: bool = False):
+        if stream is None:
+            sys.stdout.flush()
+            stream = sys.stdout.buffer
+        self.stream = stream
+        self.bytes_written = 0
+        self._orjson = optional_import("orjson") if fast else None
+
+    @property
+    def encoder(self) -> str:
+        """Name of the encoder in use."""
+        return "orjson" if self._orjson is not None else "json"
+
+    def dumps(self, obj, indent: bool = False) -> bytes:
+        """Encode one value (two-space indented when `indent` is set)."""
+        if self._orjson is not None:
+            return self._orjson.dumps(obj, option=self._orjson.OPT_INDENT_2 if indent else 0)
+        return json.dumps(obj, indent=2 if indent else None).encode("utf-8")
+
+    def write(self, data: bytes) -> None:
+        self.stream.write(data)
+        self.bytes_written += len(data)
+
+    def write_line(self, obj) -> None:
+        """Write one JSON Lines record."""
+        self.write(self.dumps(obj) + b"\n")
+
+    def write_document(self, head: Dict, key: str, items: Iterable) -> int:
+        """
+        Write ``{**head, key: [*items]}`` as an indented document.
+
+        Args:
+            head: Leading keys, encoded whole (e.g. a summary).
+            key: Key of the streamed list, written last.
+            items: JSON-serializable list entries, consumed one at a time.
+
+        Returns:
+            Number of items written.
+        """
+        # Nested values are indented by re-indenting their lines: encoded
+        # strings never contain a raw newline
+        self.write(b"{\n")
+        for name, value in head.items():
+            encoded = self.dumps(value, indent=True).replace(b"\n", b"\n  ")
+            self.write(b"  " + self.dumps(name) + b": " + encoded + b",\n")
+        self.write(b"  " + self.dumps(key) + b": ")
+        written = 0
+        for item in items:
+            self.write(b",\n    " if written else b"[\n    ")
+            self.write(self.dumps(item, indent=True).replace(b"\n", b"\n    "))
+            written += 1
+        self.write(b"\n  ]\n}\n" if written else b"[]\n}\n")
+        return written
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+# =============================================================================
+# Columnar Output
+# =============================================================================
+
+# Rows per Arrow record batch (and Parquet row group)
+COLUMNAR_BATCH_ROWS = 4096
+
+# Column kinds: "category" columns are dictionary-encoded strings
+_ARROW_KINDS = ("int", "string", "category")
+
+# Output formats written by ColumnarWriter
+COLUMNAR_FORMATS = ("parquet", "arrow")
+
+# Per-paragraph columns of the tex-* Parquet/Arrow exports (see paragraph_row)
+PARAGRAPH_COLUMNS = (
+    ("location", "string"),
+    ("source_file", "category"),
+    ("section", "category"),
+    ("line_start", "int"),
+    ("line_end", "int"),
+    ("word_count", "int"),
+    ("cleaned_text", "string"),
+)
+
+
+def paragraph_row(para: Paragraph) -> tuple:
+    """Values of PARAGRAPH_COLUMNS for one paragraph (location as path:line,
+    like the CSV outputs)."""
+    return (
+        f"{para.source_path}:{para.line_start}",
+        para.source_file,
+        para.section,
+        para.line_start,
+        para.line_end,
+        para.word_count,
+        para.cleaned_text,
+    )
+
+
+class ColumnarWriter:
+    """
+    Write rows as a Parquet file or an Arrow IPC file, in record batches.
+
+    Rows are buffered column by column and written every ``batch_rows``
+    rows, so memory stays bounded however many rows are streamed through.
+    "category" columns are dictionary-encoded with one dictionary that
+    grows across batches (written as dictionary deltas in Arrow files), so
+    a source file or section name is stored once. Needs pyarrow.
+
+    Args:
+        sink: Path or binary stream to write to.
+        format: "parquet" or "arrow".
+        columns: (name, kind) pairs; kind is "int", "string" or "category".
+        batch_rows: Rows per record batch.
+
+    Example:
+        >>> with ColumnarWriter(path, "parquet", [("location", "string"), ("word_count", "int")]) as out:
+        ...     for p in paragraphs:
+        ...         out.write_row((p.location, p.word_count))
+    """
+
+    def __init__(
+        self,
+        sink,
+        format: str,
+        columns: Sequence[Tuple[str, str]],
+        batch_rows: int = COLUMNAR_BATCH_ROWS,
+    ):
+        import pyarrow as pa
+
+        if format not in ("parquet", "arrow"):
+            raise ValueError(f"Unknown columnar format: {format!r}")
+        for name, kind in columns:
+            if kind not in _ARROW_KINDS:
+                raise ValueError(f"Unknown kind {kind!r} for column {name!r}")
+
+        self._pa = pa
+        self._kinds = [kind for _, kind in columns]
+        types = {
+            "int": pa.int32(),
+            "string": pa.string(),
+            "category": pa.dictionary(pa.int32(), pa.string()),
+        }
+        self.schema = pa.schema([(name, types[kind]) for name, kind in columns])
+        self.batch_rows = batch_rows
+        self.rows = 0
+        self._buffer: List[list] = [[] for _ in columns]
+        # Per category column: value -> index, and the values in index order
+        self._codes: List[Dict[str, int]] = [{} for _ in columns]
+        self._values: List[List[str]] = [[] for _ in columns]
+
+        if format == "parquet":
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(sink, self.schema)
+        else:
+            self._writer = pa.ipc.new_file(
+                sink, self.schema,
+                options=pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True),
+            )
+
+    def __enter__(self) -> "ColumnarWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def write_row(self, row: Sequence) -> None:
+        """Append one row (values in column order)."""
+        for column, kind, codes, values, value in zip(
+            self._buffer, self._kinds, self._codes, self._values, row
+        ):
+            if kind == "category":
+                code = codes.get(value)
+                if code is None:
+                    code = codes[value] = len(values)
+                    values.append(value)
+                value = code
+            column.append(value)
+        self.rows += 1
+        if len(self._buffer[0]) >= self.batch_rows:
+            self._flush()
+
+    def _flush(self) -> None:
+        """Write the buffered rows as one record batch."""
+        if not self._buffer[0]:
+            return
+        pa = self._pa
+        arrays = []
+        for column, kind, values in zip(self._buffer, self._kinds, self._values):
+            if kind == "category":
+                arrays.append(pa.DictionaryArray.from_arrays(
+                    pa.array(column, pa.int32()), pa.array(values, pa.string())
+                ))
+            elif kind == "int":
+                arrays.append(pa.array(column, pa.int32()))
+            else:
+                arrays.append(pa.array(column, pa.string()))
+        self._writer.write_batch(pa.record_batch(arrays, schema=self.schema))
+        self._buffer = [[] for _ in self._buffer]
+
+    def close(self) -> int:
+        """Write any remaining rows and finish the file.
+
+        Returns:
+            Number of rows written.
+        """
+        if self._writer is not None:
+            self._flush()
+            self._writer.close()
+            self._writer = None
+        return self.rows
 
 
 # =============================================================================
 # File Discovery
 # =============================================================================
 
+@profiled("discover")
 def find_tex_files(
     path: str | Path,
     pattern: str = "*.tex",
@@ -554,6 +3389,7 @@ def find_tex_files(
     return sorted(files)
 
 
+@profiled("discover")
 def find_section_files(chapter_dir: str | Path) -> List[Path]:
     """
     Find section files in a chapter's sections/ subdirectory.
@@ -577,6 +3413,255 @@ def find_section_files(chapter_dir: str | Path) -> List[Path]:
     return sorted(chapter_dir.glob("*.tex"))
 
 
+# \input, \include and \subfile targets, plus what hides them: comments,
+# escapes and environment boundaries (positional groups keep the scan fast)
+_INCLUDE_RE = re.compile(
+    r"%[^\n]*"
+    r"|\\[^a-zA-Z]"
+    r"|\\(subfile|input|include|begin|end)[ \t]*\{([^{}\n]*)\}"
+)
+
+# read_includes results by (file, excluded environments), with the file's
+# (mtime, size) so edits are picked up by watch modes
+_INCLUDE_CACHE: Dict[Tuple[Path, frozenset], Tuple[Tuple[int, int], List[Tuple[str, str]]]] = {}
+
+
+def read_includes(
+    file_path: str | Path,
+    excluded_envs: Optional[frozenset[str]] = None,
+) -> List[Tuple[str, str]]:
+    """
+    List the \\subfile, \\input and \\include commands of a LaTeX file.
+
+    Commands in comments, inside excluded environments (a figure's TikZ
+    file contributes no prose) and, for files with \\begin{document}, in
+    the preamble are ignored. Results are memoized until the file changes.
+
+    Args:
+        file_path: LaTeX file to scan.
+        excluded_envs: Environments whose includes are skipped. Defaults to
+            DEFAULT_EXCLUDED_ENVIRONMENTS.
+
+    Returns:
+        (command, argument) pairs in source order, arguments as written.
+
+    Example:
+        >>> read_includes("main.tex")[:1]
+        [('subfile', 'chapters/01-foundations-llm-primer-mechanics/main')]
+    """
+    file_path = Path(file_path)
+    excluded_envs = excluded_envs or DEFAULT_EXCLUDED_ENVIRONMENTS
+    source = load_source(file_path)
+    signature = (source.mtime_ns, source.size)
+    key = (file_path.resolve(), excluded_envs)
+    cached = _INCLUDE_CACHE.get(key)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    includes: List[Tuple[str, str]] = []
+    depth = 0  # Nesting of excluded environments
+    for m in _INCLUDE_RE.finditer(source.text):
+        command, argument = m.group(1), m.group(2)
+        if command == "begin":
+            if argument == "document":
+                includes = []  # Everything so far was preamble
+            elif argument in excluded_envs:
+                depth += 1
+        elif command == "end":
+            if argument in excluded_envs:
+                depth = max(0, depth - 1)
+        elif command and not depth:
+            includes.append((command, argument.strip()))
+
+    _INCLUDE_CACHE[key] = (signature, includes)
+    return includes
+
+
+@profiled("discover")
+def find_included_files(
+    root: str | Path,
+    excluded_envs: Optional[frozenset[str]] = None,
+) -> List[Path]:
+    """
+    Resolve a LaTeX document's include graph into files in reading order.
+
+    Starting from `root` (the book's main.tex or a chapter's main.tex),
+    \\subfile, \\input and \\include are followed depth-first and each file is
+    listed before the files it includes. Every file is visited once, so
+    repeated or cyclic includes are harmless, and files that the document
+    never references are not listed at all.
+
+    Targets resolve like a subfiles build: against the directory of the
+    document being compiled (the root, or the enclosing \\subfile), then the
+    including file's directory, then the root's directory. A missing .tex
+    suffix is added; targets that do not exist are skipped.
+
+    Args:
+        root: Root LaTeX document.
+        excluded_envs: Environments whose includes are skipped. Defaults to
+            DEFAULT_EXCLUDED_ENVIRONMENTS.
+
+    Returns:
+        The root followed by every reachable file, in reading order.
+
+    Example:
+        >>> files = find_included_files("chapters/06-agents-part-1/main.tex")
+        >>> [f.name for f in files[:3]]
+        ['main.tex', '00-how-to-read.tex', '01-introduction.tex']
+    """
+    root = Path(root)
+    files: List[Path] = []
+    seen = set()
+
+    def visit(file_path: Path, base: Path):
+        seen.add(file_path.resolve())
+        files.append(file_path)
+        for command, argument in read_includes(file_path, excluded_envs):
+            target = argument if argument.endswith(".tex") else argument + ".tex"
+            for directory in (base, file_path.parent, root.parent):
+                candidate = directory / target
+                if candidate.is_file():
+                    break
+            else:
+                continue
+            if candidate.resolve() not in seen:
+                # A subfile compiles relative to its own directory
+                visit(candidate, candidate.parent if command == "subfile" else base)
+
+    visit(root, root.parent)
+    return files
+
+
+# =============================================================================
+# CLI Helpers
+# =============================================================================
+
+# Status lines in table mode share the report's stream (rich loads lazily)
+_status_console = Lazy(lazy_import("rich.console", "Console"))
+
+
+def collect_files(
+    paths: Sequence[Path],
+    sections_only: bool = False,
+    recursive: bool = True,
+    follow_includes: bool = False,
+) -> List[Path]:
+    """
+    Collect .tex files from the files and directories given on a command line.
+
+    Args:
+        paths: Files and directories, in the order given.
+        sections_only: Only look in each directory's sections/ subdirectory.
+        recursive: Search directories recursively.
+        follow_includes: Follow \\subfile/\\input/\\include from each file
+            (or a directory's main.tex), in reading order.
+
+    Returns:
+        The collected files, in argument order.
+
+    Example:
+        >>> collect_files([Path("chapters/")], sections_only=True)
+    """
+    all_files: List[Path] = []
+    for path in paths:
+        path = Path(path)
+        if follow_includes and path.is_dir() and (path / "main.tex").is_file():
+            path = path / "main.tex"
+        if path.is_file():
+            all_files.extend(find_included_files(path) if follow_includes else [path])
+        elif path.is_dir():
+            if sections_only:
+                all_files.extend(find_section_files(path))
+            else:
+                all_files.extend(find_tex_files(path, recursive=recursive))
+    return all_files
+
+
+def log_status(message: str, format: str) -> None:
+    """
+    Report a status line without polluting data-format stdout.
+
+    Table output is for people, so the line is shown dimmed after the
+    report; for data formats it goes to stderr.
+    """
+    if format == "table":
+        _status_console.print(f"[dim]{message}[/dim]")
+    else:
+        print(message, file=sys.stderr)
+
+
+# =============================================================================
+# File Watching
+# =============================================================================
+
+@dataclass
+class FileChanges:
+    """
+    One batch of file changes seen by :func:`watch_files`.
+
+    Attributes:
+        files: The full current file list, in collection order.
+        changed: Files that are new or whose mtime/size changed.
+        removed: Files that disappeared since the last batch.
+    """
+    files: List[Path]
+    changed: List[Path]
+    removed: List[Path]
+
+
+def _snapshot(files: Iterable[Path]) -> Dict[Path, Tuple[int, int]]:
+    """Stat each file, skipping files deleted while collecting."""
+    snapshot = {}
+    for file_path in files:
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
+            continue
+        snapshot[file_path] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+
+def watch_files(
+    collect: Callable[[], List[Path]],
+    interval: float = 0.5,
+) -> Iterator[FileChanges]:
+    """
+    Poll a set of files and yield a batch whenever any of them changes.
+
+    The file list is re-collected on every poll, so files added to a
+    watched directory are picked up. Polling only stats the collected
+    files (a few milliseconds for the whole book), which keeps this
+    portable and dependency-free. Runs until the caller stops iterating
+    (e.g. on KeyboardInterrupt).
+
+    Watching switches load_source() to reading files instead of
+    memory-mapping them: editors often truncate and rewrite a file in
+    place, and touching a stale mapping of it would crash with SIGBUS.
+
+    Args:
+        collect: Returns the current list of files to watch.
+        interval: Seconds between polls.
+
+    Yields:
+        FileChanges for each poll that saw at least one change.
+
+    Example:
+        >>> for changes in watch_files(lambda: find_tex_files("chapters/")):
+        ...     print(f"{len(changes.changed)} files changed")
+    """
+    set_source_mapping(False)
+    previous = _snapshot(collect())
+    while True:
+        time.sleep(interval)
+        files = collect()
+        current = _snapshot(files)
+        changed = [f for f, stat in current.items() if previous.get(f) != stat]
+        removed = [f for f in previous if f not in current]
+        previous = current
+        if changed or removed:
+            yield FileChanges(files=[f for f in files if f in current], changed=changed, removed=removed)
+
+
 # =============================================================================
 # Stopwords
 # =============================================================================